@@ -8,15 +8,16 @@ import os
 import sys
 from pathlib import Path
 
-import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 # Add parent directory to path for shared modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from shared import McpProtocolHandler, SseTransport, BaseTool, ToolResult
+from shared import (
+    ApiKeyAuth, ApiKeyAuthMiddleware, LifespanManager, McpProtocolHandler,
+    SseTransport, run_server, BaseTool, ToolResult,
+)
 
 from adb.config import SERVER_NAME, SERVER_VERSION, DESCRIPTION, DEFAULT_ADB_PATH
 from adb.adb_client import ADBClient
@@ -565,14 +566,22 @@ def get_all_tools(adb_client: ADBClient) -> list:
 def build_app(adb_client: ADBClient, api_key: str = None) -> FastAPI:
     """Build FastAPI application with MCP protocol."""
     tools = get_all_tools(adb_client)
-    protocol_handler = McpProtocolHandler(tools, server_name=SERVER_NAME, server_version=SERVER_VERSION)
+    lifespan = LifespanManager()
+    protocol_handler = McpProtocolHandler(
+        tools, server_name=SERVER_NAME, server_version=SERVER_VERSION, lifespan=lifespan
+    )
     sse_transport = SseTransport(protocol_handler)
 
+    # Shutdown order: stop new calls → drain in-flight → flush SSE
+    lifespan.on_drain(sse_transport.close_all_sessions)
+
     app = FastAPI(
         title="ADB MCP Server",
         description=DESCRIPTION,
         version=SERVER_VERSION,
+        lifespan=lifespan.lifespan,
     )
+    app.state.lifespan = lifespan
 
     # CORS - allow any origin
     app.add_middleware(
@@ -582,21 +591,10 @@ def build_app(adb_client: ADBClient, api_key: str = None) -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
     )
 
-    # API key authentication middleware
-    if api_key:
-        public_paths = {"/health", "/", "/docs", "/redoc", "/openapi.json"}
-
-        @app.middleware("http")
-        async def auth_middleware(request: Request, call_next):
-            if request.url.path in public_paths:
-                return await call_next(request)
-            key = request.headers.get("x-api-key") or request.query_params.get("api_key")
-            if key != api_key:
-                return JSONResponse(
-                    {"error": "Unauthorized: missing or invalid X-API-Key header"},
-                    status_code=401,
-                )
-            return await call_next(request)
+    # API-key authentication + per-key rate limiting (only when auth is enabled)
+    auth = ApiKeyAuth.from_env(api_key) if api_key else None
+    if auth:
+        app.add_middleware(ApiKeyAuthMiddleware, auth=auth)
 
     # Setup SSE transport routes
     sse_transport.setup_routes(app)
@@ -604,10 +602,12 @@ def build_app(adb_client: ADBClient, api_key: str = None) -> FastAPI:
     @app.get("/health")
     async def health():
         return {
-            "status": "ok",
+            "status": "ok" if lifespan.accepting else "draining",
+            "in_flight_calls": lifespan.in_flight,
             "tools_count": len(tools),
             "active_sessions": sse_transport.get_active_session_count(),
             "auth_enabled": api_key is not None,
+            "auth": auth.stats() if auth else None,
             "adb_path": adb_client.adb_path,
         }
 
@@ -668,7 +668,7 @@ def main():
     logger.info(f"  Android home: {adb_client.android_home or 'auto-detect'}")
 
     app = build_app(adb_client, api_key)
-    uvicorn.run(app, host=args.host, port=args.port)
+    run_server(app, args.host, args.port)
 
 
 if __name__ == "__main__":
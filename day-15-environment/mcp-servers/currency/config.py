@@ -1,7 +1,8 @@
 """Configuration for CurrencyExchange MCP Server."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 
 @dataclass
@@ -16,10 +17,16 @@ class AuthConfig:
     api_key: str = ""
 
 
+@dataclass
+class HistoryConfig:
+    directory: Optional[str] = None  # None = in-memory only
+
+
 @dataclass
 class Config:
     server: ServerConfig
     auth: AuthConfig
+    history: HistoryConfig = field(default_factory=HistoryConfig)
 
 
 def load_config(disable_auth: bool = False) -> Config:
@@ -33,7 +40,11 @@ def load_config(disable_auth: bool = False) -> Config:
     if auth_enabled and not api_key:
         raise ValueError("MCP_API_KEY environment variable required when auth is enabled")
 
+    # Historical rate store (one file); empty = keep downloaded history in memory only
+    history_dir = os.getenv("CURRENCY_HISTORY_DIR", "~/.cache/currency-mcp") or None
+
     return Config(
         server=ServerConfig(host=host, port=port),
         auth=AuthConfig(enabled=auth_enabled, api_key=api_key),
+        history=HistoryConfig(directory=history_dir),
     )
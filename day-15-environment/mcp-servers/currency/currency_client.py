@@ -6,12 +6,20 @@ Frankfurter is a free, open-source currency data API (https://www.frankfurter.ap
 - Supports 30+ currencies
 - Historical rates available
 
+The latest table is cached locally (see rate_table.py) and refreshed once
+per ECB publication; cross rates are computed from it with Decimal.
+
 API docs: https://www.frankfurter.app/docs
 """
 
 import logging
+from datetime import date
+from decimal import Decimal
 from typing import Optional
-import httpx
+
+from shared import HttpClient
+from .history_store import RateHistory
+from .rate_table import RateTable
 
 logger = logging.getLogger(__name__)
 
@@ -55,10 +63,16 @@ CURRENCY_NAMES = {
 
 
 class CurrencyClient:
-    """Client for Frankfurter currency exchange API."""
+    """Client for Frankfurter currency exchange API.
 
-    def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+    Rates come from a local RateTable snapshot refreshed once per ECB
+    publication; cross rates and conversions are computed locally.
+    """
+
+    def __init__(self, history_dir: Optional[str] = None):
+        self.http_client = HttpClient(timeout=30.0)
+        self.rates = RateTable(self.http_client, API_BASE_URL)
+        self.history = RateHistory(self.http_client, API_BASE_URL, history_dir)
 
     async def get_supported_currencies(self) -> dict:
         """Get list of all supported currency codes.
@@ -67,9 +81,7 @@ class CurrencyClient:
             dict mapping currency code to full name
         """
         try:
-            response = await self.http_client.get(f"{API_BASE_URL}/currencies")
-            response.raise_for_status()
-            return response.json()
+            return await self.rates.currencies()
         except Exception as e:
             logger.error(f"Failed to get currencies: {e}")
             return CURRENCY_NAMES  # Fallback to hardcoded list
@@ -84,32 +96,27 @@ class CurrencyClient:
             currencies: Optional list of target currencies (all if None)
 
         Returns:
-            dict with rates and metadata, or None on error
+            dict with rates and metadata, or None for an unknown currency code
+
+        Raises:
+            UpstreamError: Frankfurter API unavailable
         """
-        try:
-            params = {"from": base.upper()}
-            if currencies:
-                params["to"] = ",".join([c.upper() for c in currencies])
-
-            response = await self.http_client.get(f"{API_BASE_URL}/latest", params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            return {
-                "base": data["base"],
-                "date": data["date"],
-                "rates": data["rates"],
-            }
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                logger.error(f"Invalid currency code: {base}")
-                return None
-            logger.error(f"API error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get latest rates: {e}")
+        base = base.upper()
+        targets = [c.upper() for c in currencies] if currencies else None
+        snapshot = await self.rates.snapshot()
+        unknown = self.rates.unknown(snapshot, base, *(targets or []))
+        if unknown:
+            logger.error(f"Invalid currency code(s): {', '.join(unknown)}")
             return None
 
+        if targets is None:
+            targets = [code for code in snapshot.rates if code != base]
+        return {
+            "base": base,
+            "date": snapshot.date,
+            "rates": {code: snapshot.rate(base, code) for code in targets},
+        }
+
     async def get_exchange_rate(self, from_currency: str, to_currency: str) -> Optional[dict]:
         """Get exchange rate between two currencies.
 
@@ -118,40 +125,26 @@ class CurrencyClient:
             to_currency: Target currency code
 
         Returns:
-            dict with rate information, or None on error
-        """
-        try:
-            from_curr = from_currency.upper()
-            to_curr = to_currency.upper()
-
-            response = await self.http_client.get(
-                f"{API_BASE_URL}/latest",
-                params={"from": from_curr, "to": to_curr},
-            )
-            response.raise_for_status()
-            data = response.json()
+            dict with rate information, or None for unknown currency codes
 
-            rate = data["rates"].get(to_curr)
-            if rate is None:
-                return None
-
-            return {
-                "from": from_curr,
-                "to": to_curr,
-                "rate": rate,
-                "date": data["date"],
-                "inverse_rate": 1 / rate if rate != 0 else 0,
-            }
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                logger.error(f"Invalid currency code: {from_currency} or {to_currency}")
-                return None
-            logger.error(f"API error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get exchange rate: {e}")
+        Raises:
+            UpstreamError: Frankfurter API unavailable
+        """
+        from_curr = from_currency.upper()
+        to_curr = to_currency.upper()
+        snapshot = await self.rates.snapshot()
+        if self.rates.unknown(snapshot, from_curr, to_curr):
+            logger.error(f"Invalid currency code: {from_currency} or {to_currency}")
             return None
 
+        return {
+            "from": from_curr,
+            "to": to_curr,
+            "rate": snapshot.rate(from_curr, to_curr),
+            "date": snapshot.date,
+            "inverse_rate": snapshot.rate(to_curr, from_curr),
+        }
+
     async def convert_amount(
         self, amount: float, from_currency: str, to_currency: str
     ) -> Optional[dict]:
@@ -163,42 +156,118 @@ class CurrencyClient:
             to_currency: Target currency code
 
         Returns:
-            dict with conversion details, or None on error
+            dict with conversion details, or None for unknown currency codes
+
+        Raises:
+            UpstreamError: Frankfurter API unavailable
         """
-        try:
-            from_curr = from_currency.upper()
-            to_curr = to_currency.upper()
+        from_curr = from_currency.upper()
+        to_curr = to_currency.upper()
+        snapshot = await self.rates.snapshot()
+        if self.rates.unknown(snapshot, from_curr, to_curr):
+            logger.error(f"Invalid currency code: {from_currency} or {to_currency}")
+            return None
 
-            response = await self.http_client.get(
-                f"{API_BASE_URL}/latest",
-                params={"amount": amount, "from": from_curr, "to": to_curr},
-            )
-            response.raise_for_status()
-            data = response.json()
+        return {
+            "amount": amount,
+            "from": from_curr,
+            "to": to_curr,
+            "result": snapshot.convert(Decimal(str(amount)), from_curr, to_curr),
+            "rate": snapshot.rate(from_curr, to_curr),
+            "date": snapshot.date,
+        }
 
-            converted = data["rates"].get(to_curr)
-            if converted is None:
-                return None
+    async def convert_batch(self, items: list[tuple[float, str, str]]) -> dict:
+        """Convert many (amount, from, to) rows against one rate snapshot.
 
-            rate = converted / amount if amount != 0 else 0
+        Returns:
+            dict with date and results: one dict per row (as convert_amount),
+            or None for rows with unknown currency codes
 
-            return {
+        Raises:
+            UpstreamError: Frankfurter API unavailable
+        """
+        snapshot = await self.rates.snapshot()
+        results = []
+        for amount, from_currency, to_currency in items:
+            from_curr = from_currency.upper()
+            to_curr = to_currency.upper()
+            if self.rates.unknown(snapshot, from_curr, to_curr):
+                results.append(None)
+                continue
+            results.append({
                 "amount": amount,
                 "from": from_curr,
                 "to": to_curr,
-                "result": converted,
-                "rate": rate,
-                "date": data["date"],
-            }
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                logger.error(f"Invalid currency code: {from_currency} or {to_currency}")
-                return None
-            logger.error(f"API error: {e}")
+                "result": snapshot.convert(Decimal(str(amount)), from_curr, to_curr),
+                "rate": snapshot.rate(from_curr, to_curr),
+            })
+        return {"date": snapshot.date, "results": results}
+
+    async def get_rate_matrix(self, currencies: list[str]) -> Optional[dict]:
+        """Get the N×N cross-rate table for the given currencies from one snapshot.
+
+        Returns:
+            dict with date, currencies and matrix (matrix[i][j] = units of
+            currencies[j] per 1 currencies[i]), or None for unknown codes
+
+        Raises:
+            UpstreamError: Frankfurter API unavailable
+        """
+        codes = [c.upper() for c in currencies]
+        snapshot = await self.rates.snapshot()
+        unknown = self.rates.unknown(snapshot, *codes)
+        if unknown:
+            logger.error(f"Invalid currency code(s): {', '.join(unknown)}")
             return None
-        except Exception as e:
-            logger.error(f"Failed to convert currency: {e}")
+        return {
+            "date": snapshot.date,
+            "currencies": codes,
+            "matrix": [[snapshot.rate(row, col) for col in codes] for row in codes],
+        }
+
+    async def get_historical_rate(self, day: date, from_currency: str, to_currency: str) -> Optional[dict]:
+        """Get the exchange rate published on a date (or the last business day before it).
+
+        Returns:
+            dict with from, to, date (publication actually used), rate;
+            None for unknown currency codes or dates without data
+
+        Raises:
+            UpstreamError: Frankfurter API unavailable
+        """
+        from_curr = from_currency.upper()
+        to_curr = to_currency.upper()
+        found = await self.history.rate_on(day, from_curr, to_curr)
+        if found is None:
             return None
+        published, rate = found
+        return {"from": from_curr, "to": to_curr, "date": published.isoformat(), "rate": rate}
+
+    async def get_rate_series(self, from_currency: str, to_currency: str, start: date, end: date) -> dict:
+        """Get all published rates between two dates (inclusive).
+
+        Returns:
+            dict with from, to, dates (ISO strings) and rates (parallel lists)
+
+        Raises:
+            UpstreamError: Frankfurter API unavailable
+        """
+        from_curr = from_currency.upper()
+        to_curr = to_currency.upper()
+        days, values = await self.history.series(from_curr, to_curr, start, end)
+        return {"from": from_curr, "to": to_curr, "dates": [d.isoformat() for d in days], "rates": values}
+
+    async def get_rate_stats(self, from_currency: str, to_currency: str, start: date, end: date) -> Optional[dict]:
+        """Get min/max/mean and change of a rate over a date window.
+
+        Returns:
+            dict of statistics (see RateHistory.window_stats), or None without data
+
+        Raises:
+            UpstreamError: Frankfurter API unavailable
+        """
+        return await self.history.window_stats(from_currency.upper(), to_currency.upper(), start, end)
 
     def get_currency_name(self, code: str) -> str:
         """Get full name for currency code.
@@ -209,7 +278,8 @@ class CurrencyClient:
         Returns:
             Full currency name or the code if unknown
         """
-        return CURRENCY_NAMES.get(code.upper(), code.upper())
+        code = code.upper()
+        return CURRENCY_NAMES.get(code) or self.rates.name(code) or code
 
     async def close(self):
         """Close HTTP client."""
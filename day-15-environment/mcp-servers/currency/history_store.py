@@ -0,0 +1,261 @@
+"""Local columnar store of historical ECB reference rates.
+
+Layout: one sorted date index (day ordinals) plus one float column per
+currency, all quoted against EUR, the ECB's native base. Any pair A/B is
+derived on the fly as column[B] / column[A], so N currencies cover all
+N² pairs. Missing values (a currency not yet quoted on a date) are NaN.
+
+The store records which date ranges it has already asked Frankfurter for
+(weekends and TARGET holidays have no rows but still count as covered),
+so a query only downloads the gaps, via the range endpoint
+(/YYYY-MM-DD..YYYY-MM-DD), in chunks of RANGE_CHUNK_DAYS.
+
+Everything lives in one file: a 4-byte header length, a JSON header
+(currencies, covered ranges, row count) and the raw arrays.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from shared import HttpClient
+from .rate_table import BASE_CURRENCY, ECB_TIMEZONE, last_publication_date
+
+logger = logging.getLogger(__name__)
+
+FIRST_DATE = date(1999, 1, 4)  # first ECB reference rates
+RANGE_CHUNK_DAYS = 365
+HISTORY_FILE = "history.bin"
+
+
+class RateHistory:
+    def __init__(self, http_client: HttpClient, api_base_url: str, directory: Optional[str] = None):
+        self.http_client = http_client
+        self.api_base_url = api_base_url
+        self.path = os.path.join(os.path.abspath(os.path.expanduser(directory)), HISTORY_FILE) if directory else None
+        self.dates = array("i")  # date ordinals, ascending
+        self.columns: dict[str, array] = {}  # currency → rate per 1 EUR ('d', NaN = missing)
+        self.covered: list[tuple[int, int]] = []  # merged [start, end] ordinal ranges already fetched
+        self._lock = asyncio.Lock()
+        self.fetches = 0
+        if self.path:
+            self._load()
+
+    # --- persistence ---
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                (header_len,) = struct.unpack("<I", f.read(4))
+                header = json.loads(f.read(header_len))
+                rows = header["rows"]
+                dates = array("i")
+                dates.fromfile(f, rows)
+                columns = {}
+                for code in header["currencies"]:
+                    column = array("d")
+                    column.fromfile(f, rows)
+                    columns[code] = column
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, EOFError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable rate history {self.path}: {e}")
+            return
+        self.dates, self.columns = dates, columns
+        self.covered = [tuple(r) for r in header["covered"]]
+        logger.info(f"Rate history: {len(dates)} days x {len(columns)} currencies from {self.path}")
+
+    def _save(self, dates: array, columns: dict[str, array], covered: list):
+        header = json.dumps({"rows": len(dates), "currencies": list(columns), "covered": covered}).encode()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                dates.tofile(f)
+                for column in columns.values():
+                    column.tofile(f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist rate history to {self.path}: {e}")
+
+    # --- sync ---
+
+    def _gaps(self, start: int, end: int) -> list[tuple[int, int]]:
+        """Parts of [start, end] not covered yet."""
+        gaps = []
+        cursor = start
+        for lo, hi in self.covered:
+            if hi < cursor:
+                continue
+            if lo > end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo - 1))
+            cursor = max(cursor, hi + 1)
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def _cover(self, start: int, end: int):
+        ranges = sorted(self.covered + [(start, end)])
+        merged = [ranges[0]]
+        for lo, hi in ranges[1:]:
+            if lo <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        self.covered = merged
+
+    def _insert(self, rows: dict[str, dict]):
+        """Merge {date: {code: rate}} rows into the columns."""
+        new_dates = sorted(date.fromisoformat(d).toordinal() for d in rows)
+        new_dates = [d for d in new_dates if not self._has(d)]
+        if not new_dates:
+            return
+        for code in {code for day in rows.values() for code in day}:
+            if code not in self.columns:
+                self.columns[code] = array("d", [math.nan]) * len(self.dates)
+
+        if not self.dates or new_dates[0] > self.dates[-1]:
+            # Common case: appending newer days
+            self.dates.extend(new_dates)
+            for code, column in self.columns.items():
+                column.extend(
+                    float(rows[date.fromordinal(d).isoformat()].get(code, math.nan)) for d in new_dates
+                )
+            return
+
+        # Backfill before or between existing days: rebuild in date order
+        merged = sorted(set(self.dates) | set(new_dates))
+        old_index = {d: i for i, d in enumerate(self.dates)}
+        for code, column in self.columns.items():
+            rebuilt = array("d")
+            for d in merged:
+                i = old_index.get(d)
+                if i is not None:
+                    rebuilt.append(column[i])
+                else:
+                    rebuilt.append(float(rows[date.fromordinal(d).isoformat()].get(code, math.nan)))
+            self.columns[code] = rebuilt
+        self.dates = array("i", merged)
+
+    def _has(self, ordinal: int) -> bool:
+        i = bisect_left(self.dates, ordinal)
+        return i < len(self.dates) and self.dates[i] == ordinal
+
+    async def _fetch_range(self, start: int, end: int) -> tuple[dict, Optional[int]]:
+        response = await self.http_client.get(
+            f"{self.api_base_url}/{date.fromordinal(start).isoformat()}..{date.fromordinal(end).isoformat()}",
+            params={"from": BASE_CURRENCY},
+        )
+        response.raise_for_status()
+        data = response.json()
+        self.fetches += 1
+        rows = data.get("rates", {})
+        # The range endpoint also returns the last rate before `start` (when `start` is not a business day)
+        rows = {d: r for d, r in rows.items() if start <= date.fromisoformat(d).toordinal() <= end}
+        last = max((date.fromisoformat(d).toordinal() for d in rows), default=None)
+        return rows, last
+
+    async def sync(self, start: date, end: date) -> int:
+        """Download the parts of [start, end] not stored yet. Returns the number of new days."""
+        final = last_publication_date(datetime.now(ECB_TIMEZONE)).toordinal()
+        start_ord = max(start, FIRST_DATE).toordinal()
+        end_ord = min(end.toordinal(), final)
+        if start_ord > end_ord:
+            return 0
+
+        async with self._lock:
+            before = len(self.dates)
+            for gap_start, gap_end in self._gaps(start_ord, end_ord):
+                chunk_start = gap_start
+                while chunk_start <= gap_end:
+                    chunk_end = min(gap_end, chunk_start + RANGE_CHUNK_DAYS - 1)
+                    rows, last = await self._fetch_range(chunk_start, chunk_end)
+                    self._insert(rows)
+                    # Days before the latest publication are final; the latest one only once it has appeared
+                    covered_end = chunk_end if chunk_end < final else max(final - 1, last or chunk_start - 1)
+                    if covered_end >= chunk_start:
+                        self._cover(chunk_start, covered_end)
+                    chunk_start = chunk_end + 1
+            added = len(self.dates) - before
+            if added and self.path:
+                columns = {code: array("d", column) for code, column in self.columns.items()}
+                await asyncio.to_thread(self._save, array("i", self.dates), columns, list(self.covered))
+            if added:
+                logger.info(f"Rate history: +{added} days ({len(self.dates)} stored)")
+            return added
+
+    # --- queries ---
+
+    def _column(self, code: str, lo: int, hi: int) -> array:
+        if code == BASE_CURRENCY:
+            return array("d", [1.0]) * (hi - lo)
+        if code not in self.columns:
+            return array("d", [math.nan]) * (hi - lo)
+        return self.columns[code][lo:hi]
+
+    def _pair(self, from_currency: str, to_currency: str, lo: int, hi: int) -> tuple[list[int], list[float]]:
+        """Dates and from→to rates in rows [lo, hi), skipping days where either side is missing."""
+        days, values = [], []
+        from_column = self._column(from_currency, lo, hi)
+        to_column = self._column(to_currency, lo, hi)
+        for day, f, t in zip(self.dates[lo:hi], from_column, to_column):
+            if not (math.isnan(f) or math.isnan(t)):
+                days.append(day)
+                values.append(t / f)
+        return days, values
+
+    async def rate_on(self, day: date, from_currency: str, to_currency: str) -> Optional[tuple[date, float]]:
+        """Rate published on `day`, or on the last business day before it."""
+        await self.sync(day - timedelta(days=7), day)
+        hi = bisect_right(self.dates, day.toordinal())
+        days, values = self._pair(from_currency, to_currency, max(0, hi - 7), hi)
+        if not values:
+            return None
+        return date.fromordinal(days[-1]), values[-1]
+
+    async def series(
+        self, from_currency: str, to_currency: str, start: date, end: date
+    ) -> tuple[list[date], list[float]]:
+        """All published from→to rates in [start, end]."""
+        await self.sync(start, end)
+        lo = bisect_left(self.dates, start.toordinal())
+        hi = bisect_right(self.dates, end.toordinal())
+        days, values = self._pair(from_currency, to_currency, lo, hi)
+        return [date.fromordinal(d) for d in days], values
+
+    async def window_stats(self, from_currency: str, to_currency: str, start: date, end: date) -> Optional[dict]:
+        """min/max/mean and change of the from→to rate over [start, end]."""
+        days, values = await self.series(from_currency, to_currency, start, end)
+        if not values:
+            return None
+        low, high = min(values), max(values)
+        return {
+            "days": len(values),
+            "first": (days[0], values[0]),
+            "last": (days[-1], values[-1]),
+            "min": (days[values.index(low)], low),
+            "max": (days[values.index(high)], high),
+            "mean": math.fsum(values) / len(values),
+            "change_pct": (values[-1] / values[0] - 1) * 100,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "days": len(self.dates),
+            "currencies": len(self.columns),
+            "first": date.fromordinal(self.dates[0]).isoformat() if self.dates else None,
+            "last": date.fromordinal(self.dates[-1]).isoformat() if self.dates else None,
+            "fetches": self.fetches,
+            "persistent": bool(self.path),
+        }
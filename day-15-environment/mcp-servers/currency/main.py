@@ -9,6 +9,8 @@ Environment variables:
     MCP_API_KEY  Server API key for client authentication (required unless --no-auth)
     HOST         Bind address (default: 0.0.0.0)
     PORT         Bind port (default: 8004)
+    CURRENCY_HISTORY_DIR  Directory of the historical rate store (default: ~/.cache/currency-mcp;
+                          empty = in-memory only)
 
 Currency data provided by Frankfurter API (https://www.frankfurter.app) - free, no API key required.
 Data sourced from European Central Bank.
@@ -18,12 +20,13 @@ import argparse
 import logging
 import sys
 
-import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from shared import McpProtocolHandler, SseTransport
+from shared import (
+    ApiKeyAuth, ApiKeyAuthMiddleware, LifespanManager, McpProtocolHandler,
+    SseTransport, run_server,
+)
 from .config import load_config
 from .currency_client import CurrencyClient
 from .tools import get_all_tools
@@ -51,14 +54,23 @@ def parse_args() -> argparse.Namespace:
 
 def build_app(config, currency_client: CurrencyClient) -> FastAPI:
     tools = get_all_tools(currency_client)
-    protocol_handler = McpProtocolHandler(tools, server_name=SERVER_NAME, server_version=SERVER_VERSION)
+    lifespan = LifespanManager()
+    protocol_handler = McpProtocolHandler(
+        tools, server_name=SERVER_NAME, server_version=SERVER_VERSION, lifespan=lifespan
+    )
     sse_transport = SseTransport(protocol_handler)
 
+    # Shutdown order: stop new calls → drain in-flight → flush SSE → close upstream clients
+    lifespan.on_drain(sse_transport.close_all_sessions)
+    lifespan.on_close(currency_client.close)
+
     app = FastAPI(
         title="CurrencyExchange MCP Server",
         description="MCP server for getting currency exchange rates via SSE transport. Powered by Frankfurter API.",
         version=SERVER_VERSION,
+        lifespan=lifespan.lifespan,
     )
+    app.state.lifespan = lifespan
 
     # CORS — allow any origin so clients can connect
     app.add_middleware(
@@ -68,22 +80,10 @@ def build_app(config, currency_client: CurrencyClient) -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
     )
 
-    # API-key authentication middleware (only when auth is enabled)
-    if config.auth.enabled:
-        api_key = config.auth.api_key
-        public_paths = {"/health", "/", "/docs", "/redoc", "/openapi.json"}
-
-        @app.middleware("http")
-        async def auth_middleware(request: Request, call_next):
-            if request.url.path in public_paths:
-                return await call_next(request)
-            key = request.headers.get("x-api-key") or request.query_params.get("api_key")
-            if key != api_key:
-                return JSONResponse(
-                    {"error": "Unauthorized: missing or invalid X-API-Key header"},
-                    status_code=401,
-                )
-            return await call_next(request)
+    # API-key authentication + per-key rate limiting (only when auth is enabled)
+    auth = ApiKeyAuth.from_env(config.auth.api_key) if config.auth.enabled else None
+    if auth:
+        app.add_middleware(ApiKeyAuthMiddleware, auth=auth)
 
     # MCP SSE transport routes (/sse and /message)
     sse_transport.setup_routes(app)
@@ -93,11 +93,15 @@ def build_app(config, currency_client: CurrencyClient) -> FastAPI:
     @app.get("/health")
     async def health():
         return {
-            "status": "ok",
+            "status": "ok" if lifespan.accepting else "draining",
+            "in_flight_calls": lifespan.in_flight,
             "tools_count": len(tools),
             "active_sessions": sse_transport.get_active_session_count(),
             "auth_enabled": config.auth.enabled,
+            "auth": auth.stats() if auth else None,
             "data_source": "European Central Bank (via Frankfurter API)",
+            "rate_table": currency_client.rates.stats(),
+            "rate_history": currency_client.history.stats(),
         }
 
     @app.get("/")
@@ -153,12 +157,14 @@ def main():
     logger.info(f"  Address:      {config.server.host}:{config.server.port}")
     logger.info(f"  Auth:         {auth_status}")
     logger.info("  Data source:  European Central Bank (via Frankfurter API)")
-    logger.info("  Tools:        get_exchange_rate, convert_currency, get_latest_rates")
+    logger.info("  Tools:        get_exchange_rate, convert_currency, get_latest_rates,")
+    logger.info("                convert_batch, rate_matrix,")
+    logger.info("                get_historical_rate, get_rate_history, get_rate_stats")
 
-    currency_client = CurrencyClient()
+    currency_client = CurrencyClient(history_dir=config.history.directory)
     app = build_app(config, currency_client)
 
-    uvicorn.run(app, host=config.server.host, port=config.server.port)
+    run_server(app, config.server.host, config.server.port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+"""Local snapshot of the ECB reference-rate table.
+
+The ECB publishes one table per TARGET business day, around 16:00 CET, and
+Frankfurter serves it unchanged. The whole table is therefore fetched once
+per publication cycle, in its native EUR base, and every cross rate or
+conversion is computed locally:
+
+    rate(A → B) = rate(EUR → B) / rate(EUR → A)
+
+Rates are parsed straight from JSON into Decimal, so cross rates carry no
+binary floating-point error. The supported-currency list (/currencies) is
+cached with the table, so unknown codes are rejected without a request.
+
+A snapshot stays valid until the next expected publication. If a refresh
+after a publication still returns the previous date (Frankfurter lags a
+little, or it was a TARGET holiday), it is retried every RETRY_INTERVAL.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal, localcontext
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from shared import HttpClient
+
+logger = logging.getLogger(__name__)
+
+BASE_CURRENCY = "EUR"
+ECB_TIMEZONE = ZoneInfo("Europe/Berlin")
+PUBLICATION_HOUR = 16  # ECB reference rates are published around 16:00 CET
+RETRY_INTERVAL = 15 * 60  # seconds between refreshes while the new table is overdue
+RATE_DIGITS = 10  # significant digits of computed cross rates
+AMOUNT_QUANTUM = Decimal("0.000001")
+
+
+def last_publication_date(now: datetime) -> date:
+    """Date of the most recent business-day publication at or before `now`."""
+    local = now.astimezone(ECB_TIMEZONE)
+    day = local.date()
+    if local.hour < PUBLICATION_HOUR:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def next_publication(now: datetime) -> datetime:
+    """Instant of the first business-day publication after `now`."""
+    local = now.astimezone(ECB_TIMEZONE)
+    day = local.date()
+    if local.hour >= PUBLICATION_HOUR:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime(day.year, day.month, day.day, PUBLICATION_HOUR, tzinfo=ECB_TIMEZONE)
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """One published table: units of each currency per 1 EUR (EUR itself included)."""
+
+    date: str
+    rates: dict[str, Decimal]
+
+    def rate(self, from_currency: str, to_currency: str) -> Decimal:
+        """Cross rate: units of `to_currency` per 1 `from_currency`."""
+        if from_currency == to_currency:
+            return Decimal(1)
+        with localcontext() as ctx:
+            ctx.prec = RATE_DIGITS
+            return self.rates[to_currency] / self.rates[from_currency]
+
+    def convert(self, amount: Decimal, from_currency: str, to_currency: str) -> Decimal:
+        """Convert at full precision, rounded to AMOUNT_QUANTUM."""
+        if from_currency == to_currency:
+            return amount
+        return (amount * self.rates[to_currency] / self.rates[from_currency]).quantize(AMOUNT_QUANTUM)
+
+
+class RateTable:
+    """Fetches and caches the latest RateSnapshot and the currency list."""
+
+    def __init__(self, http_client: HttpClient, api_base_url: str):
+        self.http_client = http_client
+        self.api_base_url = api_base_url
+        self._snapshot: Optional[RateSnapshot] = None
+        self._currencies: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+        self.hits = 0
+
+    async def _fetch(self) -> tuple[RateSnapshot, dict[str, str]]:
+        latest, currencies = await asyncio.gather(
+            self.http_client.get(f"{self.api_base_url}/latest", params={"from": BASE_CURRENCY}),
+            self.http_client.get(f"{self.api_base_url}/currencies"),
+        )
+        latest.raise_for_status()
+        currencies.raise_for_status()
+        data = latest.json(parse_float=Decimal, parse_int=Decimal)
+        rates = dict(data["rates"])
+        rates[BASE_CURRENCY] = Decimal(1)
+        return RateSnapshot(date=data["date"], rates=rates), currencies.json()
+
+    async def snapshot(self) -> RateSnapshot:
+        """The current table, refreshed when a newer publication is due.
+
+        Raises:
+            UpstreamError: Frankfurter unavailable and no table cached yet
+        """
+        if self._snapshot is not None and time.time() < self._expires_at:
+            self.hits += 1
+            return self._snapshot
+
+        async with self._lock:
+            now = time.time()
+            if self._snapshot is not None and now < self._expires_at:
+                self.hits += 1
+                return self._snapshot
+            try:
+                snapshot, currencies = await self._fetch()
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                logger.warning(f"Rate table refresh failed, serving {self._snapshot.date}: {e}")
+                self._expires_at = now + RETRY_INTERVAL
+                return self._snapshot
+
+            self.refreshes += 1
+            self._snapshot = snapshot
+            self._currencies = currencies
+            now_dt = datetime.fromtimestamp(now, ECB_TIMEZONE)
+            if date.fromisoformat(snapshot.date) >= last_publication_date(now_dt):
+                self._expires_at = next_publication(now_dt).timestamp()
+            else:
+                self._expires_at = now + RETRY_INTERVAL
+            logger.info(f"Rate table {snapshot.date}: {len(snapshot.rates)} currencies")
+            return snapshot
+
+    async def currencies(self) -> dict[str, str]:
+        """Supported currency codes → names, as cached with the table."""
+        await self.snapshot()
+        return self._currencies
+
+    def unknown(self, snapshot: RateSnapshot, *codes: str) -> list[str]:
+        """Codes that are not in the cached /currencies list or have no rate."""
+        return [
+            code for code in codes
+            if code not in snapshot.rates or (self._currencies and code not in self._currencies)
+        ]
+
+    def name(self, code: str) -> Optional[str]:
+        return self._currencies.get(code)
+
+    def stats(self) -> dict:
+        return {
+            "date": self._snapshot.date if self._snapshot else None,
+            "currencies": len(self._snapshot.rates) if self._snapshot else 0,
+            "refreshes": self.refreshes,
+            "hits": self.hits,
+            "expires_in": max(0, int(self._expires_at - time.time())) if self._snapshot else None,
+        }
@@ -4,14 +4,46 @@ Tools for currency exchange operations:
 - get_exchange_rate: Get exchange rate between two currencies
 - convert_currency: Convert amount from one currency to another
 - get_latest_rates: Get all current rates for a base currency
+- convert_batch: Convert many amounts in one call
+- rate_matrix: Cross-rate table for a set of currencies
+- get_historical_rate: Get the rate published on a past date
+- get_rate_history: Get the rate series over a date range
+- get_rate_stats: Get min/max/mean and change of a rate over a window
 """
 
 import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
 from shared import ToolResult, BaseTool
 from .currency_client import CurrencyClient
 
 logger = logging.getLogger(__name__)
 
+# convert_batch: max rows per call
+BATCH_MAX_ITEMS = 1000
+# rate_matrix: max currencies (the table grows quadratically)
+MATRIX_MAX_CURRENCIES = 20
+
+# get_rate_history: rows shown by default / at most (the series is sampled evenly)
+HISTORY_DEFAULT_POINTS = 30
+HISTORY_MAX_POINTS = 400
+# get_rate_stats: default window
+STATS_DEFAULT_DAYS = 30
+
+
+def parse_date(value: Optional[str], default: Optional[date] = None) -> date:
+    """Parse 'YYYY-MM-DD' or 'today'; raise ValueError otherwise."""
+    if not value:
+        if default is None:
+            raise ValueError("date is required")
+        return default
+    value = value.strip().lower()
+    if value == "today":
+        return date.today()
+    return date.fromisoformat(value)
+
 
 class CurrencyTool(BaseTool):
     """Base class for CurrencyExchange MCP tools."""
@@ -250,6 +282,376 @@ class GetLatestRatesTool(CurrencyTool):
             )
 
 
+# ---------------------------------------------------------------------------
+# Tool: convert_batch
+# ---------------------------------------------------------------------------
+
+class ConvertBatchTool(CurrencyTool):
+    name = "convert_batch"
+    description = (
+        f"Convert many amounts at once (up to {BATCH_MAX_ITEMS} rows), all at the same current rates. "
+        "Each row has amount, from_currency and optionally to_currency (defaults to the top-level "
+        "to_currency). Returns one line per row plus totals per target currency. "
+        "Prefer this over calling convert_currency once per row, e.g. for expense reports."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "amount": {"type": "number"},
+                        "from_currency": {"type": "string"},
+                        "to_currency": {"type": "string"},
+                    },
+                    "required": ["amount", "from_currency"],
+                },
+                "description": "Rows to convert, e.g. [{'amount': 12.5, 'from_currency': 'GBP'}]",
+            },
+            "to_currency": {
+                "type": "string",
+                "description": "Target currency for rows without their own to_currency (e.g., 'EUR')",
+            },
+        },
+        "required": ["items"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        items = arguments.get("items") or []
+        default_to = (arguments.get("to_currency") or "").strip().upper()
+        if not items:
+            return ToolResult("Missing required parameter: items", is_error=True)
+        if len(items) > BATCH_MAX_ITEMS:
+            return ToolResult(f"Too many items: {len(items)} (max {BATCH_MAX_ITEMS})", is_error=True)
+
+        rows, errors = [], []
+        for number, item in enumerate(items, 1):
+            try:
+                amount = float(item.get("amount"))
+            except (AttributeError, TypeError, ValueError):
+                errors.append((number, "invalid amount"))
+                continue
+            from_currency = str(item.get("from_currency") or "").strip().upper()
+            to_currency = str(item.get("to_currency") or default_to).strip().upper()
+            if not from_currency or not to_currency:
+                errors.append((number, "missing from_currency or to_currency"))
+                continue
+            rows.append((number, amount, from_currency, to_currency))
+
+        try:
+            batch = await self.client.convert_batch([(amount, f, t) for _, amount, f, t in rows]) if rows else None
+
+            lines = [f"Batch Conversion ({len(items)} rows)", "=" * 50, ""]
+            totals: dict[str, Decimal] = {}
+            for (number, _, from_currency, to_currency), conversion in zip(rows, batch["results"] if batch else []):
+                if conversion is None:
+                    errors.append((number, f"invalid currency code '{from_currency}' or '{to_currency}'"))
+                    continue
+                lines.append(
+                    f"  #{number}: {conversion['amount']:.2f} {from_currency} = "
+                    f"{conversion['result']:.2f} {to_currency} (rate {conversion['rate']:.6f})"
+                )
+                totals[to_currency] = totals.get(to_currency, Decimal(0)) + conversion["result"]
+
+            if totals:
+                lines.extend(["", "Totals:"])
+                lines.extend(f"  {code}: {total:.2f}" for code, total in sorted(totals.items()))
+            if errors:
+                lines.extend(["", f"⚠️ Skipped {len(errors)} row(s):"])
+                lines.extend(f"  #{number}: {reason}" for number, reason in sorted(errors))
+            if batch:
+                lines.extend(["", f"📅 Date: {batch['date']}"])
+            lines.append("🏦 Source: European Central Bank (via Frankfurter API)")
+
+            return ToolResult("\n".join(lines), is_error=not totals)
+
+        except Exception as e:
+            logger.error(f"ConvertBatchTool error: {e}")
+            return ToolResult(f"Failed to convert batch: {e}", is_error=True)
+
+
+# ---------------------------------------------------------------------------
+# Tool: rate_matrix
+# ---------------------------------------------------------------------------
+
+class RateMatrixTool(CurrencyTool):
+    name = "rate_matrix"
+    description = (
+        f"Get a cross-rate table for up to {MATRIX_MAX_CURRENCIES} currencies: the cell in row A, "
+        "column B is how many B one A buys. All rates come from the same current ECB table."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "currencies": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Currency codes (e.g., ['USD', 'EUR', 'GBP', 'JPY'])",
+            },
+        },
+        "required": ["currencies"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        value = arguments.get("currencies") or []
+        if isinstance(value, str):
+            value = value.split(",")
+        currencies = []
+        for code in value:
+            code = str(code).strip().upper()
+            if code and code not in currencies:
+                currencies.append(code)
+        if len(currencies) < 2:
+            return ToolResult("Provide at least two currency codes", is_error=True)
+        if len(currencies) > MATRIX_MAX_CURRENCIES:
+            return ToolResult(
+                f"Too many currencies: {len(currencies)} (max {MATRIX_MAX_CURRENCIES})", is_error=True
+            )
+
+        try:
+            table = await self.client.get_rate_matrix(currencies)
+            if not table:
+                return ToolResult(
+                    f"Invalid currency codes in: {', '.join(currencies)}. "
+                    f"Use standard 3-letter codes like USD, EUR, GBP, JPY, CNY.",
+                    is_error=True,
+                )
+
+            cells = [[f"{rate:.6g}" for rate in row] for row in table["matrix"]]
+            width = max(10, *(len(cell) for row in cells for cell in row))
+            lines = [
+                f"Cross Rates ({len(currencies)} currencies)",
+                "=" * 50,
+                "",
+                "     " + "".join(code.rjust(width + 1) for code in currencies),
+            ]
+            for code, row in zip(currencies, cells):
+                lines.append(f"{code:<5}" + "".join(cell.rjust(width + 1) for cell in row))
+            lines.extend([
+                "",
+                f"📅 Date: {table['date']}",
+                f"🏦 Source: European Central Bank (via Frankfurter API)",
+            ])
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"RateMatrixTool error: {e}")
+            return ToolResult(f"Failed to build rate matrix: {e}", is_error=True)
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_historical_rate
+# ---------------------------------------------------------------------------
+
+class GetHistoricalRateTool(CurrencyTool):
+    name = "get_historical_rate"
+    description = (
+        "Get the exchange rate between two currencies on a past date (ECB data since 1999-01-04). "
+        "On weekends and holidays the rate of the previous business day is returned."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "from_currency": {"type": "string", "description": "Source currency code (e.g., 'USD')"},
+            "to_currency": {"type": "string", "description": "Target currency code (e.g., 'EUR')"},
+            "date": {"type": "string", "description": "Date as YYYY-MM-DD"},
+        },
+        "required": ["from_currency", "to_currency", "date"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        from_currency = arguments.get("from_currency", "").strip().upper()
+        to_currency = arguments.get("to_currency", "").strip().upper()
+        if not from_currency or not to_currency:
+            return ToolResult("Missing required parameters: from_currency and to_currency", is_error=True)
+        try:
+            day = parse_date(arguments.get("date"))
+        except ValueError as e:
+            return ToolResult(f"Invalid date: {e}. Use YYYY-MM-DD.", is_error=True)
+
+        try:
+            rate_info = await self.client.get_historical_rate(day, from_currency, to_currency)
+            if not rate_info:
+                return ToolResult(
+                    f"No {from_currency}/{to_currency} rate for {day}. "
+                    f"Check the currency codes; ECB data starts on 1999-01-04.",
+                    is_error=True,
+                )
+
+            lines = [
+                f"Historical Rate: {from_currency} → {to_currency}",
+                "=" * 50,
+                "",
+                f"💱 Rate: 1 {from_currency} = {rate_info['rate']:.6f} {to_currency}",
+                f"🔄 Inverse: 1 {to_currency} = {1 / rate_info['rate']:.6f} {from_currency}",
+                "",
+                f"📅 Date: {rate_info['date']}"
+                + (f" (requested {day})" if rate_info["date"] != day.isoformat() else ""),
+                f"🏦 Source: European Central Bank (via Frankfurter API)",
+            ]
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"GetHistoricalRateTool error: {e}")
+            return ToolResult(
+                f"Failed to get historical rate for {from_currency}/{to_currency}: {e}",
+                is_error=True,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_rate_history
+# ---------------------------------------------------------------------------
+
+class GetRateHistoryTool(CurrencyTool):
+    name = "get_rate_history"
+    description = (
+        "Get the exchange rate series between two currencies over a date range. "
+        "Long ranges are sampled evenly down to max_points rows (first and last day always included)."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "from_currency": {"type": "string", "description": "Source currency code (e.g., 'USD')"},
+            "to_currency": {"type": "string", "description": "Target currency code (e.g., 'EUR')"},
+            "start_date": {"type": "string", "description": "First date, YYYY-MM-DD"},
+            "end_date": {"type": "string", "description": "Last date, YYYY-MM-DD (default: today)"},
+            "max_points": {
+                "type": "integer",
+                "description": f"Maximum rows to show (default: {HISTORY_DEFAULT_POINTS}, max: {HISTORY_MAX_POINTS})",
+            },
+        },
+        "required": ["from_currency", "to_currency", "start_date"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        from_currency = arguments.get("from_currency", "").strip().upper()
+        to_currency = arguments.get("to_currency", "").strip().upper()
+        if not from_currency or not to_currency:
+            return ToolResult("Missing required parameters: from_currency and to_currency", is_error=True)
+        try:
+            start = parse_date(arguments.get("start_date"))
+            end = parse_date(arguments.get("end_date"), default=date.today())
+        except ValueError as e:
+            return ToolResult(f"Invalid date: {e}. Use YYYY-MM-DD.", is_error=True)
+        if end < start:
+            return ToolResult("end_date must not be before start_date", is_error=True)
+        try:
+            max_points = int(arguments.get("max_points") or HISTORY_DEFAULT_POINTS)
+        except (TypeError, ValueError):
+            max_points = HISTORY_DEFAULT_POINTS
+        max_points = max(2, min(max_points, HISTORY_MAX_POINTS))
+
+        try:
+            series = await self.client.get_rate_series(from_currency, to_currency, start, end)
+            dates, rates = series["dates"], series["rates"]
+            if not rates:
+                return ToolResult(
+                    f"No {from_currency}/{to_currency} rates between {start} and {end}. "
+                    f"Check the currency codes; ECB data starts on 1999-01-04.",
+                    is_error=True,
+                )
+
+            if len(rates) > max_points:
+                step = (len(rates) - 1) / (max_points - 1)
+                indexes = [round(i * step) for i in range(max_points)]
+            else:
+                indexes = range(len(rates))
+
+            lines = [
+                f"Rate History: {from_currency} → {to_currency} ({start} … {end})",
+                "=" * 50,
+                "",
+            ]
+            lines.extend(f"  {dates[i]}: {rates[i]:.6f}" for i in indexes)
+            lines.extend([
+                "",
+                f"📊 {len(rates)} business days" + (f", showing {len(indexes)}" if len(indexes) < len(rates) else ""),
+                f"🏦 Source: European Central Bank (via Frankfurter API)",
+            ])
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"GetRateHistoryTool error: {e}")
+            return ToolResult(
+                f"Failed to get rate history for {from_currency}/{to_currency}: {e}",
+                is_error=True,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_rate_stats
+# ---------------------------------------------------------------------------
+
+class GetRateStatsTool(CurrencyTool):
+    name = "get_rate_stats"
+    description = (
+        "Get statistics of an exchange rate over a window: minimum, maximum, mean, "
+        "first/last rate and percentage change. Use start_date/end_date or the last N days."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "from_currency": {"type": "string", "description": "Source currency code (e.g., 'USD')"},
+            "to_currency": {"type": "string", "description": "Target currency code (e.g., 'EUR')"},
+            "start_date": {"type": "string", "description": "First date, YYYY-MM-DD (overrides days)"},
+            "end_date": {"type": "string", "description": "Last date, YYYY-MM-DD (default: today)"},
+            "days": {
+                "type": "integer",
+                "description": f"Window length ending at end_date (default: {STATS_DEFAULT_DAYS})",
+            },
+        },
+        "required": ["from_currency", "to_currency"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        from_currency = arguments.get("from_currency", "").strip().upper()
+        to_currency = arguments.get("to_currency", "").strip().upper()
+        if not from_currency or not to_currency:
+            return ToolResult("Missing required parameters: from_currency and to_currency", is_error=True)
+        try:
+            end = parse_date(arguments.get("end_date"), default=date.today())
+            days = max(1, int(arguments.get("days") or STATS_DEFAULT_DAYS))
+            start = parse_date(arguments.get("start_date"), default=end - timedelta(days=days - 1))
+        except ValueError as e:
+            return ToolResult(f"Invalid date or days: {e}", is_error=True)
+        if end < start:
+            return ToolResult("end_date must not be before start_date", is_error=True)
+
+        try:
+            stats = await self.client.get_rate_stats(from_currency, to_currency, start, end)
+            if not stats:
+                return ToolResult(
+                    f"No {from_currency}/{to_currency} rates between {start} and {end}. "
+                    f"Check the currency codes; ECB data starts on 1999-01-04.",
+                    is_error=True,
+                )
+
+            lines = [
+                f"Rate Statistics: {from_currency} → {to_currency} ({start} … {end})",
+                "=" * 50,
+                "",
+                f"📉 Min:    {stats['min'][1]:.6f} ({stats['min'][0]})",
+                f"📈 Max:    {stats['max'][1]:.6f} ({stats['max'][0]})",
+                f"➗ Mean:   {stats['mean']:.6f}",
+                f"🔁 Change: {stats['first'][1]:.6f} ({stats['first'][0]}) → "
+                f"{stats['last'][1]:.6f} ({stats['last'][0]}), {stats['change_pct']:+.2f}%",
+                "",
+                f"📊 {stats['days']} business days",
+                f"🏦 Source: European Central Bank (via Frankfurter API)",
+            ]
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"GetRateStatsTool error: {e}")
+            return ToolResult(
+                f"Failed to get rate statistics for {from_currency}/{to_currency}: {e}",
+                is_error=True,
+            )
+
+
 # ---------------------------------------------------------------------------
 # Registry
 # ---------------------------------------------------------------------------
@@ -260,4 +662,9 @@ def get_all_tools(client: CurrencyClient) -> list[CurrencyTool]:
         GetExchangeRateTool(client),
         ConvertCurrencyTool(client),
         GetLatestRatesTool(client),
+        ConvertBatchTool(client),
+        RateMatrixTool(client),
+        GetHistoricalRateTool(client),
+        GetRateHistoryTool(client),
+        GetRateStatsTool(client),
     ]
@@ -28,7 +28,10 @@ from typing import Any
 # Add parent directory to path for shared imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from shared import McpProtocolHandler, SseTransport, ToolResult, BaseTool
+from shared import (
+    ApiKeyAuth, ApiKeyAuthMiddleware, LifespanManager, McpProtocolHandler,
+    SseTransport, run_server, ToolResult, BaseTool,
+)
 
 
 class DockerTool(BaseTool):
@@ -614,11 +617,9 @@ class DockerComposePsTool(DockerTool):
 # Server setup
 # =============================================================================
 
-import uvicorn
 import logging
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 logging.basicConfig(
     level=logging.INFO,
@@ -652,14 +653,22 @@ def get_all_tools() -> list:
 def build_app(api_key: str = None) -> FastAPI:
     """Build FastAPI application with MCP protocol."""
     tools = get_all_tools()
-    protocol_handler = McpProtocolHandler(tools, server_name=SERVER_NAME, server_version=SERVER_VERSION)
+    lifespan = LifespanManager()
+    protocol_handler = McpProtocolHandler(
+        tools, server_name=SERVER_NAME, server_version=SERVER_VERSION, lifespan=lifespan
+    )
     sse_transport = SseTransport(protocol_handler)
 
+    # Shutdown order: stop new calls → drain in-flight → flush SSE
+    lifespan.on_drain(sse_transport.close_all_sessions)
+
     app = FastAPI(
         title="Docker MCP Server",
         description="MCP server for Docker container management via SSE transport",
         version=SERVER_VERSION,
+        lifespan=lifespan.lifespan,
     )
+    app.state.lifespan = lifespan
 
     # CORS - allow any origin
     app.add_middleware(
@@ -669,21 +678,10 @@ def build_app(api_key: str = None) -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
     )
 
-    # API key authentication middleware
-    if api_key:
-        public_paths = {"/health", "/", "/docs", "/redoc", "/openapi.json"}
-
-        @app.middleware("http")
-        async def auth_middleware(request: Request, call_next):
-            if request.url.path in public_paths:
-                return await call_next(request)
-            key = request.headers.get("x-api-key") or request.query_params.get("api_key")
-            if key != api_key:
-                return JSONResponse(
-                    {"error": "Unauthorized: missing or invalid X-API-Key header"},
-                    status_code=401,
-                )
-            return await call_next(request)
+    # API-key authentication + per-key rate limiting (only when auth is enabled)
+    auth = ApiKeyAuth.from_env(api_key) if api_key else None
+    if auth:
+        app.add_middleware(ApiKeyAuthMiddleware, auth=auth)
 
     # Setup SSE transport routes
     sse_transport.setup_routes(app)
@@ -691,10 +689,12 @@ def build_app(api_key: str = None) -> FastAPI:
     @app.get("/health")
     async def health():
         return {
-            "status": "ok",
+            "status": "ok" if lifespan.accepting else "draining",
+            "in_flight_calls": lifespan.in_flight,
             "tools_count": len(tools),
             "active_sessions": sse_transport.get_active_session_count(),
             "auth_enabled": api_key is not None,
+            "auth": auth.stats() if auth else None,
         }
 
     @app.get("/")
@@ -747,7 +747,7 @@ def main():
     logger.info(f"  Tools: {len(get_all_tools())}")
 
     app = build_app(api_key)
-    uvicorn.run(app, host=args.host, port=args.port)
+    run_server(app, args.host, args.port)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 """Configuration for FileOps MCP Server."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from .walker import DEFAULT_EXCLUDE
 
 
 @dataclass
@@ -27,6 +29,18 @@ class FileOpsConfig:
     max_file_size: int = 10 * 1024 * 1024
     # Maximum search results
     max_search_results: int = 100
+    # Threads for blocking filesystem work (bounds concurrent file operations)
+    io_workers: int = 4
+    # Directory of the persistent trigram index for search_content (None = no index)
+    index_dir: str | None = None
+    # Minimum seconds between incremental index refreshes
+    index_refresh: float = 5.0
+    # Worker processes for content search (0 = one per CPU, 1 = search in-thread)
+    search_processes: int = 0
+    # Globs of files/directories never listed or searched (no "/" = any name, else a root-relative path)
+    exclude: list[str] = field(default_factory=lambda: list(DEFAULT_EXCLUDE))
+    # Honor .gitignore/.ignore files when listing and searching
+    use_ignore_files: bool = True
 
 
 @dataclass
@@ -56,6 +70,14 @@ def load_config(disable_auth: bool = False) -> Config:
     root_dir = os.getenv("FILEOPS_ROOT_DIR", os.getcwd())
     max_file_size = int(os.getenv("FILEOPS_MAX_FILE_SIZE", str(10 * 1024 * 1024)))
     max_search_results = int(os.getenv("FILEOPS_MAX_SEARCH_RESULTS", "100"))
+    io_workers = int(os.getenv("FILEOPS_IO_WORKERS", "4"))
+    # Trigram index for search_content; unset or empty = always scan the tree
+    index_dir = os.getenv("FILEOPS_INDEX_DIR") or None
+    index_refresh = float(os.getenv("FILEOPS_INDEX_REFRESH", "5"))
+    search_processes = int(os.getenv("FILEOPS_SEARCH_PROCESSES", "0"))
+    # Directory walking: comma-separated exclude globs (empty = none) and ignore-file support
+    exclude = [g.strip() for g in os.getenv("FILEOPS_EXCLUDE", ",".join(DEFAULT_EXCLUDE)).split(",") if g.strip()]
+    use_ignore_files = os.getenv("FILEOPS_USE_IGNORE_FILES", "true").lower() not in ("0", "false", "no")
 
     return Config(
         server=ServerConfig(host=host, port=port),
@@ -64,5 +86,11 @@ def load_config(disable_auth: bool = False) -> Config:
             root_dir=root_dir,
             max_file_size=max_file_size,
             max_search_results=max_search_results,
+            io_workers=io_workers,
+            index_dir=index_dir,
+            index_refresh=index_refresh,
+            search_processes=search_processes,
+            exclude=exclude,
+            use_ignore_files=use_ignore_files,
         ),
     )
@@ -0,0 +1,317 @@
+"""Content search over files: memory-mapped, binary-aware, parallel.
+
+Each file is scanned as raw bytes (memory-mapped above MMAP_MIN_SIZE) with
+a bytes prefilter built from the longest literal every match must contain.
+Case-insensitive prefilters run over an ASCII-lowercased copy of the
+buffer, so they stay plain literal searches rather than per-letter
+alternations. Line boundaries are only located where the prefilter
+hits; that line is decoded and checked with the real (str) pattern, so
+results are exactly those of a per-line str search. Queries without a
+literal of at least PREFILTER_MIN_LENGTH characters fall back to
+decoding the file and testing every line.
+
+Files with a NUL byte in their first BINARY_SNIFF_BYTES are treated as
+binary and skipped, as grep and git do.
+
+The regex work is CPU-bound, so batches of files are searched on a
+process pool. Batches are submitted a bounded window ahead and consumed
+in order, so results stream in a stable order and stop being scheduled
+as soon as the global result cap is reached.
+"""
+
+import itertools
+import mmap
+import multiprocessing
+import os
+import re
+import stat
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+BINARY_SNIFF_BYTES = 8192
+MMAP_MIN_SIZE = 64 * 1024  # smaller files are cheaper to read() than to map
+MAX_MATCHES_PER_FILE = 10  # matching lines returned per file (all are counted)
+BATCH_FILES = 64
+PARALLEL_MIN_FILES = BATCH_FILES  # fewer candidates than this are searched in-thread
+PREFILTER_MIN_LENGTH = 3  # shorter literals hit too often to beat testing every line
+
+# ASCII letters that re.IGNORECASE also matches to a non-ASCII character
+_IGNORECASE_EXTRA = {"k": "\u212a", "s": "\u017f", "i": "\u0130\u0131"}  # Kelvin sign, long s, dotted/dotless i
+
+# (bytes pattern, whether it runs over the ASCII-lowercased buffer)
+Needle = Optional[tuple[re.Pattern, bool]]
+
+
+def is_binary(head: bytes) -> bool:
+    return b"\0" in head[:BINARY_SNIFF_BYTES]
+
+
+def compile_pattern(query: str, regex: bool, case_sensitive: bool) -> re.Pattern:
+    """The str pattern a line must match. Raises ValueError for an invalid regex."""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if not regex:
+        return re.compile(re.escape(query), flags)
+    try:
+        return re.compile(query, flags)
+    except re.error as e:
+        raise ValueError(f"Invalid regex pattern: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Bytes prefilter
+# ---------------------------------------------------------------------------
+
+def _required_literals(parsed, ignore_case: bool) -> list[str]:
+    """Literal strings every match of a parsed pattern contains."""
+    literals = []
+    run = []
+
+    def flush():
+        if run:
+            literals.append("".join(run))
+            run.clear()
+
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL and not (ignore_case and arg >= 0x80):
+            run.append(chr(arg))
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            _group, add_flags, _del_flags, sub = arg
+            if not ignore_case and add_flags & sre_parse.SRE_FLAG_IGNORECASE:
+                continue  # case-insensitive islands would need their own expansion
+            literals.extend(_required_literals(sub, ignore_case))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", None)):
+            low, _high, sub = arg
+            if low >= 1:
+                literals.extend(_required_literals(sub, ignore_case))
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            literals.extend(_required_literals(arg, ignore_case))
+    flush()
+    return literals
+
+
+def _literal_bytes(literal: str, ignore_case: bool) -> bytes:
+    """Pattern for `literal`; case-insensitive ones are matched against lowercased ASCII."""
+    if not ignore_case:
+        return re.escape(literal.encode("utf-8"))
+    parts = []
+    for ch in literal.lower():
+        extra = _IGNORECASE_EXTRA.get(ch)
+        if extra:
+            parts.append(b"(?:" + b"|".join(re.escape(v.encode("utf-8")) for v in ch + extra) + b")")
+        else:
+            parts.append(re.escape(ch.encode("utf-8")))
+    return b"".join(parts)
+
+
+def prefilter(query: str, regex: bool, case_sensitive: bool) -> Needle:
+    """Bytes pattern found in every line the query matches, or None if there is no useful one.
+
+    Case-insensitive literals only keep their ASCII characters (non-ASCII
+    letters have case variants with other encodings).
+    """
+    ignore_case = not case_sensitive
+    if regex:
+        try:
+            parsed = sre_parse.parse(query, 0 if case_sensitive else sre_parse.SRE_FLAG_IGNORECASE)
+        except Exception:
+            return None
+        if parsed.state.flags & sre_parse.SRE_FLAG_IGNORECASE:
+            ignore_case = True
+        literals = _required_literals(parsed, ignore_case)
+    elif ignore_case:
+        literals = re.split(r"[^\x00-\x7f]+", query)
+    else:
+        literals = [query]
+    literals = [lit for lit in literals if len(lit) >= PREFILTER_MIN_LENGTH and "\n" not in lit]
+    if not literals:
+        return None
+    return re.compile(_literal_bytes(max(literals, key=len), ignore_case)), ignore_case
+
+
+# ---------------------------------------------------------------------------
+# Per-file search (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+def _line(buffer, start: int, end: int) -> str:
+    line = buffer[start:end]
+    if line.endswith(b"\r"):
+        line = line[:-1]
+    return line.decode("utf-8", errors="ignore")
+
+
+def _scan(buffer, pattern: re.Pattern, needle: Needle) -> tuple[int, list[tuple[int, str]]]:
+    """(total matching lines, first MAX_MATCHES_PER_FILE (line number, line)) of one buffer."""
+    total = 0
+    matches = []
+    if needle is None:
+        text = buffer[:].decode("utf-8", errors="ignore")
+        for line_num, line in enumerate(text.split("\n"), start=1):
+            if pattern.search(line.removesuffix("\r")):
+                total += 1
+                if len(matches) < MAX_MATCHES_PER_FILE:
+                    matches.append((line_num, line.strip()))
+        return total, matches
+
+    needle, fold = needle
+    haystack = buffer[:].lower() if fold else buffer
+    size = len(buffer)
+    pos = 0
+    line_num = 1
+    counted_to = 0  # line_num is the number of the line containing counted_to
+    while pos < size:
+        hit = needle.search(haystack, pos)
+        if hit is None:
+            break
+        start = buffer.rfind(b"\n", 0, hit.start()) + 1
+        end = buffer.find(b"\n", hit.end())
+        if end < 0:
+            end = size
+        line = _line(buffer, start, end)
+        if pattern.search(line):
+            line_num += buffer[counted_to:start].count(b"\n")
+            counted_to = start
+            total += 1
+            if len(matches) < MAX_MATCHES_PER_FILE:
+                matches.append((line_num, line.strip()))
+        pos = end + 1
+    return total, matches
+
+
+def search_file(path: str, pattern: re.Pattern, needle: Needle, max_file_size: int):
+    """("searched", total, matches) | ("binary",) | ("skipped",) for one file."""
+    try:
+        st = os.stat(path)
+        if not stat.S_ISREG(st.st_mode) or st.st_size > max_file_size:
+            return ("skipped",)
+        with open(path, "rb") as f:
+            if st.st_size < MMAP_MIN_SIZE:
+                data = f.read()
+                if is_binary(data):
+                    return ("binary",)
+                return ("searched",) + _scan(data, pattern, needle)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if is_binary(buffer[:BINARY_SNIFF_BYTES]):
+                    return ("binary",)
+                return ("searched",) + _scan(buffer, pattern, needle)
+    except (OSError, ValueError):
+        return ("skipped",)
+
+
+def search_batch(paths: list[str], query: str, regex: bool, case_sensitive: bool, max_file_size: int) -> list:
+    """search_file over a batch; patterns are compiled here since they are cheap to rebuild per batch."""
+    pattern = compile_pattern(query, regex, case_sensitive)
+    needle = prefilter(query, regex, case_sensitive)
+    return [search_file(path, pattern, needle, max_file_size) for path in paths]
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def _batches(paths: Iterable[str], size: int) -> Iterator[list[str]]:
+    batch = []
+    for path in paths:
+        batch.append(path)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ContentSearcher:
+    """Runs searches on a lazily started process pool (or in-thread with processes <= 1)."""
+
+    def __init__(self, max_file_size: int, processes: int = 0):
+        self.max_file_size = max_file_size
+        self.processes = processes if processes > 0 else (os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.searches = 0
+        self.files_searched = 0
+        self.binary_skipped = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: the server process is multi-threaded, so forking it is unsafe
+                self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def search(
+        self, paths: Iterable[str], query: str, regex: bool, case_sensitive: bool,
+        cancel: Optional[threading.Event] = None,
+    ) -> Iterator[tuple[str, tuple]]:
+        """Yield (path, search_file result) in input order.
+
+        Closing the iterator early (once enough results are in) stops any
+        further batches from being scheduled and cancels queued ones.
+        """
+        self.searches += 1
+        batches = _batches(paths, BATCH_FILES)
+        head = list(itertools.islice(batches, 2))
+        batches = itertools.chain(head, batches)
+        if self.processes <= 1 or sum(len(batch) for batch in head) < PARALLEL_MIN_FILES:
+            # Small searches are not worth the inter-process round trips
+            pattern = compile_pattern(query, regex, case_sensitive)
+            needle = prefilter(query, regex, case_sensitive)
+            for batch in batches:
+                for path in batch:
+                    if cancel is not None and cancel.is_set():
+                        return
+                    yield path, self._count(search_file(path, pattern, needle, self.max_file_size))
+            return
+
+        executor = self._executor()
+        args = (query, regex, case_sensitive, self.max_file_size)
+        pending: deque[tuple[list[str], Future]] = deque()
+        window = self.processes * 2  # batches in flight
+        try:
+            for batch in batches:
+                if cancel is not None and cancel.is_set():
+                    return
+                pending.append((batch, executor.submit(search_batch, batch, *args)))
+                if len(pending) >= window:
+                    done, future = pending.popleft()
+                    for path, result in zip(done, future.result()):
+                        yield path, self._count(result)
+            while pending:
+                if cancel is not None and cancel.is_set():
+                    return
+                done, future = pending.popleft()
+                for path, result in zip(done, future.result()):
+                    yield path, self._count(result)
+        finally:
+            for _batch, future in pending:
+                future.cancel()
+
+    def _count(self, result: tuple) -> tuple:
+        if result[0] == "searched":
+            self.files_searched += 1
+        elif result[0] == "binary":
+            self.binary_skipped += 1
+        return result
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "processes": self.processes,
+            "pool_started": self._pool is not None,
+            "searches": self.searches,
+            "files_searched": self.files_searched,
+            "binary_skipped": self.binary_skipped,
+        }
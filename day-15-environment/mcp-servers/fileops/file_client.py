@@ -1,16 +1,45 @@
-"""Client for file system operations."""
-
+"""Client for file system operations.
+
+All filesystem work is blocking, so every public (async) method hands its
+body to a bounded thread pool and awaits the result; the event loop (and
+with it every other session and SSE keepalive) never waits on disk I/O.
+Listing and searching go through one ignore-aware os.scandir walker
+(walker.py). Long-running operations receive a threading.Event
+that is set when the awaiting call is cancelled, and stop at the next
+entry they examine.
+
+With an index directory configured, search_content first narrows the
+files to read through a persistent trigram index (see trigram_index.py);
+without one, or while the index is still being built, it walks the tree.
+The files themselves are searched by content_search.ContentSearcher, on
+a process pool.
+"""
+
+import asyncio
+import functools
+import logging
 import os
 import glob
-import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .content_search import ContentSearcher, compile_pattern
+from .trigram_index import TrigramIndex, query_plan
+from .walker import DEFAULT_EXCLUDE, Walker
+
+logger = logging.getLogger(__name__)
 
 
 class FileClient:
     """Client for safe file system operations."""
 
-    def __init__(self, root_dir: str, max_file_size: int, max_search_results: int):
+    def __init__(
+        self, root_dir: str, max_file_size: int, max_search_results: int, io_workers: int = 4,
+        index_dir: Optional[str] = None, index_refresh: float = 5.0, search_processes: int = 0,
+        exclude: Iterable[str] = DEFAULT_EXCLUDE, use_ignore_files: bool = True,
+    ):
         """
         Initialize FileClient.
 
@@ -18,14 +47,84 @@ class FileClient:
             root_dir: Root directory for file operations
             max_file_size: Maximum allowed file size in bytes
             max_search_results: Maximum number of search results
+            io_workers: Threads for blocking filesystem work (bounds concurrent operations)
+            index_dir: Directory for the persistent trigram index (None: no index)
+            index_refresh: Minimum seconds between index refreshes on search
+            search_processes: Worker processes for content search (0: one per CPU, 1: in-thread)
+            exclude: Globs of files and directories never listed or searched
+            use_ignore_files: Skip paths matched by .gitignore/.ignore files
         """
         self.root_dir = Path(root_dir).resolve()
         self.max_file_size = max_file_size
         self.max_search_results = max_search_results
+        self.io_workers = io_workers
+        self._executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="fileops-io")
+        self._active = 0
+        self.cancelled = 0
 
         # Ensure root directory exists
         self.root_dir.mkdir(parents=True, exist_ok=True)
 
+        self.walker = Walker(self.root_dir, exclude, use_ignore_files)
+        self.searcher = ContentSearcher(max_file_size, search_processes)
+        self.index = TrigramIndex(self.walker, index_dir, max_file_size, index_refresh) if index_dir else None
+
+    async def _run(self, func: Callable, *args, cancellable: bool = False) -> Any:
+        """Run blocking `func(*args)` on the I/O pool.
+
+        With `cancellable`, `func` also receives a threading.Event as its
+        `cancel` keyword; it is set if this call is cancelled, so the worker
+        can stop early instead of finishing work nobody will read.
+        """
+        cancel = threading.Event() if cancellable else None
+        call = functools.partial(func, *args, cancel=cancel) if cancellable else functools.partial(func, *args)
+        self._active += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except asyncio.CancelledError:
+            if cancel is not None:
+                cancel.set()
+            self.cancelled += 1
+            raise
+        finally:
+            self._active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "io_workers": self.io_workers,
+            "active_operations": self._active,
+            "cancelled": self.cancelled,
+            "index": self.index.stats() if self.index else None,
+            "content_search": self.searcher.stats(),
+            "walker": self.walker.stats(),
+        }
+
+    async def start(self):
+        """Bring the trigram index up to date in the background (searches scan until it is ready).
+
+        The build gets its own thread rather than an I/O pool worker, which
+        it would hold for the whole walk.
+        """
+        if self.index:
+            threading.Thread(target=self._build_index, name="fileops-index", daemon=True).start()
+
+    def _build_index(self):
+        try:
+            self.index.refresh(force=True)
+        except Exception as e:
+            logger.error(f"Trigram index build failed: {e}")
+
+    async def close(self):
+        """Stop the I/O and search pools (queued operations are dropped) and persist the index."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.searcher.close()
+        if self.index:
+            await asyncio.to_thread(self.index.save)
+
+    def _index_update(self, target: Path):
+        if self.index:
+            self.index.update(str(target.relative_to(self.root_dir)))
+
     def _resolve_path(self, path: str) -> Path:
         """
         Resolve path relative to root_dir and ensure it's within root_dir.
@@ -71,6 +170,9 @@ class FileClient:
         Returns:
             Dict with operation details
         """
+        return await self._run(self._write_file, path, content, append)
+
+    def _write_file(self, path: str, content: str, append: bool = False) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         # Check content size
@@ -86,7 +188,9 @@ class FileClient:
 
         # Write file
         mode = "a" if append else "w"
-        target.write_text(content, encoding="utf-8")
+        with open(target, mode, encoding="utf-8") as f:
+            f.write(content)
+        self._index_update(target)
 
         return {
             "path": str(target.relative_to(self.root_dir)),
@@ -105,6 +209,9 @@ class FileClient:
         Returns:
             Dict with file content and metadata
         """
+        return await self._run(self._read_file, path)
+
+    def _read_file(self, path: str) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         if not target.exists():
@@ -132,17 +239,26 @@ class FileClient:
             "lines": len(content.splitlines()),
         }
 
-    async def list_directory(self, path: str = ".", pattern: str = "*") -> Dict[str, Any]:
+    async def list_directory(
+        self, path: str = ".", pattern: str = "*", include_ignored: bool = False
+    ) -> Dict[str, Any]:
         """
         List files in a directory.
 
         Args:
             path: Directory path (default: current directory)
             pattern: Glob pattern for filtering (default: all files)
+            include_ignored: If True, also list paths matched by .gitignore/.ignore
 
         Returns:
             Dict with directory listing
         """
+        return await self._run(self._list_directory, path, pattern, include_ignored, cancellable=True)
+
+    def _list_directory(
+        self, path: str = ".", pattern: str = "*", include_ignored: bool = False,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         if not target.exists():
@@ -151,17 +267,20 @@ class FileClient:
         if not target.is_dir():
             raise ValueError(f"Path is not a directory: {path}")
 
-        # List files matching pattern
+        # List files matching pattern (only as deep as the pattern reaches)
+        max_depth = None if "**" in pattern else pattern.strip("/").count("/") + 1
+        matches = self.walker.matcher(target, pattern, anywhere=False)
         entries = []
-        for item in sorted(target.glob(pattern)):
+        for relative_path, entry, _depth in self.walker.walk(target, max_depth, include_ignored, cancel):
+            if not matches(relative_path, entry.name):
+                continue
             try:
-                relative_path = item.relative_to(self.root_dir)
-                stat = item.stat()
+                is_file = entry.is_file()
                 entries.append({
-                    "name": item.name,
-                    "path": str(relative_path),
-                    "type": "file" if item.is_file() else "directory",
-                    "size_bytes": stat.st_size if item.is_file() else None,
+                    "name": entry.name,
+                    "path": relative_path,
+                    "type": "file" if is_file else "directory",
+                    "size_bytes": entry.stat().st_size if is_file else None,
                 })
             except (PermissionError, OSError):
                 continue  # Skip inaccessible files
@@ -173,7 +292,10 @@ class FileClient:
             "count": len(entries),
         }
 
-    async def search_files(self, pattern: str, path: str = ".", recursive: bool = True) -> Dict[str, Any]:
+    async def search_files(
+        self, pattern: str, path: str = ".", recursive: bool = True,
+        max_depth: Optional[int] = None, include_ignored: bool = False,
+    ) -> Dict[str, Any]:
         """
         Search for files by name pattern.
 
@@ -181,10 +303,21 @@ class FileClient:
             pattern: Glob pattern (e.g., "*.py", "test_*.txt")
             path: Starting directory (default: root)
             recursive: If True, search recursively
+            max_depth: Maximum directory depth below path (1 = direct children)
+            include_ignored: If True, also search paths matched by .gitignore/.ignore
 
         Returns:
             Dict with search results
         """
+        return await self._run(
+            self._search_files, pattern, path, recursive, max_depth, include_ignored, cancellable=True
+        )
+
+    def _search_files(
+        self, pattern: str, path: str = ".", recursive: bool = True,
+        max_depth: Optional[int] = None, include_ignored: bool = False,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         if not target.exists():
@@ -194,22 +327,22 @@ class FileClient:
             raise ValueError(f"Path is not a directory: {path}")
 
         # Search for files
-        glob_pattern = f"**/{pattern}" if recursive else pattern
+        if not recursive:
+            max_depth = pattern.strip("/").count("/") + 1
         results = []
 
-        for item in target.glob(glob_pattern):
+        for relative_path, entry in self.walker.files(
+            target, pattern, max_depth, include_ignored, cancel, anywhere=recursive
+        ):
             if len(results) >= self.max_search_results:
                 break
 
             try:
-                if item.is_file():
-                    relative_path = item.relative_to(self.root_dir)
-                    stat = item.stat()
-                    results.append({
-                        "path": str(relative_path),
-                        "absolute_path": str(item),
-                        "size_bytes": stat.st_size,
-                    })
+                results.append({
+                    "path": relative_path,
+                    "absolute_path": entry.path,
+                    "size_bytes": entry.stat().st_size,
+                })
             except (PermissionError, OSError):
                 continue  # Skip inaccessible files
 
@@ -224,7 +357,8 @@ class FileClient:
 
     async def search_content(
         self, query: str, path: str = ".", file_pattern: str = "*",
-        case_sensitive: bool = False, regex: bool = False
+        case_sensitive: bool = False, regex: bool = False,
+        max_depth: Optional[int] = None, include_ignored: bool = False,
     ) -> Dict[str, Any]:
         """
         Search for content within files.
@@ -235,10 +369,23 @@ class FileClient:
             file_pattern: Glob pattern for files to search (default: all files)
             case_sensitive: If True, search is case-sensitive
             regex: If True, treat query as regex pattern
+            max_depth: Maximum directory depth below path (1 = direct children)
+            include_ignored: If True, also search paths matched by .gitignore/.ignore
 
         Returns:
             Dict with search results
         """
+        return await self._run(
+            self._search_content, query, path, file_pattern, case_sensitive, regex, max_depth, include_ignored,
+            cancellable=True,
+        )
+
+    def _search_content(
+        self, query: str, path: str = ".", file_pattern: str = "*",
+        case_sensitive: bool = False, regex: bool = False,
+        max_depth: Optional[int] = None, include_ignored: bool = False,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         if not target.exists():
@@ -247,61 +394,51 @@ class FileClient:
         if not target.is_dir():
             raise ValueError(f"Path is not a directory: {path}")
 
-        # Compile search pattern
-        if regex:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            try:
-                pattern = re.compile(query, flags)
-            except re.error as e:
-                raise ValueError(f"Invalid regex pattern: {e}")
+        # Validate the query up front (raises ValueError for an invalid regex)
+        compile_pattern(query, regex, case_sensitive)
+
+        # Candidate files: index candidates when available, otherwise the whole tree
+        use_index = (
+            self.index is not None and self.index.ready and max_depth is None and not include_ignored
+        )
+        if use_index:
+            self.index.refresh()
+            plan = query_plan(query, regex, case_sensitive)
+            under = str(target.relative_to(self.root_dir))
+            matches = self.walker.matcher(target, file_pattern, anywhere=True)
+            paths = (str(self.root_dir / p) for p in self.index.candidates(plan, under, matches))
         else:
-            # Escape query for literal matching
-            escaped_query = re.escape(query)
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = re.compile(escaped_query, flags)
+            paths = (
+                entry.path for _relative, entry in self.walker.files(
+                    target, file_pattern, max_depth, include_ignored, cancel
+                )
+            )
 
-        # Search in files
         results = []
         files_searched = 0
+        binary_skipped = 0
 
-        for item in target.rglob(file_pattern):
-            if len(results) >= self.max_search_results:
-                break
-
-            if not item.is_file():
-                continue
-
-            # Skip large files
-            try:
-                if item.stat().st_size > self.max_file_size:
+        found = self.searcher.search(paths, query, regex, case_sensitive, cancel)
+        try:
+            for item, outcome in found:
+                if outcome[0] == "binary":
+                    binary_skipped += 1
+                if outcome[0] != "searched":
                     continue
-            except (PermissionError, OSError):
-                continue
-
-            files_searched += 1
-
-            # Search in file
-            try:
-                content = item.read_text(encoding="utf-8", errors="ignore")
-                matches = []
-
-                for line_num, line in enumerate(content.splitlines(), start=1):
-                    if pattern.search(line):
-                        matches.append({
-                            "line_number": line_num,
-                            "line": line.strip(),
-                        })
-
-                if matches:
-                    relative_path = item.relative_to(self.root_dir)
-                    results.append({
-                        "path": str(relative_path),
-                        "absolute_path": str(item),
-                        "matches": matches[:10],  # Limit matches per file
-                        "total_matches": len(matches),
-                    })
-            except (PermissionError, OSError, UnicodeDecodeError):
-                continue  # Skip problematic files
+                files_searched += 1
+                total, matches = outcome[1], outcome[2]
+                if not total:
+                    continue
+                results.append({
+                    "path": os.path.relpath(item, self.root_dir),
+                    "absolute_path": item,
+                    "matches": [{"line_number": n, "line": line} for n, line in matches],
+                    "total_matches": total,
+                })
+                if len(results) >= self.max_search_results:
+                    break
+        finally:
+            found.close()  # stops scheduling further batches
 
         return {
             "query": query,
@@ -310,6 +447,8 @@ class FileClient:
             "case_sensitive": case_sensitive,
             "regex": regex,
             "files_searched": files_searched,
+            "binary_skipped": binary_skipped,
+            "indexed": use_index,
             "results": results,
             "count": len(results),
             "truncated": len(results) >= self.max_search_results,
@@ -325,6 +464,9 @@ class FileClient:
         Returns:
             Dict with operation details
         """
+        return await self._run(self._delete_file, path)
+
+    def _delete_file(self, path: str) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         if not target.exists():
@@ -339,6 +481,7 @@ class FileClient:
 
         # Delete file
         target.unlink()
+        self._index_update(target)
 
         return {
             "path": relative_path,
@@ -356,6 +499,9 @@ class FileClient:
         Returns:
             Dict with operation details
         """
+        return await self._run(self._create_directory, path)
+
+    def _create_directory(self, path: str) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         # Create directory (with parents if needed)
@@ -377,6 +523,9 @@ class FileClient:
         Returns:
             Dict with file information
         """
+        return await self._run(self._get_file_info, path)
+
+    def _get_file_info(self, path: str) -> Dict[str, Any]:
         target = self._resolve_path(path)
 
         if not target.exists():
@@ -13,18 +13,26 @@ Environment variables:
     FILEOPS_ROOT_DIR         Root directory for file operations (default: current directory)
     FILEOPS_MAX_FILE_SIZE    Maximum file size in bytes (default: 10MB)
     FILEOPS_MAX_SEARCH_RESULTS  Maximum search results (default: 100)
+    FILEOPS_IO_WORKERS       Threads for blocking filesystem work (default: 4)
+    FILEOPS_INDEX_DIR        Directory of the trigram index for search_content (default: none, scan)
+    FILEOPS_INDEX_REFRESH    Minimum seconds between incremental index refreshes (default: 5)
+    FILEOPS_SEARCH_PROCESSES Worker processes for search_content (default: 0 = one per CPU; 1 = in-thread)
+    FILEOPS_EXCLUDE          Comma-separated globs never listed or searched
+                             (default: .git,.hg,.svn,node_modules,.gradle,__pycache__)
+    FILEOPS_USE_IGNORE_FILES Honor .gitignore/.ignore files when listing and searching (default: true)
 """
 
 import argparse
 import logging
 import sys
 
-import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from shared import McpProtocolHandler, SseTransport
+from shared import (
+    ApiKeyAuth, ApiKeyAuthMiddleware, LifespanManager, McpProtocolHandler,
+    SseTransport, run_server,
+)
 from .config import load_config
 from .file_client import FileClient
 from .tools import get_all_tools
@@ -53,14 +61,24 @@ def parse_args() -> argparse.Namespace:
 
 def build_app(config, file_client: FileClient) -> FastAPI:
     tools = get_all_tools(file_client)
-    protocol_handler = McpProtocolHandler(tools, server_name=SERVER_NAME, server_version=SERVER_VERSION)
+    lifespan = LifespanManager()
+    protocol_handler = McpProtocolHandler(
+        tools, server_name=SERVER_NAME, server_version=SERVER_VERSION, lifespan=lifespan
+    )
     sse_transport = SseTransport(protocol_handler)
 
+    # Shutdown order: stop new calls → drain in-flight → flush SSE → close upstream clients
+    lifespan.on_startup(file_client.start)
+    lifespan.on_drain(sse_transport.close_all_sessions)
+    lifespan.on_close(file_client.close)
+
     app = FastAPI(
         title="FileOps MCP Server",
         description="MCP server for file system operations via SSE transport.",
         version=SERVER_VERSION,
+        lifespan=lifespan.lifespan,
     )
+    app.state.lifespan = lifespan
 
     # CORS — allow any origin so clients can connect
     app.add_middleware(
@@ -70,22 +88,10 @@ def build_app(config, file_client: FileClient) -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
     )
 
-    # API-key authentication middleware (only when auth is enabled)
-    if config.auth.enabled:
-        api_key = config.auth.api_key
-        public_paths = {"/health", "/", "/docs", "/redoc", "/openapi.json"}
-
-        @app.middleware("http")
-        async def auth_middleware(request: Request, call_next):
-            if request.url.path in public_paths:
-                return await call_next(request)
-            key = request.headers.get("x-api-key") or request.query_params.get("api_key")
-            if key != api_key:
-                return JSONResponse(
-                    {"error": "Unauthorized: missing or invalid X-API-Key header"},
-                    status_code=401,
-                )
-            return await call_next(request)
+    # API-key authentication + per-key rate limiting (only when auth is enabled)
+    auth = ApiKeyAuth.from_env(config.auth.api_key) if config.auth.enabled else None
+    if auth:
+        app.add_middleware(ApiKeyAuthMiddleware, auth=auth)
 
     # MCP SSE transport routes (/sse and /message)
     sse_transport.setup_routes(app)
@@ -95,12 +101,15 @@ def build_app(config, file_client: FileClient) -> FastAPI:
     @app.get("/health")
     async def health():
         return {
-            "status": "ok",
+            "status": "ok" if lifespan.accepting else "draining",
+            "in_flight_calls": lifespan.in_flight,
             "tools_count": len(tools),
             "active_sessions": sse_transport.get_active_session_count(),
             "auth_enabled": config.auth.enabled,
+            "auth": auth.stats() if auth else None,
             "root_directory": config.fileops.root_dir,
             "max_file_size": config.fileops.max_file_size,
+            "io": file_client.stats(),
         }
 
     @app.get("/")
@@ -160,16 +169,23 @@ def main():
     logger.info(f"  Auth:         {auth_status}")
     logger.info(f"  Root dir:     {config.fileops.root_dir}")
     logger.info(f"  Max file size: {config.fileops.max_file_size} bytes")
+    logger.info(f"  Content index: {config.fileops.index_dir or 'disabled'}")
     logger.info(f"  Tools:        write_file, read_file, search_files, search_content, ...")
 
     file_client = FileClient(
         root_dir=config.fileops.root_dir,
         max_file_size=config.fileops.max_file_size,
         max_search_results=config.fileops.max_search_results,
+        io_workers=config.fileops.io_workers,
+        index_dir=config.fileops.index_dir,
+        index_refresh=config.fileops.index_refresh,
+        search_processes=config.fileops.search_processes,
+        exclude=config.fileops.exclude,
+        use_ignore_files=config.fileops.use_ignore_files,
     )
     app = build_app(config, file_client)
 
-    uvicorn.run(app, host=config.server.host, port=config.server.port)
+    run_server(app, config.server.host, config.server.port)
 
 
 if __name__ == "__main__":
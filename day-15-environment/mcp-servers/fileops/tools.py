@@ -144,15 +144,20 @@ class ListDirectoryTool(FileOpsTool):
                 "type": "string",
                 "description": "Glob pattern for filtering (e.g., '*.py', 'test_*') (default: '*')",
             },
+            "include_ignored": {
+                "type": "boolean",
+                "description": "If true, also include paths matched by .gitignore/.ignore files (default: false)",
+            },
         },
     }
 
     async def execute(self, arguments: dict) -> ToolResult:
         path = arguments.get("path", ".").strip()
         pattern = arguments.get("pattern", "*").strip()
+        include_ignored = arguments.get("include_ignored", False)
 
         try:
-            result = await self.client.list_directory(path, pattern)
+            result = await self.client.list_directory(path, pattern, include_ignored)
 
             lines = [
                 f"Directory: {result['directory']}",
@@ -202,6 +207,15 @@ class SearchFilesTool(FileOpsTool):
                 "type": "boolean",
                 "description": "If true, search recursively (default: true)",
             },
+            "max_depth": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum directory depth below path, 1 = direct children (default: unlimited)",
+            },
+            "include_ignored": {
+                "type": "boolean",
+                "description": "If true, also include paths matched by .gitignore/.ignore files (default: false)",
+            },
         },
         "required": ["pattern"],
     }
@@ -210,12 +224,16 @@ class SearchFilesTool(FileOpsTool):
         pattern = arguments.get("pattern", "").strip()
         path = arguments.get("path", ".").strip()
         recursive = arguments.get("recursive", True)
+        max_depth = arguments.get("max_depth")
+        include_ignored = arguments.get("include_ignored", False)
 
         if not pattern:
             return ToolResult("Missing required parameter: pattern", is_error=True)
+        if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 1):
+            return ToolResult("max_depth must be a positive integer", is_error=True)
 
         try:
-            result = await self.client.search_files(pattern, path, recursive)
+            result = await self.client.search_files(pattern, path, recursive, max_depth, include_ignored)
 
             lines = [
                 f"Search pattern: {result['pattern']}",
@@ -276,6 +294,15 @@ class SearchContentTool(FileOpsTool):
                 "type": "boolean",
                 "description": "If true, treat query as regex pattern (default: false)",
             },
+            "max_depth": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum directory depth below path, 1 = direct children (default: unlimited)",
+            },
+            "include_ignored": {
+                "type": "boolean",
+                "description": "If true, also include paths matched by .gitignore/.ignore files (default: false)",
+            },
         },
         "required": ["query"],
     }
@@ -286,13 +313,17 @@ class SearchContentTool(FileOpsTool):
         file_pattern = arguments.get("file_pattern", "*").strip()
         case_sensitive = arguments.get("case_sensitive", False)
         regex = arguments.get("regex", False)
+        max_depth = arguments.get("max_depth")
+        include_ignored = arguments.get("include_ignored", False)
 
         if not query:
             return ToolResult("Missing required parameter: query", is_error=True)
+        if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 1):
+            return ToolResult("max_depth must be a positive integer", is_error=True)
 
         try:
             result = await self.client.search_content(
-                query, path, file_pattern, case_sensitive, regex
+                query, path, file_pattern, case_sensitive, regex, max_depth, include_ignored
             )
 
             lines = [
@@ -301,9 +332,11 @@ class SearchContentTool(FileOpsTool):
                 f"File pattern: {result['file_pattern']}",
                 f"Case sensitive: {result['case_sensitive']}",
                 f"Regex: {result['regex']}",
-                f"Files searched: {result['files_searched']}",
+                f"Files searched: {result['files_searched']}" + (" (trigram index)" if result.get('indexed') else ""),
                 f"Files with matches: {result['count']}",
             ]
+            if result.get('binary_skipped'):
+                lines.append(f"Binary files skipped: {result['binary_skipped']}")
 
             if result['truncated']:
                 lines.append("⚠️  Results truncated (max limit reached)")
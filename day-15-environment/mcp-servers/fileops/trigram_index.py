@@ -0,0 +1,413 @@
+"""Persistent trigram index over the fileops root.
+
+Every indexed file is reduced to the set of 3-byte sequences (trigrams)
+in its case-folded UTF-8 text; each trigram maps to the sorted ids of the
+files containing it. A query is turned into a boolean plan of trigrams
+its matches must contain (literal text directly, regexes via their parse
+tree), and only files satisfying the plan are read and searched. Queries
+that yield no trigrams (".*", "ab") fall back to every file.
+
+The index is kept current incrementally: a refresh walks the root (with
+the same exclude globs and ignore files as a default search) and
+re-reads only files whose (mtime_ns, size) changed. Changed or deleted
+files get a new id (or none) and their old id becomes a tombstone that
+is filtered out of posting lists until the next compaction.
+
+On-disk format (one file per root): a 4-byte header length, a JSON
+header (files, ids, trigram count) and the raw arrays (trigram keys,
+posting lengths, concatenated postings).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from array import array
+from typing import Callable, Iterable, Optional
+
+from .content_search import is_binary
+from .walker import Walker
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+COMPACT_RATIO = 0.5  # compact once tombstones exceed this share of ids
+SAVE_INTERVAL = 60.0  # seconds between index saves after incremental updates
+
+# Characters that case-insensitive matching equates with an ASCII letter
+# but str.lower() does not map to it ("ſ" ~ "s", "ı"/"İ" ~ "i")
+_FOLD = str.maketrans({"ſ": "s", "ı": "i", "İ": "i"})
+
+# Plan nodes: ("tri", key) | ("and", [plans]) | ("or", [plans]); None means "any file"
+Plan = Optional[tuple]
+
+
+def _fold(text: str) -> bytes:
+    return text.translate(_FOLD).lower().encode("utf-8")
+
+
+def trigrams(data: bytes) -> set[bytes]:
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+
+# ---------------------------------------------------------------------------
+# Query plans
+# ---------------------------------------------------------------------------
+
+def _literal_plan(text: str, ignore_case: bool) -> Plan:
+    keys = trigrams(_fold(text))
+    if ignore_case:
+        # Non-ASCII letters have case variants with other encodings (σ/ς); keep ASCII-only keys
+        keys = {k for k in keys if max(k) < 0x80}
+    if not keys:
+        return None
+    return ("and", [("tri", k) for k in sorted(keys)])
+
+
+def _and(plans: Iterable[Plan]) -> Plan:
+    plans = [p for p in plans if p is not None]
+    if not plans:
+        return None
+    return plans[0] if len(plans) == 1 else ("and", plans)
+
+
+def _or(plans: list[Plan]) -> Plan:
+    if not plans or any(p is None for p in plans):
+        return None
+    return plans[0] if len(plans) == 1 else ("or", plans)
+
+
+def _regex_plan(parsed, ignore_case: bool) -> Plan:
+    """Trigrams any match of a parsed (sub)pattern must contain."""
+    plans = []
+    run = []  # consecutive literal characters
+
+    def flush():
+        if run:
+            plans.append(_literal_plan("".join(run), ignore_case))
+            run.clear()
+
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            _group, add_flags, del_flags, sub = arg
+            plans.append(_regex_plan(sub, ignore_case or bool(add_flags & sre_parse.SRE_FLAG_IGNORECASE)))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", None)):
+            low, _high, sub = arg
+            if low >= 1:
+                plans.append(_regex_plan(sub, ignore_case))
+        elif op is sre_parse.BRANCH:
+            plans.append(_or([_regex_plan(branch, ignore_case) for branch in arg[1]]))
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            plans.append(_regex_plan(arg, ignore_case))
+        # Anything else (classes, anchors, backrefs, lookarounds) constrains nothing
+    flush()
+    return _and(plans)
+
+
+def query_plan(query: str, regex: bool, case_sensitive: bool) -> Plan:
+    """Trigram plan for a search_content query; None when it cannot narrow the search."""
+    if not regex:
+        return _literal_plan(query, not case_sensitive)
+    try:
+        parsed = sre_parse.parse(query, 0 if case_sensitive else sre_parse.SRE_FLAG_IGNORECASE)
+    except Exception:
+        return None
+    ignore_case = bool(parsed.state.flags & sre_parse.SRE_FLAG_IGNORECASE)
+    return _regex_plan(parsed, ignore_case)
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class TrigramIndex:
+    def __init__(self, walker: Walker, directory: str, max_file_size: int, refresh_interval: float = 5.0):
+        self.walker = walker
+        self.root = os.path.abspath(walker.root)
+        digest = hashlib.sha1(self.root.encode()).hexdigest()[:12]
+        self.path = os.path.join(os.path.abspath(os.path.expanduser(directory)), f"trigrams-{digest}.bin")
+        self.max_file_size = max_file_size
+        self.refresh_interval = refresh_interval
+        self.files: dict[str, tuple[int, int, int]] = {}  # relative path → (id, mtime_ns, size)
+        self.paths: list[Optional[str]] = []  # id → relative path, None for tombstones
+        self.postings: dict[bytes, array] = {}  # trigram → ascending ids ('I')
+        self.ready = False
+        self._lock = threading.Lock()  # guards the tables; never held across a walk or file reads
+        self._refresh_lock = threading.Lock()  # one refresh at a time
+        self._refreshing = False
+        self._queued: set[str] = set()  # paths updated while a refresh was running
+        self._refreshed_at = 0.0
+        self._saved_at = 0.0
+        self._dirty = False
+        self.queries = 0
+        self._load()
+
+    # --- persistence ---
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                (header_len,) = struct.unpack("<I", f.read(4))
+                header = json.loads(f.read(header_len))
+                if header.get("version") != INDEX_VERSION or header.get("root") != self.root:
+                    return
+                count = header["trigrams"]
+                keys = f.read(count * 3)
+                lengths = array("I")
+                lengths.fromfile(f, count)
+                ids = array("I")
+                ids.fromfile(f, sum(lengths))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, EOFError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable trigram index {self.path}: {e}")
+            return
+
+        postings = {}
+        offset = 0
+        for i, length in enumerate(lengths):
+            postings[keys[i * 3:i * 3 + 3]] = ids[offset:offset + length]
+            offset += length
+        self.paths = header["paths"]
+        self.files = {path: tuple(meta) for path, meta in header["files"].items()}
+        self.postings = postings
+        self.ready = True
+        logger.info(f"Trigram index: {len(self.files)} files, {len(postings)} trigrams from {self.path}")
+
+    def _save(self):
+        keys = list(self.postings)
+        lengths = array("I", (len(self.postings[k]) for k in keys))
+        header = json.dumps({
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "paths": self.paths,
+            "files": self.files,
+            "trigrams": len(keys),
+        }).encode()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                f.write(b"".join(keys))
+                lengths.tofile(f)
+                for key in keys:
+                    self.postings[key].tofile(f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist trigram index to {self.path}: {e}")
+            return
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def save(self):
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    # --- updates ---
+
+    def _read(self, absolute: str) -> Optional[set[bytes]]:
+        try:
+            with open(absolute, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if is_binary(data):
+            return set()  # never searched, so never needs to be a candidate
+        # Index exactly the text the search decodes (undecodable bytes dropped)
+        return trigrams(_fold(data.decode("utf-8", errors="ignore")))
+
+    def _remove(self, relative: str):
+        entry = self.files.pop(relative, None)
+        if entry is not None:
+            self.paths[entry[0]] = None
+            self._dirty = True
+
+    def _keys(self, relative: str, size: int) -> Optional[set[bytes]]:
+        """Trigrams of one file, read without the lock; None if it is not indexed."""
+        if size > self.max_file_size:
+            return None
+        return self._read(os.path.join(self.root, relative))
+
+    def _insert(self, relative: str, mtime_ns: int, size: int, keys: Optional[set[bytes]]):
+        self._remove(relative)
+        if keys is None:
+            return
+        file_id = len(self.paths)
+        self.paths.append(relative)
+        self.files[relative] = (file_id, mtime_ns, size)
+        for key in keys:
+            posting = self.postings.get(key)
+            if posting is None:
+                posting = self.postings[key] = array("I")
+            posting.append(file_id)
+        self._dirty = True
+
+    def _walk(self) -> dict[str, tuple[int, int]]:
+        """The files a default (ignore-aware) search would see, with their (mtime_ns, size)."""
+        found = {}
+        for relative, entry in self.walker.files(self.walker.root):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            found[relative] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def _compact(self):
+        live = sorted(self.files.items(), key=lambda item: item[1][0])
+        renumber = {}
+        paths = []
+        for relative, (old_id, mtime_ns, size) in live:
+            renumber[old_id] = len(paths)
+            self.files[relative] = (len(paths), mtime_ns, size)
+            paths.append(relative)
+        postings = {}
+        for key, ids in self.postings.items():
+            kept = array("I", (renumber[i] for i in ids if i in renumber))
+            if kept:
+                postings[key] = kept
+        self.paths, self.postings = paths, postings
+
+    def refresh(self, force: bool = False) -> int:
+        """Re-index files added or changed since the last refresh. Returns the number of files updated.
+
+        The walk and file reads run without the table lock, so queries and
+        update() are not held up by a build; update() calls made meanwhile
+        are queued and replayed once the diff is applied. A non-forced
+        refresh returns at once if another one is running.
+        """
+        if not force and self.ready and time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return 0
+        if not self._refresh_lock.acquire(blocking=force):
+            return 0
+        try:
+            with self._lock:
+                self._refreshing = True
+            started = time.monotonic()
+            current = self._walk()
+            with self._lock:
+                removed = [r for r in self.files if r not in current]
+                changed = [
+                    (relative, meta) for relative, meta in current.items()
+                    if relative not in self.files or self.files[relative][1:] != meta
+                ]
+            reads = [(relative, mtime_ns, size, self._keys(relative, size)) for relative, (mtime_ns, size) in changed]
+            with self._lock:
+                for relative in removed:
+                    self._remove(relative)
+                for relative, mtime_ns, size, keys in reads:
+                    self._insert(relative, mtime_ns, size, keys)
+                if len(self.paths) - len(self.files) > COMPACT_RATIO * max(len(self.paths), 1):
+                    self._compact()
+                queued, self._queued = self._queued, set()
+                self._refreshing = False
+                self.ready = True
+            updated = len(removed) + len(reads)
+            if updated:
+                logger.info(f"Trigram index: {updated} file(s) updated in {time.monotonic() - started:.2f}s "
+                            f"({len(self.files)} indexed)")
+            for relative in queued:
+                self.update(relative)
+            with self._lock:
+                if self._dirty and (force or time.monotonic() - self._saved_at >= SAVE_INTERVAL):
+                    self._save()
+            self._refreshed_at = time.monotonic()
+            return updated
+        finally:
+            with self._lock:
+                self._refreshing = False
+            self._refresh_lock.release()
+
+    def update(self, relative: str):
+        """Re-index (or drop) one file after fileops itself changed it."""
+        with self._lock:
+            if self._refreshing:
+                self._queued.add(relative)
+                return
+            if not self.ready:
+                return
+        keys = mtime_ns = size = None
+        absolute = os.path.join(self.root, relative)
+        if self.walker.visible(relative):
+            try:
+                st = os.stat(absolute)
+                if os.path.isfile(absolute):
+                    mtime_ns, size = st.st_mtime_ns, st.st_size
+                    keys = self._keys(relative, size)
+            except OSError:
+                pass
+        with self._lock:
+            if self._refreshing:
+                self._queued.add(relative)
+            elif keys is None:
+                self._remove(relative)
+            else:
+                self._insert(relative, mtime_ns, size, keys)
+
+    # --- queries ---
+
+    def _evaluate(self, plan: Plan) -> Optional[set[int]]:
+        """Candidate ids for a plan; None means every file."""
+        if plan is None:
+            return None
+        kind, arg = plan
+        if kind == "tri":
+            return set(self.postings.get(arg, ()))
+        if kind == "or":
+            result = set()
+            for sub in arg:
+                ids = self._evaluate(sub)
+                if ids is None:
+                    return None
+                result |= ids
+            return result
+        # "and": intersect the rarest trigrams first
+        subs = sorted(arg, key=lambda p: len(self.postings.get(p[1], ())) if p[0] == "tri" else 1 << 30)
+        result = None
+        for sub in subs:
+            ids = self._evaluate(sub)
+            if ids is None:
+                continue
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    def candidates(self, plan: Plan, under: str = "", match: Optional[Callable[[str, str], bool]] = None) -> list[str]:
+        """Sorted relative paths under `under` that pass `match(path, name)` and may satisfy `plan`."""
+        prefix = "" if under in ("", ".") else under.rstrip("/") + "/"
+        with self._lock:
+            self.queries += 1
+            ids = self._evaluate(plan)
+            if ids is None:
+                paths = list(self.files)
+            else:
+                paths = [self.paths[i] for i in ids if self.paths[i] is not None]
+        return sorted(
+            p for p in paths
+            if p.startswith(prefix) and (match is None or match(p, p.rpartition("/")[2]))
+        )
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "files": len(self.files),
+            "trigrams": len(self.postings),
+            "tombstones": len(self.paths) - len(self.files),
+            "queries": self.queries,
+        }
@@ -0,0 +1,306 @@
+"""Directory walker shared by listing, file search, content search and the index.
+
+Built on os.scandir: entries are classified from their DirEntry (no extra
+stat for files or directories), directories are pruned before they are
+entered, and callers that need sizes or mtimes use the DirEntry's cached
+stat. Directory symlinks are not followed.
+
+Pruning rules, in order:
+  - exclude globs (FILEOPS_EXCLUDE): a glob without "/" matches any entry
+    name, one with "/" matches the path relative to the root;
+  - .gitignore, .ignore and .git/info/exclude files, with gitignore
+    semantics: "!" re-includes, a trailing "/" matches directories only,
+    a pattern containing "/" is anchored to its file's directory, "**"
+    spans directories, later rules win and deeper files override
+    shallower ones (.ignore over .gitignore in the same directory);
+  - a maximum depth (1 = direct children of the start directory).
+
+Parsed ignore files are cached by (path, mtime).
+"""
+
+import fnmatch
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+IGNORE_FILES = (".gitignore", ".ignore")  # later files take precedence
+DEFAULT_EXCLUDE = (".git", ".hg", ".svn", "node_modules", ".gradle", "__pycache__")
+
+
+def translate_glob(pattern: str) -> str:
+    """Glob → regex over "/"-separated paths: "*" and "?" stay within a component, "**" spans them."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/") and i + 2 == n:
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "^") else i + 1)
+            if end < 0:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body[:1] in ("!", "^"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    regex: re.Pattern  # full match against the path relative to the rule's directory
+    negate: bool
+    dir_only: bool
+
+
+def parse_ignore(text: str) -> list[IgnoreRule]:
+    rules = []
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith(("\\!", "\\#")):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = translate_glob(line)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        rules.append(IgnoreRule(re.compile(regex, re.DOTALL), negate, dir_only))
+    return rules
+
+
+# (directory relative to root, "" for the root itself; its rules)
+IgnoreContext = tuple[str, list[IgnoreRule]]
+
+
+class Walker:
+    def __init__(self, root: Path, exclude: Iterable[str] = DEFAULT_EXCLUDE, use_ignore_files: bool = True):
+        self.root = root
+        self.use_ignore_files = use_ignore_files
+        exclude = [g.strip() for g in exclude if g.strip()]
+        names = [g for g in exclude if "/" not in g]
+        paths = [g.strip("/") for g in exclude if "/" in g]
+        self._exclude_name = re.compile("|".join(fnmatch.translate(g) for g in names)) if names else None
+        self._exclude_path = re.compile("|".join(translate_glob(g) for g in paths)) if paths else None
+        self.exclude = exclude
+        self._ignore_cache: dict[str, tuple[int, list[IgnoreRule]]] = {}
+        self._cache_lock = threading.Lock()
+        self.directories_pruned = 0
+
+    # --- rules ---
+
+    def _read_rules(self, path: str, mtime_ns: Optional[int] = None) -> list[IgnoreRule]:
+        try:
+            if mtime_ns is None:
+                mtime_ns = os.stat(path).st_mtime_ns
+            with self._cache_lock:
+                cached = self._ignore_cache.get(path)
+            if cached and cached[0] == mtime_ns:
+                return cached[1]
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                rules = parse_ignore(f.read())
+        except OSError:
+            return []
+        with self._cache_lock:
+            self._ignore_cache[path] = (mtime_ns, rules)
+        return rules
+
+    def _context(self, directory: str, relative: str, names: dict[str, os.DirEntry]) -> Optional[IgnoreContext]:
+        """Rules contributed by one directory, given its entries by name."""
+        rules = []
+        if ".git" in names:
+            rules += self._read_rules(os.path.join(directory, ".git", "info", "exclude"))
+        for name in IGNORE_FILES:
+            entry = names.get(name)
+            if entry is not None:
+                try:
+                    rules += self._read_rules(entry.path, entry.stat().st_mtime_ns)
+                except OSError:
+                    continue
+        return (relative, rules) if rules else None
+
+    def _dir_context(self, directory: Path) -> Optional[IgnoreContext]:
+        """Rules of one directory outside a scandir pass (probes only the ignore file names)."""
+        names = {}
+        for name in IGNORE_FILES + (".git",):
+            path = directory / name
+            if path.exists():
+                names[name] = _StatEntry(str(path))
+        relative = str(directory.relative_to(self.root)).replace(os.sep, "/")
+        return self._context(str(directory), "" if relative == "." else relative, names)
+
+    def _parent_contexts(self, start: Path) -> list[IgnoreContext]:
+        """Ignore rules from the root down to (not including) `start`."""
+        contexts = []
+        directory = self.root
+        for part in start.relative_to(self.root).parts:
+            context = self._dir_context(directory)
+            if context:
+                contexts.append(context)
+            directory = directory / part
+        return contexts
+
+    def visible(self, relative: str) -> bool:
+        """Whether a walk from the root yields this file (no component excluded or ignored)."""
+        parts = relative.replace(os.sep, "/").split("/")
+        contexts = []
+        directory = self.root
+        for i, part in enumerate(parts):
+            child = "/".join(parts[:i + 1])
+            if self.use_ignore_files:
+                context = self._dir_context(directory)
+                if context:
+                    contexts.append(context)
+            if self._excluded(part, child):
+                return False
+            if self.use_ignore_files and self._ignored(contexts, child, is_dir=i < len(parts) - 1):
+                return False
+            directory = directory / part
+        return True
+
+    def _excluded(self, name: str, relative: str) -> bool:
+        if self._exclude_name is not None and self._exclude_name.match(name):
+            return True
+        return self._exclude_path is not None and self._exclude_path.fullmatch(relative) is not None
+
+    @staticmethod
+    def _ignored(contexts: list[IgnoreContext], relative: str, is_dir: bool) -> bool:
+        ignored = False
+        for base, rules in contexts:
+            sub = relative[len(base) + 1:] if base else relative
+            for rule in rules:
+                if rule.dir_only and not is_dir:
+                    continue
+                if rule.regex.fullmatch(sub):
+                    ignored = not rule.negate
+        return ignored
+
+    # --- walking ---
+
+    def walk(
+        self, start: Path, max_depth: Optional[int] = None, include_ignored: bool = False,
+        cancel: Optional[threading.Event] = None,
+    ) -> Iterator[tuple[str, os.DirEntry, int]]:
+        """Yield (path relative to the root, DirEntry, depth) below `start`, depth-first, sorted by name.
+
+        Directories are yielded before their contents; excluded and ignored
+        ones are neither yielded nor entered. `include_ignored` disables
+        the ignore files, not the exclude globs.
+        """
+        use_ignore = self.use_ignore_files and not include_ignored
+        base = str(start.relative_to(self.root)).replace(os.sep, "/")
+        base = "" if base == "." else base
+        contexts = self._parent_contexts(start) if use_ignore else []
+        yield from self._walk(str(start), base, 1, max_depth, contexts, use_ignore, include_ignored, cancel)
+
+    def _walk(self, directory, relative, depth, max_depth, contexts, use_ignore, include_ignored, cancel):
+        if cancel is not None and cancel.is_set():
+            return
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return  # unreadable directory
+        if use_ignore:
+            context = self._context(directory, relative, {e.name: e for e in entries})
+            if context:
+                contexts = contexts + [context]
+        for entry in entries:
+            child = f"{relative}/{entry.name}" if relative else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if self._excluded(entry.name, child):
+                self.directories_pruned += is_dir
+                continue
+            if use_ignore and self._ignored(contexts, child, is_dir):
+                self.directories_pruned += is_dir
+                continue
+            yield child, entry, depth
+            if is_dir and (max_depth is None or depth < max_depth):
+                yield from self._walk(
+                    entry.path, child, depth + 1, max_depth, contexts, use_ignore, include_ignored, cancel
+                )
+
+    def files(
+        self, start: Path, pattern: str = "*", max_depth: Optional[int] = None, include_ignored: bool = False,
+        cancel: Optional[threading.Event] = None, anywhere: bool = True,
+    ) -> Iterator[tuple[str, os.DirEntry]]:
+        """Regular files (symlinks to files included) below `start` matching a glob.
+
+        A pattern without "/" matches file names; one with "/" matches the
+        path relative to `start` ("**" allowed), or below any subdirectory
+        of it with `anywhere`.
+        """
+        matcher = self.matcher(start, pattern, anywhere)
+        for relative, entry, _depth in self.walk(start, max_depth, include_ignored, cancel):
+            try:
+                if entry.is_file() and matcher(relative, entry.name):
+                    yield relative, entry
+            except OSError:
+                continue
+
+    def matcher(self, start: Path, pattern: str, anywhere: bool):
+        """(root-relative path, name) → bool for a glob relative to `start`.
+
+        `anywhere` lets a pattern with "/" match below any subdirectory.
+        """
+        if "/" not in pattern:
+            return lambda relative, name: fnmatch.fnmatchcase(name, pattern)
+        prefix = str(start.relative_to(self.root)).replace(os.sep, "/")
+        skip = 0 if prefix == "." else len(prefix) + 1
+        regex = re.compile(("(?:.*/)?" if anywhere else "") + translate_glob(pattern.strip("/")), re.DOTALL)
+        return lambda relative, name: regex.fullmatch(relative[skip:]) is not None
+
+    def stats(self) -> dict:
+        return {
+            "exclude": self.exclude,
+            "ignore_files": self.use_ignore_files,
+            "ignore_files_cached": len(self._ignore_cache),
+            "directories_pruned": self.directories_pruned,
+        }
+
+
+class _StatEntry:
+    """Minimal DirEntry stand-in for ignore files found outside a scandir pass."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def stat(self):
+        return os.stat(self.path)
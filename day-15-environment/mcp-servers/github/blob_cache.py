@@ -0,0 +1,124 @@
+"""Content-addressed on-disk cache for git trees and blobs.
+
+Git objects are immutable by SHA, so entries never expire; the cache is
+only bounded by total size (LRU eviction by last access). Files live at
+<directory>/<key[:2]>/<key> and survive restarts, so every session and
+every server process pointed at the same directory shares them.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_KEY_RE = re.compile(r"^[0-9a-z\-]{3,80}$")
+
+
+class BlobCache:
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()  # key → size, least recently used first
+        self._scan()
+
+    def _path(self, key: str) -> str:
+        if not _KEY_RE.match(key):
+            raise ValueError(f"Invalid cache key: {key!r}")
+        return os.path.join(self.directory, key[:2], key)
+
+    def _scan(self):
+        """Index existing files, oldest access first."""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                found.append((st.st_atime, name, st.st_size))
+        for _, key, size in sorted(found):
+            self._sizes[key] = size
+            self.total_bytes += size
+        if found:
+            logger.info(f"Blob cache: {len(found)} objects, {self.total_bytes // 1024} KiB in {self.directory}")
+        self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._sizes:
+            key, size = self._sizes.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # keep LRU order across restarts
+            return data
+        except OSError:
+            return None
+
+    def _write(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temp name: concurrent writes of one key (threads or processes) must not share it
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key not in self._sizes:
+            self.misses += 1
+            return None
+        data = await asyncio.to_thread(self._read, key)
+        if data is None:  # removed behind our back
+            self.total_bytes -= self._sizes.pop(key, 0)
+            self.misses += 1
+            return None
+        self._sizes.move_to_end(key)
+        self.hits += 1
+        return data
+
+    async def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write, key, data)
+        except OSError as e:
+            logger.warning(f"Blob cache write failed for {key}: {e}")
+            return
+        self.total_bytes += len(data) - self._sizes.pop(key, 0)
+        self._sizes[key] = len(data)
+        self._evict()
+
+    def stats(self) -> dict:
+        return {
+            "objects": len(self._sizes),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -20,6 +20,16 @@ class AuthConfig:
 @dataclass
 class GitHubConfig:
     token: Optional[str] = None
+    cache_size: int = 500
+    cache_file: Optional[str] = None
+    rate_limit_reserve: int = 100
+    rate_limit_max_wait: float = 60.0
+    blob_cache_dir: Optional[str] = None
+    blob_cache_max_mb: int = 256
+    history_dir: Optional[str] = None
+    history_max_backfill: int = 5000
+    history_refresh_repos: list[str] = field(default_factory=list)
+    history_refresh_interval: float = 0.0
 
 
 @dataclass
@@ -51,4 +61,23 @@ def load_config(disable_auth: bool = False) -> AppConfig:
     # GitHub token (optional, increases rate limits)
     config.github.token = os.getenv("GITHUB_TOKEN")
 
+    # ETag cache (conditional requests are free of rate limit when unchanged)
+    config.github.cache_size = int(os.getenv("GITHUB_CACHE_SIZE", "500"))
+    config.github.cache_file = os.getenv("GITHUB_CACHE_FILE") or None
+
+    # Rate limit: start pacing below this many remaining requests; never wait longer than max_wait
+    config.github.rate_limit_reserve = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "100"))
+    config.github.rate_limit_max_wait = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
+
+    # Git tree/blob cache (content-addressed, shared across restarts); empty dir disables it
+    config.github.blob_cache_dir = os.getenv("GITHUB_BLOB_CACHE_DIR", "~/.cache/github-mcp/objects") or None
+    config.github.blob_cache_max_mb = int(os.getenv("GITHUB_BLOB_CACHE_MAX_MB", "256"))
+
+    # Commit history mirror (SQLite per repo); empty dir disables search_commit_history
+    config.github.history_dir = os.getenv("GITHUB_HISTORY_DIR", "~/.cache/github-mcp/history") or None
+    config.github.history_max_backfill = int(os.getenv("GITHUB_HISTORY_MAX_BACKFILL", "5000"))
+    refresh_repos = os.getenv("GITHUB_HISTORY_REFRESH_REPOS", "")
+    config.github.history_refresh_repos = [r.strip() for r in refresh_repos.split(",") if r.strip()]
+    config.github.history_refresh_interval = float(os.getenv("GITHUB_HISTORY_REFRESH_INTERVAL", "0"))
+
     return config
@@ -1,87 +1,301 @@
 """HTTP client for the GitHub REST API."""
 
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import quote
+
 import httpx
-from typing import Optional
+
+from shared import HttpClient
+from .blob_cache import BlobCache
+from .http_cache import ETagCache
+from .rate_limit import GitHubRateLimitError, RateLimitScheduler
+
+logger = logging.getLogger(__name__)
 
 
 class GitHubApiError(Exception):
     """Raised when the GitHub API returns an error response."""
-    pass
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class GitHubClient:
     BASE_URL = "https://api.github.com"
+    SHA_MEDIA_TYPE = "application/vnd.github.sha"
+    RAW_MEDIA_TYPE = "application/vnd.github.raw"
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache_size: int = 500,
+        cache_file: Optional[str] = None,
+        rate_limit_reserve: int = 100,
+        rate_limit_max_wait: float = 60.0,
+        blob_cache_dir: Optional[str] = None,
+        blob_cache_max_bytes: int = 256 * 1024 * 1024,
+    ):
         headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "GitHubMCPServer/1.0",
         }
         if token:
             headers["Authorization"] = f"Bearer {token}"
-        self.client = httpx.AsyncClient(headers=headers, timeout=30.0)
+        self.client = HttpClient(headers=headers, timeout=30.0)
+        self.cache = ETagCache(max_entries=cache_size, path=cache_file)
+        self.rate_limit = RateLimitScheduler(reserve=rate_limit_reserve, max_wait=rate_limit_max_wait)
+        self.blobs = BlobCache(blob_cache_dir, blob_cache_max_bytes) if blob_cache_dir else None
 
-    async def _handle_response(self, response: httpx.Response):
+    @staticmethod
+    def _check_response(response: httpx.Response):
+        """Raise GitHubApiError / HTTPStatusError for error responses."""
         if response.status_code == 404:
-            raise GitHubApiError("Resource not found (404). Check owner/repo name.")
+            raise GitHubApiError("Resource not found (404). Check owner/repo name.", 404)
         if response.status_code == 403:
             raise GitHubApiError(
-                "Access denied (403). Rate limit exceeded or insufficient permissions. "
-                "Set GITHUB_TOKEN env var for 5000 req/hr instead of 60."
+                "Access denied (403). Insufficient permissions for this resource. "
+                "Set GITHUB_TOKEN env var to access private repositories.",
+                403,
             )
         if response.status_code == 422:
-            raise GitHubApiError(f"Validation failed (422): {response.text}")
+            raise GitHubApiError(f"Validation failed (422): {response.text}", 422)
         response.raise_for_status()
-        return response.json()
+
+    async def _handle_response(self, response: httpx.Response, raw: bool = False):
+        self._check_response(response)
+        return response.content if raw else response.json()
+
+    async def _send(self, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Send a GET through the rate-limit scheduler, backing off on primary/secondary limits.
+
+        With stream=True the body of a successful response is left unread (close it after use).
+        """
+        for attempt in range(self.rate_limit.secondary_retries + 1):
+            await self.rate_limit.acquire()
+            response = await self.client.get(url, stream=stream, **kwargs)
+            self.rate_limit.update(response.headers)
+            if stream and response.status_code >= 400:
+                await response.aread()  # error bodies are small; needed for messages below
+            if not self.rate_limit.is_rate_limited(response):
+                return response
+
+            wait = self.rate_limit.backoff(response, attempt)
+            if wait > self.rate_limit.max_wait or attempt == self.rate_limit.secondary_retries:
+                raise GitHubRateLimitError(
+                    f"GitHub rate limit hit ({response.status_code}), retry in {int(wait)}s. "
+                    "Set GITHUB_TOKEN env var for 5000 req/hr instead of 60."
+                )
+            logger.warning(f"GitHub rate limit hit ({response.status_code}), backing off {wait:.0f}s")
+        return response
+
+    async def _fetch(self, url: str, params: Optional[dict] = None) -> tuple[Any, Optional[str]]:
+        """GET with If-None-Match; a 304 is served from the ETag cache (free of rate limit).
+
+        Returns the decoded body and the Link rel="next" URL, if any.
+        """
+        key = ETagCache.key(url, params)
+        cached = self.cache.get(key)
+        headers = {"If-None-Match": cached.etag} if cached else None
+
+        response = await self._send(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            self.cache.record(hit=True)
+            return cached.body, cached.next_url
+
+        self.cache.record(hit=False)
+        data = await self._handle_response(response)
+        next_url = response.links.get("next", {}).get("url")
+        etag = response.headers.get("ETag")
+        if etag:
+            self.cache.put(key, etag, data, next_url)
+        return data, next_url
+
+    async def _get(self, path: str, params: Optional[dict] = None) -> Any:
+        data, _ = await self._fetch(f"{self.BASE_URL}{path}", params)
+        return data
+
+    async def _paginate(
+        self, path: str, params: Optional[dict] = None, limit: Optional[int] = None, prefetch: bool = True
+    ) -> AsyncIterator[Any]:
+        """Yield list items across pages by following Link rel="next", up to `limit`.
+
+        The next page is requested as soon as the current one arrives, so it
+        downloads while the caller is still consuming the current page. With
+        prefetch=False it is only requested once the caller has consumed the
+        current page (for callers that usually stop within the first one).
+        """
+        params = dict(params or {})
+        params["per_page"] = min(100, limit) if limit else 100
+        page_task = asyncio.create_task(self._fetch(f"{self.BASE_URL}{path}", params))
+        yielded = 0
+        try:
+            while page_task is not None:
+                items, next_url = await page_task
+                page_task = None
+                more = next_url and (limit is None or yielded + len(items) < limit)
+                if more and prefetch:
+                    page_task = asyncio.create_task(self._fetch(next_url))
+                for item in items:
+                    if limit is not None and yielded >= limit:
+                        return
+                    yield item
+                    yielded += 1
+                if more and not prefetch:
+                    page_task = asyncio.create_task(self._fetch(next_url))
+        finally:
+            if page_task is not None:
+                page_task.cancel()
 
     async def get_repo(self, owner: str, repo: str) -> dict:
-        response = await self.client.get(f"{self.BASE_URL}/repos/{owner}/{repo}")
-        return await self._handle_response(response)
+        return await self._get(f"/repos/{owner}/{repo}")
 
     async def get_branches(self, owner: str, repo: str, per_page: int = 30) -> list:
-        response = await self.client.get(
-            f"{self.BASE_URL}/repos/{owner}/{repo}/branches",
+        return await self._get(
+            f"/repos/{owner}/{repo}/branches",
             params={"per_page": min(per_page, 100)},
         )
-        return await self._handle_response(response)
 
     async def get_tags(self, owner: str, repo: str, per_page: int = 30) -> list:
-        response = await self.client.get(
-            f"{self.BASE_URL}/repos/{owner}/{repo}/tags",
+        return await self._get(
+            f"/repos/{owner}/{repo}/tags",
             params={"per_page": min(per_page, 100)},
         )
-        return await self._handle_response(response)
 
-    async def get_readme(self, owner: str, repo: str, ref: Optional[str] = None) -> dict:
-        params = {}
-        if ref:
-            params["ref"] = ref
-        response = await self.client.get(
+    async def iter_readme(
+        self, owner: str, repo: str, ref: Optional[str] = None, chunk_size: int = 16384
+    ) -> AsyncIterator[bytes]:
+        """Stream the raw README bytes. Stop iterating early to avoid downloading the rest."""
+        params = {"ref": ref} if ref else None
+        response = await self._send(
             f"{self.BASE_URL}/repos/{owner}/{repo}/readme",
+            stream=True,
             params=params,
+            headers={"Accept": self.RAW_MEDIA_TYPE},
         )
-        return await self._handle_response(response)
+        try:
+            self._check_response(response)
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def get_readme(
+        self, owner: str, repo: str, ref: Optional[str] = None, max_bytes: Optional[int] = None
+    ) -> str:
+        """README text, optionally only its first `max_bytes` bytes."""
+        chunks = []
+        size = 0
+        readme = self.iter_readme(owner, repo, ref)
+        try:
+            async for chunk in readme:
+                chunks.append(chunk)
+                size += len(chunk)
+                if max_bytes is not None and size >= max_bytes:
+                    break
+        finally:
+            await readme.aclose()
+        data = b"".join(chunks)
+        return (data[:max_bytes] if max_bytes is not None else data).decode("utf-8", errors="replace")
 
     async def get_contributors(self, owner: str, repo: str, per_page: int = 10) -> list:
-        response = await self.client.get(
-            f"{self.BASE_URL}/repos/{owner}/{repo}/contributors",
+        return await self._get(
+            f"/repos/{owner}/{repo}/contributors",
             params={"per_page": min(per_page, 100)},
         )
-        return await self._handle_response(response)
 
     async def get_commits(self, owner: str, repo: str, sha: Optional[str] = None, per_page: int = 10) -> list:
         params = {"per_page": min(per_page, 100)}
         if sha:
             params["sha"] = sha
-        response = await self.client.get(
-            f"{self.BASE_URL}/repos/{owner}/{repo}/commits",
-            params=params,
+        return await self._get(f"/repos/{owner}/{repo}/commits", params=params)
+
+    def iter_branches(self, owner: str, repo: str, limit: Optional[int] = None) -> AsyncIterator[dict]:
+        return self._paginate(f"/repos/{owner}/{repo}/branches", limit=limit)
+
+    def iter_tags(self, owner: str, repo: str, limit: Optional[int] = None) -> AsyncIterator[dict]:
+        return self._paginate(f"/repos/{owner}/{repo}/tags", limit=limit)
+
+    def iter_contributors(self, owner: str, repo: str, limit: Optional[int] = None) -> AsyncIterator[dict]:
+        return self._paginate(f"/repos/{owner}/{repo}/contributors", limit=limit)
+
+    def iter_commits(
+        self,
+        owner: str,
+        repo: str,
+        sha: Optional[str] = None,
+        limit: Optional[int] = None,
+        since: Optional[str] = None,
+        path: Optional[str] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[dict]:
+        params = {}
+        if sha:
+            params["sha"] = sha
+        if since:
+            params["since"] = since
+        if path:
+            params["path"] = path
+        return self._paginate(f"/repos/{owner}/{repo}/commits", params=params, limit=limit, prefetch=prefetch)
+
+    async def resolve_ref(self, owner: str, repo: str, ref: Optional[str] = None) -> str:
+        """Resolve a branch, tag or commit-ish to its commit SHA (one cheap request, ETag-cached)."""
+        url = f"{self.BASE_URL}/repos/{owner}/{repo}/commits/{ref or 'HEAD'}"
+        key = ETagCache.key(url, accept=self.SHA_MEDIA_TYPE)
+        cached = self.cache.get(key)
+        headers = {"Accept": self.SHA_MEDIA_TYPE}
+        if cached:
+            headers["If-None-Match"] = cached.etag
+
+        response = await self._send(url, headers=headers)
+        if response.status_code == 304 and cached:
+            self.cache.record(hit=True)
+            return cached.body
+        self.cache.record(hit=False)
+        sha = (await self._handle_response(response, raw=True)).decode("ascii").strip()
+        etag = response.headers.get("ETag")
+        if etag:
+            self.cache.put(key, etag, sha)
+        return sha
+
+    async def _get_object(self, url: str, key: str, accept: Optional[str] = None) -> bytes:
+        """Fetch an immutable git object, going through the blob cache when configured."""
+        if self.blobs is not None:
+            data = await self.blobs.get(key)
+            if data is not None:
+                return data
+        headers = {"Accept": accept} if accept else None
+        data = await self._handle_response(await self._send(url, headers=headers), raw=True)
+        if self.blobs is not None:
+            await self.blobs.put(key, data)
+        return data
+
+    async def get_tree(self, owner: str, repo: str, sha: str) -> dict:
+        """Recursive tree of a commit or tree SHA."""
+        data = await self._get_object(
+            f"{self.BASE_URL}/repos/{owner}/{repo}/git/trees/{sha}?recursive=1",
+            key=f"tree-{sha.lower()}",
+        )
+        return json.loads(data)
+
+    async def get_contents(self, owner: str, repo: str, path: str, ref: Optional[str] = None) -> Any:
+        """Contents API entry for one path: a dict for a file, a list for a directory."""
+        return await self._get(f"/repos/{owner}/{repo}/contents/{quote(path)}", {"ref": ref} if ref else None)
+
+    async def get_blob(self, owner: str, repo: str, sha: str) -> bytes:
+        """Raw content of a blob SHA."""
+        return await self._get_object(
+            f"{self.BASE_URL}/repos/{owner}/{repo}/git/blobs/{sha}",
+            key=sha.lower(),
+            accept=self.RAW_MEDIA_TYPE,
         )
-        return await self._handle_response(response)
 
     async def get_user(self, username: str) -> dict:
-        response = await self.client.get(f"{self.BASE_URL}/users/{username}")
-        return await self._handle_response(response)
+        return await self._get(f"/users/{username}")
 
     async def close(self):
+        self.cache.save()
         await self.client.aclose()
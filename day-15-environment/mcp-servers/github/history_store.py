@@ -0,0 +1,428 @@
+"""Local SQLite mirror of commit and contributor history.
+
+One database file per repository under the mirror directory. The first
+sync backfills up to `max_backfill` commits of the default branch, written
+a page at a time and resumed from the oldest stored commit if interrupted.
+Later syncs page through the branch newest-first and stop once commit
+dates fall `overlap` before the last mirrored head, skipping SHAs already
+stored, so repeated history questions cost a small delta request (one
+page, not prefetched) instead of a full re-scan. GitHub's `since=` is deliberately not used: it filters by commit
+date, which would drop older-dated commits merged after the last sync.
+Path-scoped history is mirrored the same way, one sync scope per path.
+
+sqlite3 is blocking, so every database call runs in a worker thread.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from .github_client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    author_login TEXT,
+    author_name TEXT,
+    author_email TEXT,
+    authored_at TEXT,
+    committed_at TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_commits_authored_at ON commits(authored_at);
+CREATE INDEX IF NOT EXISTS idx_commits_login ON commits(author_login COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_commits_name ON commits(author_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_commits_email ON commits(author_email COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS commit_paths (
+    path TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    PRIMARY KEY (path, sha)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS contributors (
+    login TEXT PRIMARY KEY COLLATE NOCASE,
+    contributions INTEGER,
+    html_url TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,   -- '' = whole branch, otherwise a path; ':contributors'
+    head_sha TEXT,
+    head_date TEXT,
+    complete INTEGER,
+    count INTEGER,
+    synced_at REAL,
+    backfill_sha TEXT         -- oldest commit stored while the first backfill is unfinished
+);
+"""
+
+CONTRIBUTORS_SCOPE = ":contributors"
+SYNC_OVERLAP = 14 * 86400  # seconds re-scanned before the mirrored head on incremental syncs
+SYNC_BATCH = 100  # commits per write (one API page), so an interrupted sync keeps its progress
+
+_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def normalize_date(value: Optional[str], end_of_day: bool = False) -> Optional[str]:
+    """Accept YYYY-MM-DD or ISO 8601 and return an ISO UTC string comparable with stored dates."""
+    if not value:
+        return None
+    value = value.strip()
+    if re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+        return f"{value}T23:59:59Z" if end_of_day else f"{value}T00:00:00Z"
+    return value
+
+
+class CommitHistoryMirror:
+    def __init__(
+        self,
+        client: GitHubClient,
+        directory: str,
+        max_backfill: int = 5000,
+        min_sync_interval: float = 60.0,
+        overlap: float = SYNC_OVERLAP,
+    ):
+        self.client = client
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_backfill = max_backfill
+        self.min_sync_interval = min_sync_interval
+        self.overlap = overlap
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._initialized: set[str] = set()
+        self._refresh_task: Optional[asyncio.Task] = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    # --- sqlite (runs in worker threads) ---
+
+    def _db_path(self, owner: str, repo: str) -> str:
+        name = f"{_NAME_RE.sub('_', owner.lower())}__{_NAME_RE.sub('_', repo.lower())}.sqlite3"
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _connect(self, db_path: str) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection wrapped in a transaction (one per worker-thread call)."""
+        conn = sqlite3.connect(db_path, timeout=30.0)
+        try:
+            conn.row_factory = sqlite3.Row
+            if db_path not in self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(sync_state)")}
+                if "backfill_sha" not in columns:  # mirrors created before resumable backfills
+                    conn.execute("ALTER TABLE sync_state ADD COLUMN backfill_sha TEXT")
+                self._initialized.add(db_path)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _read_state(self, db_path: str, scope: str) -> Optional[dict]:
+        with self._connect(db_path) as conn:
+            row = conn.execute("SELECT * FROM sync_state WHERE scope = ?", (scope,)).fetchone()
+        return dict(row) if row else None
+
+    def _known_shas(self, db_path: str, scope: str, since: str) -> set[str]:
+        """SHAs of the scope already mirrored with a commit date at or after `since`."""
+        with self._connect(db_path) as conn:
+            if scope:
+                rows = conn.execute(
+                    "SELECT c.sha FROM commits c JOIN commit_paths p ON p.sha = c.sha AND p.path = ? "
+                    "WHERE c.committed_at >= ?",
+                    (scope, since),
+                )
+            else:
+                rows = conn.execute("SELECT sha FROM commits WHERE committed_at >= ?", (since,))
+            return {row[0] for row in rows}
+
+    def _write_state(self, conn: sqlite3.Connection, scope: str, added: int, changes: dict):
+        """Add `added` to the scope's count and replace the columns in `changes`."""
+        row = conn.execute("SELECT * FROM sync_state WHERE scope = ?", (scope,)).fetchone()
+        state = dict(row) if row else {
+            "scope": scope, "head_sha": None, "head_date": None, "complete": 0, "count": 0, "backfill_sha": None,
+        }
+        state.update(changes)
+        state["count"] += added
+        state["synced_at"] = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (scope, head_sha, head_date, complete, count, synced_at, backfill_sha) "
+            "VALUES (:scope, :head_sha, :head_date, :complete, :count, :synced_at, :backfill_sha)",
+            state,
+        )
+
+    def _write_commits(self, db_path: str, scope: str, rows: list[tuple], **changes):
+        with self._connect(db_path) as conn:
+            conn.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            if scope:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO commit_paths (path, sha) VALUES (?, ?)",
+                    [(scope, row[0]) for row in rows],
+                )
+            self._write_state(conn, scope, len(rows), changes)
+
+    def _write_contributors(self, db_path: str, rows: list[tuple]):
+        with self._connect(db_path) as conn:
+            conn.execute("DELETE FROM contributors")
+            conn.executemany("INSERT OR REPLACE INTO contributors VALUES (?, ?, ?)", rows)
+            conn.execute("DELETE FROM sync_state WHERE scope = ?", (CONTRIBUTORS_SCOPE,))
+            self._write_state(conn, CONTRIBUTORS_SCOPE, len(rows), {"complete": 1})
+
+    def _query(
+        self,
+        db_path: str,
+        author: Optional[str],
+        path: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        limit: int,
+    ) -> dict:
+        where, args = [], []
+        join = ""
+        if path:
+            join = "JOIN commit_paths p ON p.sha = c.sha AND p.path = ?"
+            args.append(path)
+        if author:
+            where.append(
+                "(c.author_login = ? COLLATE NOCASE OR c.author_name = ? COLLATE NOCASE "
+                "OR c.author_email = ? COLLATE NOCASE)"
+            )
+            args.extend([author] * 3)
+        if since:
+            where.append("c.authored_at >= ?")
+            args.append(since)
+        if until:
+            where.append("c.authored_at <= ?")
+            args.append(until)
+        clause = f"FROM commits c {join} " + (f"WHERE {' AND '.join(where)}" if where else "")
+
+        with self._connect(db_path) as conn:
+            total = conn.execute(f"SELECT COUNT(*) {clause}", args).fetchone()[0]
+            commits = conn.execute(
+                f"SELECT c.* {clause} ORDER BY c.authored_at DESC LIMIT ?", args + [limit]
+            ).fetchall()
+            authors = conn.execute(
+                f"SELECT COALESCE(c.author_login, c.author_name) AS who, COUNT(*) AS n {clause} "
+                "GROUP BY who ORDER BY n DESC LIMIT 10",
+                args,
+            ).fetchall()
+            contributor = None
+            if author:
+                contributor = conn.execute(
+                    "SELECT * FROM contributors WHERE login = ?", (author,)
+                ).fetchone()
+            state = conn.execute(
+                "SELECT * FROM sync_state WHERE scope = ?", (path or "",)
+            ).fetchone()
+            if path:
+                oldest = conn.execute(
+                    "SELECT MIN(c.authored_at) FROM commits c JOIN commit_paths p ON p.sha = c.sha AND p.path = ?",
+                    (path,),
+                ).fetchone()[0]
+            else:
+                oldest = conn.execute("SELECT MIN(authored_at) FROM commits").fetchone()[0]
+
+        return {
+            "total": total,
+            "commits": [dict(r) for r in commits],
+            "authors": [(r["who"], r["n"]) for r in authors],
+            "contributor": dict(contributor) if contributor else None,
+            "complete": bool(state["complete"]) if state else False,
+            "oldest": oldest,
+        }
+
+    # --- sync ---
+
+    @staticmethod
+    def _row(item: dict) -> tuple:
+        commit = item.get("commit", {})
+        author = commit.get("author") or {}
+        committer = commit.get("committer") or {}
+        login = (item.get("author") or {}).get("login")
+        return (
+            item["sha"],
+            login,
+            author.get("name"),
+            author.get("email"),
+            author.get("date"),
+            committer.get("date") or author.get("date"),
+            commit.get("message", ""),
+        )
+
+    def _lock(self, owner: str, repo: str, scope: str) -> asyncio.Lock:
+        key = (owner.lower(), repo.lower(), scope)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def sync(self, owner: str, repo: str, path: Optional[str] = None, force: bool = False) -> int:
+        """Fetch commits missing from the mirror. Returns the number of new commits."""
+        scope = path or ""
+        db_path = self._db_path(owner, repo)
+        async with self._lock(owner, repo, scope):
+            state = await asyncio.to_thread(self._read_state, db_path, scope)
+            if state and not force and time.time() - state["synced_at"] < self.min_sync_interval:
+                return 0
+
+            added = 0
+            if not state or not state["head_sha"] or state["backfill_sha"]:
+                # Finish the backfill first, so the incremental pass below sees every stored SHA
+                added += await self._backfill(owner, repo, path, db_path, state)
+            if state and state["head_sha"]:
+                state = await asyncio.to_thread(self._read_state, db_path, scope)
+                added += await self._sync_new(owner, repo, path, db_path, state)
+            if added:
+                logger.info(f"History mirror {owner}/{repo}{':' + path if path else ''}: +{added} commits")
+            return added
+
+    async def _sync_new(self, owner: str, repo: str, path: Optional[str], db_path: str, state: dict) -> int:
+        """Commits added since the mirrored head, newest first, down to `overlap` before it.
+
+        Usually a single page: the next one is only requested if this one
+        does not reach the cutoff. The head moves only once the walk is
+        done, so an interrupted sync re-scans from the old head next time.
+        """
+        scope = path or ""
+        head_time = datetime.fromisoformat(state["head_date"].replace("Z", "+00:00"))
+        cutoff = (head_time - timedelta(seconds=self.overlap)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        known = await asyncio.to_thread(self._known_shas, db_path, scope, cutoff)
+
+        head = None
+        added = 0
+        batch = []
+        commits = self.client.iter_commits(owner, repo, path=path, limit=self.max_backfill, prefetch=False)
+        try:
+            async for item in commits:
+                row = self._row(item)
+                if head is None:
+                    head = {"head_sha": row[0], "head_date": row[5]}
+                if row[5] and row[5] < cutoff:
+                    break
+                if row[0] not in known:
+                    batch.append(row)
+                if len(batch) >= SYNC_BATCH:
+                    await asyncio.to_thread(self._write_commits, db_path, scope, batch)
+                    added += len(batch)
+                    batch = []
+        finally:
+            await commits.aclose()
+        await asyncio.to_thread(self._write_commits, db_path, scope, batch, **(head or {}))
+        return added + len(batch)
+
+    async def _backfill(
+        self, owner: str, repo: str, path: Optional[str], db_path: str, state: Optional[dict]
+    ) -> int:
+        """First sync of a scope: up to `max_backfill` commits, written a page at a time.
+
+        Progress is kept in `backfill_sha` (the oldest commit stored so far),
+        so a backfill interrupted by an error resumes from there instead of
+        starting over.
+        """
+        scope = path or ""
+        start = state["backfill_sha"] if state else None
+        budget = self.max_backfill - (state["count"] if start else 0)
+        changes = {}
+        fetched = 0
+        batch = []
+        # Resuming from `start` lists that commit again first (it is already stored)
+        commits = self.client.iter_commits(owner, repo, sha=start, path=path, limit=budget + bool(start))
+        try:
+            async for item in commits:
+                row = self._row(item)
+                if row[0] == start:
+                    continue
+                if not start and not fetched:
+                    changes = {"head_sha": row[0], "head_date": row[5]}
+                batch.append(row)
+                fetched += 1
+                if len(batch) >= SYNC_BATCH:
+                    await asyncio.to_thread(
+                        self._write_commits, db_path, scope, batch, backfill_sha=batch[-1][0], **changes
+                    )
+                    changes, batch = {}, []
+        finally:
+            await commits.aclose()
+        await asyncio.to_thread(
+            self._write_commits, db_path, scope, batch, backfill_sha=None, complete=int(fetched < budget), **changes
+        )
+        return fetched
+
+    async def sync_contributors(self, owner: str, repo: str, force: bool = False) -> int:
+        db_path = self._db_path(owner, repo)
+        async with self._lock(owner, repo, CONTRIBUTORS_SCOPE):
+            state = await asyncio.to_thread(self._read_state, db_path, CONTRIBUTORS_SCOPE)
+            if state and not force and time.time() - state["synced_at"] < self.min_sync_interval:
+                return state["count"]
+            rows = [
+                (c["login"], c.get("contributions", 0), c.get("html_url"))
+                async for c in self.client.iter_contributors(owner, repo)
+                if c.get("login")
+            ]
+            await asyncio.to_thread(self._write_contributors, db_path, rows)
+            return len(rows)
+
+    async def query(
+        self,
+        owner: str,
+        repo: str,
+        author: Optional[str] = None,
+        path: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+    ) -> dict:
+        """Sync the relevant scope, then answer from the local mirror."""
+        path = path.strip("/") if path else None
+        syncs = [self.sync(owner, repo, path)]
+        if author:
+            syncs.append(self.sync_contributors(owner, repo))
+        results = await asyncio.gather(*syncs)
+        result = await asyncio.to_thread(
+            self._query,
+            self._db_path(owner, repo),
+            author,
+            path,
+            normalize_date(since),
+            normalize_date(until, end_of_day=True),
+            limit,
+        )
+        result["new_commits"] = results[0]
+        return result
+
+    # --- background refresh ---
+
+    async def _refresh_loop(self, repos: list[str], interval: float):
+        while True:
+            for full_name in repos:
+                owner, _, repo = full_name.partition("/")
+                try:
+                    await self.sync(owner, repo, force=True)
+                    await self.sync_contributors(owner, repo, force=True)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"History refresh of {full_name} failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start_refresh(self, repos: list[str], interval: float):
+        """Keep the given 'owner/repo' mirrors warm in the background."""
+        if repos and interval > 0 and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(repos, interval))
+            logger.info(f"History refresh every {int(interval)}s for: {', '.join(repos)}")
+
+    async def stop_refresh(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
@@ -0,0 +1,94 @@
+"""Conditional-request (ETag) cache for the GitHub REST API.
+
+GitHub answers `If-None-Match` with 304 Not Modified when a resource is
+unchanged, and 304 responses do not count against the rate limit. The
+cache keeps the ETag and decoded body per URL (LRU, bounded entry count)
+and can persist itself to a JSON file between restarts.
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: Any
+    next_url: Optional[str] = None  # Link rel="next" of paginated responses
+
+
+class ETagCache:
+    """LRU map of request key → (ETag, body)."""
+
+    def __init__(self, max_entries: int = 500, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self.load()
+
+    @staticmethod
+    def key(url: str, params: Optional[dict] = None, accept: Optional[str] = None) -> str:
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return f"{accept} {url}" if accept else url
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, etag: str, body: Any, next_url: Optional[str] = None):
+        self._entries[key] = CachedResponse(etag, body, next_url)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ETag cache {self.path}: {e}")
+            return
+        for key, entry in list(data.items())[-self.max_entries:]:
+            self._entries[key] = CachedResponse(*entry)
+        logger.info(f"Loaded {len(self._entries)} cached GitHub responses from {self.path}")
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({k: [e.etag, e.body, e.next_url] for k, e in self._entries.items()}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist ETag cache to {self.path}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent": bool(self.path),
+        }
@@ -8,6 +8,16 @@ Usage:
 Environment variables:
     MCP_API_KEY     Server API key for client authentication (required unless --no-auth)
     GITHUB_TOKEN    GitHub personal access token (optional, raises rate limit to 5000 req/hr)
+    GITHUB_CACHE_SIZE  Max ETag-cached responses (default: 500)
+    GITHUB_CACHE_FILE  Persist the ETag cache to this JSON file (default: in-memory only)
+    GITHUB_RATE_LIMIT_RESERVE   Start pacing requests below this remaining budget (default: 100)
+    GITHUB_RATE_LIMIT_MAX_WAIT  Longest a call may wait for the rate limit, seconds (default: 60)
+    GITHUB_BLOB_CACHE_DIR       On-disk git tree/blob cache (default: ~/.cache/github-mcp/objects)
+    GITHUB_BLOB_CACHE_MAX_MB    Blob cache size cap in MB (default: 256)
+    GITHUB_HISTORY_DIR          SQLite commit history mirrors (default: ~/.cache/github-mcp/history)
+    GITHUB_HISTORY_MAX_BACKFILL Commits fetched on the first sync of a repo (default: 5000)
+    GITHUB_HISTORY_REFRESH_REPOS     Comma-separated owner/repo mirrors to refresh in the background
+    GITHUB_HISTORY_REFRESH_INTERVAL  Background refresh period in seconds (default: 0 = off)
     HOST            Bind address (default: 0.0.0.0)
     PORT            Bind port (default: 8000)
 """
@@ -16,14 +26,16 @@ import argparse
 import logging
 import sys
 
-import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from shared import McpProtocolHandler, SseTransport
+from shared import (
+    ApiKeyAuth, ApiKeyAuthMiddleware, LifespanManager, McpProtocolHandler,
+    SseTransport, run_server,
+)
 from .config import load_config
 from .github_client import GitHubClient
+from .history_store import CommitHistoryMirror
 from .tools import get_all_tools
 
 logging.basicConfig(
@@ -46,15 +58,34 @@ def parse_args() -> argparse.Namespace:
 
 
 def build_app(config, github_client: GitHubClient) -> FastAPI:
-    tools = get_all_tools(github_client)
-    protocol_handler = McpProtocolHandler(tools, server_name=SERVER_NAME, server_version=SERVER_VERSION)
+    history = None
+    if config.github.history_dir:
+        history = CommitHistoryMirror(
+            github_client, config.github.history_dir, max_backfill=config.github.history_max_backfill
+        )
+    tools = get_all_tools(github_client, history)
+    lifespan = LifespanManager()
+    protocol_handler = McpProtocolHandler(
+        tools, server_name=SERVER_NAME, server_version=SERVER_VERSION, lifespan=lifespan
+    )
     sse_transport = SseTransport(protocol_handler)
 
+    # Shutdown order: stop new calls → drain in-flight → flush SSE → close upstream clients
+    lifespan.on_drain(sse_transport.close_all_sessions)
+    lifespan.on_close(github_client.close)
+    if history and config.github.history_refresh_repos:
+        lifespan.on_startup(lambda: history.start_refresh(
+            config.github.history_refresh_repos, config.github.history_refresh_interval
+        ))
+        lifespan.on_drain(history.stop_refresh)
+
     app = FastAPI(
         title="GitHub MCP Server",
         description="MCP server providing GitHub repository data tools via SSE transport.",
         version=SERVER_VERSION,
+        lifespan=lifespan.lifespan,
     )
+    app.state.lifespan = lifespan
 
     # CORS — allow any origin so the Kotlin app (or any client) can connect
     app.add_middleware(
@@ -64,24 +95,10 @@ def build_app(config, github_client: GitHubClient) -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
     )
 
-    # API-key authentication middleware (only when auth is enabled)
-    if config.auth.enabled:
-        api_key = config.auth.api_key
-
-        # Paths that do NOT require authentication
-        public_paths = {"/health", "/", "/docs", "/redoc", "/openapi.json"}
-
-        @app.middleware("http")
-        async def auth_middleware(request: Request, call_next):
-            if request.url.path in public_paths:
-                return await call_next(request)
-            key = request.headers.get("x-api-key") or request.query_params.get("api_key")
-            if key != api_key:
-                return JSONResponse(
-                    {"error": "Unauthorized: missing or invalid X-API-Key header"},
-                    status_code=401,
-                )
-            return await call_next(request)
+    # API-key authentication + per-key rate limiting (only when auth is enabled)
+    auth = ApiKeyAuth.from_env(config.auth.api_key) if config.auth.enabled else None
+    if auth:
+        app.add_middleware(ApiKeyAuthMiddleware, auth=auth)
 
     # MCP SSE transport routes (/sse and /message)
     sse_transport.setup_routes(app)
@@ -91,11 +108,16 @@ def build_app(config, github_client: GitHubClient) -> FastAPI:
     @app.get("/health")
     async def health():
         return {
-            "status": "ok",
+            "status": "ok" if lifespan.accepting else "draining",
+            "in_flight_calls": lifespan.in_flight,
             "tools_count": len(tools),
             "active_sessions": sse_transport.get_active_session_count(),
             "auth_enabled": config.auth.enabled,
+            "auth": auth.stats() if auth else None,
             "github_token_configured": config.github.token is not None,
+            "etag_cache": github_client.cache.stats(),
+            "rate_limit": github_client.rate_limit.snapshot(),
+            "blob_cache": github_client.blobs.stats() if github_client.blobs else None,
         }
 
     @app.get("/")
@@ -154,10 +176,18 @@ def main():
     else:
         logger.info("  GitHub API: unauthenticated (60 req/hr)")
 
-    github_client = GitHubClient(token=config.github.token)
+    github_client = GitHubClient(
+        token=config.github.token,
+        cache_size=config.github.cache_size,
+        cache_file=config.github.cache_file,
+        rate_limit_reserve=config.github.rate_limit_reserve,
+        rate_limit_max_wait=config.github.rate_limit_max_wait,
+        blob_cache_dir=config.github.blob_cache_dir,
+        blob_cache_max_bytes=config.github.blob_cache_max_mb * 1024 * 1024,
+    )
     app = build_app(config, github_client)
 
-    uvicorn.run(app, host=config.server.host, port=config.server.port)
+    run_server(app, config.server.host, config.server.port)
 
 
 if __name__ == "__main__":
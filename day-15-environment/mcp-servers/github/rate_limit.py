@@ -0,0 +1,139 @@
+"""Rate-limit-aware request scheduling for the GitHub REST API.
+
+Reads X-RateLimit-Limit / -Remaining / -Reset / -Resource and Retry-After
+from every response. Requests pass through acquire(), which:
+- lets requests through freely while the budget is healthy
+- paces them evenly over the time left until reset once `remaining`
+  drops to the reserve (scaled down to a tenth of small budgets), giving
+  each caller a slot time and sleeping outside the lock
+- waits out an exhausted budget or a secondary-limit backoff, as long as
+  the wait fits in `max_wait`; otherwise raises GitHubRateLimitError
+
+Secondary (abuse) limits are retried with Retry-After or exponential backoff
+(capped at `max_wait`), up to `secondary_retries` times.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when a request would have to wait longer than allowed for the rate limit."""
+    pass
+
+
+class RateLimitScheduler:
+    def __init__(self, reserve: int = 100, max_wait: float = 60.0, secondary_retries: int = 3):
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.secondary_retries = secondary_retries
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch seconds
+        self.resource: Optional[str] = None
+        self.backoff_until = 0.0  # epoch seconds (secondary limit / Retry-After)
+        self.throttled = 0
+        self._next_slot = 0.0  # epoch seconds of the earliest next request while pacing
+        self._lock = asyncio.Lock()
+
+    def update(self, headers: httpx.Headers):
+        """Record the budget reported by a response."""
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is None:
+            return
+        try:
+            self.remaining = int(remaining)
+            self.limit = int(headers.get("x-ratelimit-limit", self.limit or 0)) or self.limit
+            self.reset_at = float(headers.get("x-ratelimit-reset", self.reset_at or 0)) or self.reset_at
+        except ValueError:
+            return
+        self.resource = headers.get("x-ratelimit-resource", self.resource)
+
+    def _reserve(self) -> int:
+        """Pacing threshold, scaled to the budget (the unauthenticated limit is only 60/hour)."""
+        return min(self.reserve, self.limit // 10) if self.limit else self.reserve
+
+    def _interval(self, now: float) -> float:
+        """Spacing between requests while pacing (0 while the budget is healthy), at most max_wait."""
+        if self.remaining is None or self.reset_at is None or self.reset_at <= now:
+            return 0.0
+        if 0 < self.remaining <= self._reserve():
+            return min(self.max_wait, (self.reset_at - now) / self.remaining)
+        return 0.0
+
+    async def acquire(self):
+        """Wait for a request slot. Raises GitHubRateLimitError if the wait exceeds max_wait.
+
+        Only an exhausted budget or a backoff can be refused; pacing delays
+        are capped at max_wait. The slot is reserved under the lock and slept
+        for after releasing it, so concurrent callers queue by slot time
+        rather than behind each other's sleep.
+        """
+        async with self._lock:
+            now = time.time()
+            start = now
+            if self.backoff_until > now:
+                start = self.backoff_until
+            elif self.remaining is not None and self.remaining <= 0 and self.reset_at and self.reset_at > now:
+                start = self.reset_at + 1.0
+            if start - now > self.max_wait:
+                raise GitHubRateLimitError(
+                    f"GitHub rate limit exhausted ({self.remaining}/{self.limit} left), "
+                    f"resets in {int(start - now)}s. Set GITHUB_TOKEN for 5000 req/hr instead of 60."
+                )
+            start = min(max(start, self._next_slot), now + self.max_wait)
+            self._next_slot = start + self._interval(now)
+            if self.remaining is not None and self.remaining > 0:
+                self.remaining -= 1  # optimistic; corrected by the next response
+
+        wait = start - time.time()
+        if wait > 0:
+            self.throttled += 1
+            logger.info(f"Pacing GitHub request for {wait:.1f}s (remaining budget: {self.remaining})")
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def is_rate_limited(response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        if response.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in response.headers:
+            return True
+        return "rate limit" in response.text.lower()
+
+    def backoff(self, response: httpx.Response, attempt: int) -> float:
+        """Register a rate-limited response; returns the wait before retrying."""
+        now = time.time()
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                wait = 60.0
+        elif self.remaining == 0 and self.reset_at:
+            wait = max(0.0, self.reset_at - now) + 1.0
+        else:
+            # Secondary limit without guidance: GitHub recommends waiting at least a minute.
+            # Capped at max_wait, so every one of `secondary_retries` is actually attempted.
+            wait = min(self.max_wait, 60.0 * (2 ** attempt))
+        self.backoff_until = max(self.backoff_until, now + wait)
+        return wait
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "resource": self.resource,
+            "resets_in_s": int(self.reset_at - now) if self.reset_at and self.reset_at > now else None,
+            "pacing": self.remaining is not None and self.remaining <= self._reserve(),
+            "backoff_s": round(self.backoff_until - now, 1) if self.backoff_until > now else 0,
+            "throttled_requests": self.throttled,
+        }
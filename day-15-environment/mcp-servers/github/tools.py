@@ -7,14 +7,31 @@ Each tool maps to a GitHub REST API endpoint and follows the MCP tool interface:
 - execute(): async handler returning ToolResult
 """
 
-import base64
+import asyncio
+import codecs
 import logging
+import re
+from typing import AsyncIterator, Optional
 
 from shared import ToolResult, BaseTool
-from .github_client import GitHubClient
+from .github_client import GitHubApiError, GitHubClient
+from .history_store import CommitHistoryMirror
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for list tools; anything above 100 is fetched page by page
+MAX_LIST_LIMIT = 1000
+
+# get_repos_overview: max repositories per call and max concurrent GitHub requests
+OVERVIEW_MAX_REPOS = 20
+OVERVIEW_CONCURRENCY = 8
+OVERVIEW_README_BYTES = 16384  # enough to find the first prose line
+
+# get_repo_tree / get_file_content: output limits
+TREE_DEFAULT_ENTRIES = 300
+TREE_MAX_ENTRIES = 5000
+FILE_DEFAULT_BYTES = 100_000
+
 
 class GitHubTool(BaseTool):
     """Base class for all GitHub MCP tools."""
@@ -37,6 +54,15 @@ class GitHubTool(BaseTool):
 
         return owner or None, repo or None
 
+    @staticmethod
+    def _parse_limit(arguments: dict, default: int) -> int:
+        """Read the per_page argument (total items to return), clamped to 1..MAX_LIST_LIMIT."""
+        try:
+            limit = int(arguments.get("per_page", default))
+        except (TypeError, ValueError):
+            limit = default
+        return max(1, min(MAX_LIST_LIMIT, limit))
+
     async def execute(self, arguments: dict) -> ToolResult:
         raise NotImplementedError
 
@@ -122,40 +148,44 @@ class BranchesTool(GitHubTool):
     name = "get_repo_branches"
     description = (
         "List branches of a GitHub repository. "
-        "Returns branch names, latest commit SHA, and protection status."
+        "Returns branch names, latest commit SHA, and protection status. "
+        "Follows pagination, so large repositories can be listed completely."
     )
     input_schema = {
         "type": "object",
         "properties": {
             "owner": {"type": "string", "description": "Repository owner"},
             "repo": {"type": "string", "description": "Repository name"},
-            "per_page": {"type": "integer", "description": "Number of branches to return (1-100, default: 30)"},
+            "per_page": {"type": "integer", "description": "Number of branches to return (1-1000, default: 30)"},
         },
         "required": ["owner", "repo"],
     }
 
     async def execute(self, arguments: dict) -> ToolResult:
         owner, repo = self._parse_owner_repo(arguments)
-        per_page = arguments.get("per_page", 30)
+        limit = self._parse_limit(arguments, 30)
         if not owner or not repo:
             return ToolResult("Missing required parameters: owner and repo", is_error=True)
 
         try:
-            branches = await self.client.get_branches(owner, repo, per_page)
+            body = []
+            shown = 0
+            async for b in self.client.iter_branches(owner, repo, limit):
+                protected = " [protected]" if b.get("protected") else ""
+                body.append(f"  {b['name']}{protected}")
+                body.append(f"    Latest commit: {b['commit']['sha'][:8]}")
+                body.append("")
+                shown += 1
+
             lines = [
                 f"Branches for {owner}/{repo}:",
                 "=" * 50,
-                f"Shown: {len(branches)}",
+                f"Shown: {shown}" + (f" (limit {limit} reached)" if shown >= limit else ""),
                 "",
             ]
-            if not branches:
+            if not body:
                 lines.append("No branches found.")
-            else:
-                for b in branches:
-                    protected = " [protected]" if b.get("protected") else ""
-                    lines.append(f"  {b['name']}{protected}")
-                    lines.append(f"    Latest commit: {b['commit']['sha'][:8]}")
-                    lines.append("")
+            lines.extend(body)
 
             return ToolResult("\n".join(lines))
         except Exception as e:
@@ -167,43 +197,84 @@ class BranchesTool(GitHubTool):
 # Tool: get_repo_tags
 # ---------------------------------------------------------------------------
 
+_VERSION_RE = re.compile(r"(\d+(?:\.\d+)*)(.*)$")
+
+
+def _natural(text: str) -> tuple:
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.findall(r"\d+|[^\d.+_-]+", text))
+
+
+def version_key(tag: str) -> tuple:
+    """Sort key ordering version-like tag names: v1.10.0 > v1.9.2 > v1.9.2-rc2 > v1.9.2-rc1.
+
+    Names without a version number sort below all versioned ones.
+    """
+    match = _VERSION_RE.search(tag)
+    if not match:
+        return (0, (), 0, _natural(tag))
+    numbers = [int(n) for n in match.group(1).split(".")]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()  # v2.0 == v2.0.0
+    suffix = match.group(2).lstrip("-._+")
+    return (1, tuple(numbers), 0 if suffix else 1, _natural(suffix))
+
+
 class TagsTool(GitHubTool):
     name = "get_repo_tags"
     description = (
-        "List tags (releases) of a GitHub repository. "
-        "Shows tag name and associated commit SHA."
+        "List tags (releases) of a GitHub repository, highest version first. "
+        "Shows tag name and associated commit SHA. "
+        "Use until_tag to list every version above a given tag (e.g. all tags since v2.0)."
     )
     input_schema = {
         "type": "object",
         "properties": {
             "owner": {"type": "string", "description": "Repository owner"},
             "repo": {"type": "string", "description": "Repository name"},
-            "per_page": {"type": "integer", "description": "Number of tags to return (1-100, default: 30)"},
+            "per_page": {"type": "integer", "description": "Number of tags to return (1-1000, default: 30)"},
+            "until_tag": {
+                "type": "string",
+                "description": "Stop listing when this tag is reached in version order (it is included)",
+            },
         },
         "required": ["owner", "repo"],
     }
 
     async def execute(self, arguments: dict) -> ToolResult:
         owner, repo = self._parse_owner_repo(arguments)
-        per_page = arguments.get("per_page", 30)
+        until_tag = arguments.get("until_tag")
+        limit = self._parse_limit(arguments, MAX_LIST_LIMIT if until_tag else 30)
         if not owner or not repo:
             return ToolResult("Missing required parameters: owner and repo", is_error=True)
 
         try:
-            tags = await self.client.get_tags(owner, repo, per_page)
+            # GitHub does not return tags in date or version order, so fetch them all and sort
+            tags = [t async for t in self.client.iter_tags(owner, repo, MAX_LIST_LIMIT)]
+            tags.sort(key=lambda t: version_key(t["name"]), reverse=True)
+            reached = False
+            if until_tag:
+                names = [t["name"] for t in tags]
+                if until_tag in names:
+                    tags = tags[:names.index(until_tag) + 1]
+                    reached = True
+
+            body = []
+            for t in tags[:limit]:
+                body.append(f"  {t['name']}")
+                body.append(f"    Commit: {t['commit']['sha'][:8]}")
+                body.append("")
+
             lines = [
                 f"Tags for {owner}/{repo}:",
                 "=" * 50,
-                f"Shown: {len(tags)}",
-                "",
+                f"Shown: {min(limit, len(tags))} of {len(tags)}",
             ]
-            if not tags:
+            if until_tag and not reached:
+                lines.append(f"Note: tag '{until_tag}' not found among the first {MAX_LIST_LIMIT} tags")
+            lines.append("")
+            if not body:
                 lines.append("No tags found.")
-            else:
-                for t in tags:
-                    lines.append(f"  {t['name']}")
-                    lines.append(f"    Commit: {t['commit']['sha'][:8]}")
-                    lines.append("")
+            lines.extend(body)
 
             return ToolResult("\n".join(lines))
         except Exception as e:
@@ -219,7 +290,9 @@ class ReadmeTool(GitHubTool):
     name = "get_readme"
     description = (
         "Fetch the README content of a GitHub repository. "
-        "Returns the decoded text. Optionally specify a branch or tag."
+        "Returns the decoded text. Optionally specify a branch or tag. "
+        "To save context, request a single section by heading (e.g. 'Installation'), "
+        "a line range or a byte range instead of the whole file."
     )
     input_schema = {
         "type": "object",
@@ -227,32 +300,148 @@ class ReadmeTool(GitHubTool):
             "owner": {"type": "string", "description": "Repository owner"},
             "repo": {"type": "string", "description": "Repository name"},
             "ref": {"type": "string", "description": "Branch, tag, or commit SHA (default: default branch)"},
+            "section": {
+                "type": "string",
+                "description": "Return only the section under this heading, including its sub-sections "
+                               "(case-insensitive, partial match allowed)",
+            },
+            "start_line": {"type": "integer", "description": "First line to return (1-based)"},
+            "end_line": {"type": "integer", "description": "Last line to return (inclusive)"},
+            "byte_offset": {"type": "integer", "description": "Skip this many bytes from the start"},
+            "max_bytes": {"type": "integer", "description": "Return at most this many bytes"},
         },
         "required": ["owner", "repo"],
     }
 
+    HEADING_RE = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+
+    @staticmethod
+    def _int_arg(arguments: dict, key: str) -> Optional[int]:
+        value = arguments.get(key)
+        if value is None or value == "":
+            return None
+        return max(0, int(value))
+
+    @staticmethod
+    async def _iter_lines(chunks) -> AsyncIterator[str]:
+        """Decode a byte stream into lines as it arrives."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield buffer.rstrip("\r")
+
+    async def _read_section(self, chunks, section: str) -> tuple[Optional[list[str]], list[str]]:
+        """Lines of the first ATX heading matching `section` up to the next heading of the same
+        or higher level; the download stops there. Returns (lines or None, headings seen)."""
+        target = section.strip().lstrip("#").strip().lower()
+        headings = []
+        level = None
+        selected = []
+        in_fence = False
+        async for line in self._iter_lines(chunks):
+            if line.lstrip().startswith(("```", "~~~")):
+                in_fence = not in_fence
+            match = None if in_fence else self.HEADING_RE.match(line)
+            if match:
+                depth, title = len(match.group(1)), match.group(2)
+                if level is not None and depth <= level:
+                    return selected, headings
+                if level is None:
+                    headings.append("#" * depth + " " + title)
+                    if target == title.lower() or target in title.lower():
+                        level = depth
+            if level is not None:
+                selected.append(line)
+        return (selected if level is not None else None), headings
+
+    async def _read_lines(self, chunks, start: int, end: Optional[int]) -> tuple[list[str], bool]:
+        """Lines start..end (1-based, inclusive); True if the file continues past `end`."""
+        selected = []
+        number = 0
+        async for line in self._iter_lines(chunks):
+            number += 1
+            if end is not None and number > end:
+                return selected, True
+            if number >= start:
+                selected.append(line)
+        return selected, False
+
+    @staticmethod
+    async def _read_bytes(chunks, offset: int, length: Optional[int]) -> tuple[bytes, bool]:
+        """Bytes offset..offset+length; True if the file continues past the range."""
+        buffer = bytearray()
+        position = 0
+        async for chunk in chunks:
+            if position + len(chunk) > offset:
+                buffer += chunk[max(0, offset - position):]
+            position += len(chunk)
+            if length is not None and len(buffer) > length:
+                return bytes(buffer[:length]), True
+        return bytes(buffer[:length] if length is not None else buffer), False
+
     async def execute(self, arguments: dict) -> ToolResult:
         owner, repo = self._parse_owner_repo(arguments)
         ref = arguments.get("ref")
         if not owner or not repo:
             return ToolResult("Missing required parameters: owner and repo", is_error=True)
 
+        section = (arguments.get("section") or "").strip()
         try:
-            data = await self.client.get_readme(owner, repo, ref)
-            content_b64 = data.get("content", "")
-            content = base64.b64decode(content_b64).decode("utf-8")
+            start_line = self._int_arg(arguments, "start_line")
+            end_line = self._int_arg(arguments, "end_line")
+            byte_offset = self._int_arg(arguments, "byte_offset")
+            max_bytes = self._int_arg(arguments, "max_bytes")
+        except (TypeError, ValueError):
+            return ToolResult("start_line, end_line, byte_offset and max_bytes must be integers", is_error=True)
+
+        ref_info = f" (ref: {ref})" if ref else ""
+        chunks = self.client.iter_readme(owner, repo, ref)
+        try:
+            truncated = False
+            if section:
+                selected, headings = await self._read_section(chunks, section)
+                if selected is None:
+                    available = "\n".join(f"  {h}" for h in headings[:50]) or "  (no headings)"
+                    return ToolResult(
+                        f"Section '{section}' not found in README of {owner}/{repo}. Headings:\n{available}",
+                        is_error=True,
+                    )
+                title = f"README for {owner}/{repo}{ref_info}, section '{section}':"
+                content = "\n".join(selected)
+            elif start_line is not None or end_line is not None:
+                start = max(1, start_line or 1)
+                selected, truncated = await self._read_lines(chunks, start, end_line)
+                title = f"README for {owner}/{repo}{ref_info}, lines {start}-{start + len(selected) - 1}:"
+                content = "\n".join(selected)
+            elif byte_offset is not None or max_bytes is not None:
+                offset = byte_offset or 0
+                data, truncated = await self._read_bytes(chunks, offset, max_bytes)
+                title = f"README for {owner}/{repo}{ref_info}, bytes {offset}-{offset + len(data)}:"
+                content = data.decode("utf-8", errors="replace")
+            else:
+                title = f"README for {owner}/{repo}{ref_info}:"
+                content = "\n".join([line async for line in self._iter_lines(chunks)])
 
-            ref_info = f" (ref: {ref})" if ref else ""
             lines = [
-                f"README for {owner}/{repo}{ref_info}:",
+                title,
                 "=" * 50,
                 "",
                 content,
             ]
+            if truncated:
+                lines.append("\n... (more content follows)")
             return ToolResult("\n".join(lines))
         except Exception as e:
             logger.error(f"ReadmeTool error: {e}")
             return ToolResult(f"Failed to get README: {e}", is_error=True)
+        finally:
+            await chunks.aclose()
 
 
 # ---------------------------------------------------------------------------
@@ -270,19 +459,19 @@ class ContributorsTool(GitHubTool):
         "properties": {
             "owner": {"type": "string", "description": "Repository owner"},
             "repo": {"type": "string", "description": "Repository name"},
-            "per_page": {"type": "integer", "description": "Number of contributors to return (1-100, default: 10)"},
+            "per_page": {"type": "integer", "description": "Number of contributors to return (1-1000, default: 10)"},
         },
         "required": ["owner", "repo"],
     }
 
     async def execute(self, arguments: dict) -> ToolResult:
         owner, repo = self._parse_owner_repo(arguments)
-        per_page = arguments.get("per_page", 10)
+        limit = self._parse_limit(arguments, 10)
         if not owner or not repo:
             return ToolResult("Missing required parameters: owner and repo", is_error=True)
 
         try:
-            contributors = await self.client.get_contributors(owner, repo, per_page)
+            contributors = [c async for c in self.client.iter_contributors(owner, repo, limit)]
             lines = [
                 f"Top contributors for {owner}/{repo}:",
                 "=" * 50,
@@ -311,7 +500,8 @@ class CommitsTool(GitHubTool):
     name = "get_repo_commits"
     description = (
         "Get recent commits for a GitHub repository. "
-        "Optionally filter by branch name. Shows commit SHA, message, author, and date."
+        "Optionally filter by branch name. Shows commit SHA, message, author, and date. "
+        "Follows pagination for deep histories."
     )
     input_schema = {
         "type": "object",
@@ -319,7 +509,7 @@ class CommitsTool(GitHubTool):
             "owner": {"type": "string", "description": "Repository owner"},
             "repo": {"type": "string", "description": "Repository name"},
             "branch": {"type": "string", "description": "Branch name or SHA (default: default branch)"},
-            "per_page": {"type": "integer", "description": "Number of commits to return (1-100, default: 10)"},
+            "per_page": {"type": "integer", "description": "Number of commits to return (1-1000, default: 10)"},
         },
         "required": ["owner", "repo"],
     }
@@ -327,29 +517,29 @@ class CommitsTool(GitHubTool):
     async def execute(self, arguments: dict) -> ToolResult:
         owner, repo = self._parse_owner_repo(arguments)
         branch = arguments.get("branch")
-        per_page = arguments.get("per_page", 10)
+        limit = self._parse_limit(arguments, 10)
         if not owner or not repo:
             return ToolResult("Missing required parameters: owner and repo", is_error=True)
 
         try:
-            commits = await self.client.get_commits(owner, repo, sha=branch, per_page=per_page)
             branch_info = f" (branch: {branch})" if branch else ""
             lines = [
                 f"Recent commits for {owner}/{repo}{branch_info}:",
                 "=" * 50,
                 "",
             ]
-            if not commits:
+            count = 0
+            async for c in self.client.iter_commits(owner, repo, sha=branch, limit=limit):
+                count += 1
+                sha = c["sha"][:8]
+                message = c["commit"]["message"].split("\n")[0]
+                author = c["commit"]["author"].get("name", "Unknown")
+                date = c["commit"]["author"].get("date", "")
+                lines.append(f"  {count}. [{sha}] {message}")
+                lines.append(f"     Author: {author}  Date: {date}")
+                lines.append("")
+            if not count:
                 lines.append("No commits found.")
-            else:
-                for i, c in enumerate(commits, 1):
-                    sha = c["sha"][:8]
-                    message = c["commit"]["message"].split("\n")[0]
-                    author = c["commit"]["author"].get("name", "Unknown")
-                    date = c["commit"]["author"].get("date", "")
-                    lines.append(f"  {i}. [{sha}] {message}")
-                    lines.append(f"     Author: {author}  Date: {date}")
-                    lines.append("")
 
             return ToolResult("\n".join(lines))
         except Exception as e:
@@ -421,13 +611,398 @@ class UserInfoTool(GitHubTool):
             return ToolResult(f"Failed to get user info: {e}", is_error=True)
 
 
+# ---------------------------------------------------------------------------
+# Tool: get_repos_overview
+# ---------------------------------------------------------------------------
+
+class ReposOverviewTool(GitHubTool):
+    name = "get_repos_overview"
+    description = (
+        "Compare several GitHub repositories in one call. For each 'owner/repo' returns "
+        "description, stars, forks, language, license, branch count, latest tags (by version), "
+        "top contributors and the README summary line. "
+        "Use this instead of calling get_repo_info, get_repo_branches, get_repo_tags, "
+        "get_repo_contributors and get_readme for every repository."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "repos": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": f"Repositories as 'owner/repo' (up to {OVERVIEW_MAX_REPOS})",
+            },
+        },
+        "required": ["repos"],
+    }
+
+    @staticmethod
+    def _parse_repos(value) -> list[str]:
+        if isinstance(value, str):
+            value = value.replace(";", ",").split(",")
+        repos = []
+        for item in value or []:
+            item = str(item).strip().strip("/")
+            if item.startswith("https://github.com/"):
+                item = item[len("https://github.com/"):]
+            if item and item not in repos:
+                repos.append(item)
+        return repos
+
+    @staticmethod
+    def _readme_summary(text: str) -> str:
+        for line in text.splitlines():
+            line = line.strip()
+            # Skip headings, badges, HTML and blank lines; take the first prose line
+            if line and not line.startswith(("#", "[!", "![", "<", "=", "-")):
+                return line[:200]
+        return ""
+
+    async def _collect(self, full_name: str, semaphore: asyncio.Semaphore) -> dict:
+        owner, _, repo = full_name.partition("/")
+        if not owner or not repo or "/" in repo:
+            return {"name": full_name, "error": "expected 'owner/repo'"}
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        async def first_n(iterator, n):
+            return [item async for item in iterator][:n]
+
+        async def highest_tags(n):
+            # /tags is not in version order (see TagsTool), so sort before taking the top n
+            tags = [t async for t in self.client.iter_tags(owner, repo, MAX_LIST_LIMIT)]
+            return sorted(tags, key=lambda t: version_key(t["name"]), reverse=True)[:n]
+
+        results = await asyncio.gather(
+            bounded(self.client.get_repo(owner, repo)),
+            bounded(first_n(self.client.iter_branches(owner, repo, 100), 100)),
+            bounded(highest_tags(5)),
+            bounded(first_n(self.client.iter_contributors(owner, repo, 5), 5)),
+            bounded(self.client.get_readme(owner, repo, max_bytes=OVERVIEW_README_BYTES)),
+            return_exceptions=True,
+        )
+        info, branches, tags, contributors, readme = results
+        if isinstance(info, Exception):
+            return {"name": full_name, "error": str(info)}
+        return {
+            "name": info.get("full_name", full_name),
+            "info": info,
+            "branches": branches,
+            "tags": tags,
+            "contributors": contributors,
+            "readme": readme,
+        }
+
+    @staticmethod
+    def _format(entry: dict) -> list[str]:
+        if "error" in entry:
+            return [f"{entry['name']}", f"  ERROR: {entry['error']}", ""]
+
+        info = entry["info"]
+        lines = [f"{entry['name']}" + (f" — {info['description']}" if info.get("description") else "")]
+        license_name = (info.get("license") or {}).get("name", "N/A")
+        lines.append(
+            f"  Stars: {info.get('stargazers_count', 0)}  Forks: {info.get('forks_count', 0)}  "
+            f"Issues: {info.get('open_issues_count', 0)}  Language: {info.get('language') or 'N/A'}  "
+            f"License: {license_name}"
+        )
+        archived = "Yes" if info.get("archived") else "No"
+        lines.append(f"  Last push: {info.get('pushed_at', 'N/A')}  Archived: {archived}")
+
+        branches = entry["branches"]
+        if isinstance(branches, Exception):
+            lines.append(f"  Branches: error: {branches}")
+        else:
+            count = f"{len(branches)}+" if len(branches) >= 100 else str(len(branches))
+            lines.append(f"  Branches: {count} (default: {info.get('default_branch', 'N/A')})")
+
+        tags = entry["tags"]
+        if isinstance(tags, Exception):
+            lines.append(f"  Latest tags: error: {tags}")
+        else:
+            lines.append(f"  Latest tags: {', '.join(t['name'] for t in tags) or 'none'}")
+
+        contributors = entry["contributors"]
+        if isinstance(contributors, Exception):
+            lines.append(f"  Top contributors: error: {contributors}")
+        else:
+            top = ", ".join(f"{c['login']} ({c.get('contributions', '?')})" for c in contributors)
+            lines.append(f"  Top contributors: {top or 'none'}")
+
+        readme = entry["readme"]
+        if isinstance(readme, Exception):
+            lines.append("  README: not available")
+        else:
+            summary = ReposOverviewTool._readme_summary(readme)
+            if summary:
+                lines.append(f"  README: {summary}")
+        lines.append("")
+        return lines
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        repos = self._parse_repos(arguments.get("repos"))
+        if not repos:
+            return ToolResult("Missing required parameter: repos (list of 'owner/repo')", is_error=True)
+        if len(repos) > OVERVIEW_MAX_REPOS:
+            return ToolResult(f"Too many repositories: {len(repos)} (max {OVERVIEW_MAX_REPOS})", is_error=True)
+
+        try:
+            semaphore = asyncio.Semaphore(OVERVIEW_CONCURRENCY)
+            entries = await asyncio.gather(*(self._collect(r, semaphore) for r in repos))
+
+            failed = sum(1 for e in entries if "error" in e)
+            lines = [
+                f"Overview of {len(repos)} repositories" + (f" ({failed} failed)" if failed else "") + ":",
+                "=" * 50,
+                "",
+            ]
+            for entry in entries:
+                lines.extend(self._format(entry))
+
+            return ToolResult("\n".join(lines))
+        except Exception as e:
+            logger.error(f"ReposOverviewTool error: {e}")
+            return ToolResult(f"Failed to get repositories overview: {e}", is_error=True)
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_repo_tree
+# ---------------------------------------------------------------------------
+
+class RepoTreeTool(GitHubTool):
+    name = "get_repo_tree"
+    description = (
+        "List files and directories of a GitHub repository at a branch, tag or commit. "
+        "Optionally restrict to a sub-directory. Use get_file_content to read a file."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "owner": {"type": "string", "description": "Repository owner"},
+            "repo": {"type": "string", "description": "Repository name"},
+            "ref": {"type": "string", "description": "Branch, tag, or commit SHA (default: default branch)"},
+            "path": {"type": "string", "description": "Only list entries under this directory (e.g. 'src/utils')"},
+            "max_entries": {
+                "type": "integer",
+                "description": f"Maximum entries to list (default: {TREE_DEFAULT_ENTRIES}, max: {TREE_MAX_ENTRIES})",
+            },
+        },
+        "required": ["owner", "repo"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        owner, repo = self._parse_owner_repo(arguments)
+        ref = arguments.get("ref")
+        prefix = (arguments.get("path") or "").strip("/")
+        if not owner or not repo:
+            return ToolResult("Missing required parameters: owner and repo", is_error=True)
+        try:
+            max_entries = max(1, min(TREE_MAX_ENTRIES, int(arguments.get("max_entries", TREE_DEFAULT_ENTRIES))))
+        except (TypeError, ValueError):
+            max_entries = TREE_DEFAULT_ENTRIES
+
+        try:
+            sha = await self.client.resolve_ref(owner, repo, ref)
+            tree = await self.client.get_tree(owner, repo, sha)
+            entries = [
+                e for e in tree.get("tree", [])
+                if not prefix or e["path"] == prefix or e["path"].startswith(prefix + "/")
+            ]
+            if prefix and not entries:
+                return ToolResult(f"Path '{prefix}' not found in {owner}/{repo}@{sha[:7]}", is_error=True)
+
+            location = f"{owner}/{repo}/{prefix}" if prefix else f"{owner}/{repo}"
+            lines = [f"Tree of {location} @ {ref or 'default branch'} ({sha[:7]}), {len(entries)} entries:", ""]
+            for entry in entries[:max_entries]:
+                if entry["type"] == "tree":
+                    lines.append(f"  {entry['path']}/")
+                elif entry["type"] == "commit":
+                    lines.append(f"  {entry['path']}  (submodule @ {entry['sha'][:7]})")
+                else:
+                    lines.append(f"  {entry['path']}  ({entry.get('size', 0):,} bytes)")
+            if len(entries) > max_entries:
+                lines.append(f"  ... and {len(entries) - max_entries} more (narrow with 'path')")
+            if tree.get("truncated"):
+                lines.append("")
+                lines.append("Note: GitHub truncated this tree; list a sub-directory with 'path' for the rest.")
+
+            return ToolResult("\n".join(lines))
+        except Exception as e:
+            logger.error(f"RepoTreeTool error: {e}")
+            return ToolResult(f"Failed to get repository tree: {e}", is_error=True)
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_file_content
+# ---------------------------------------------------------------------------
+
+class FileContentTool(GitHubTool):
+    name = "get_file_content"
+    description = (
+        "Read a file from a GitHub repository at a branch, tag or commit. "
+        "Returns the text content; binary files are reported by size only."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "owner": {"type": "string", "description": "Repository owner"},
+            "repo": {"type": "string", "description": "Repository name"},
+            "path": {"type": "string", "description": "File path within the repository (e.g. 'src/main.py')"},
+            "ref": {"type": "string", "description": "Branch, tag, or commit SHA (default: default branch)"},
+            "max_bytes": {
+                "type": "integer",
+                "description": f"Truncate content after this many bytes (default: {FILE_DEFAULT_BYTES})",
+            },
+        },
+        "required": ["owner", "repo", "path"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        owner, repo = self._parse_owner_repo(arguments)
+        ref = arguments.get("ref")
+        path = (arguments.get("path") or "").strip("/")
+        if not owner or not repo or not path:
+            return ToolResult("Missing required parameters: owner, repo and path", is_error=True)
+        try:
+            max_bytes = max(1, int(arguments.get("max_bytes", FILE_DEFAULT_BYTES)))
+        except (TypeError, ValueError):
+            max_bytes = FILE_DEFAULT_BYTES
+
+        try:
+            sha = await self.client.resolve_ref(owner, repo, ref)
+            tree = await self.client.get_tree(owner, repo, sha)
+            entry = next((e for e in tree.get("tree", []) if e["path"] == path), None)
+            if entry is None and tree.get("truncated"):
+                # The recursive tree is capped for huge repositories; ask for this one path instead
+                entry = await self._contents_entry(owner, repo, path, sha)
+            if entry is None:
+                return ToolResult(f"File '{path}' not found in {owner}/{repo}@{sha[:7]}", is_error=True)
+            if entry["type"] != "blob":
+                return ToolResult(f"'{path}' is a {entry['type']}, not a file. Use get_repo_tree.", is_error=True)
+
+            data = await self.client.get_blob(owner, repo, entry["sha"])
+            header = f"{owner}/{repo}/{path} @ {ref or 'default branch'} ({sha[:7]}), {len(data):,} bytes"
+            if b"\0" in data[:8192]:
+                return ToolResult(f"{header}\n\nBinary file, content not shown.")
+
+            content = data[:max_bytes].decode("utf-8", errors="replace")
+            lines = [header, "=" * 50, "", content]
+            if len(data) > max_bytes:
+                lines.append(f"\n... truncated at {max_bytes:,} of {len(data):,} bytes")
+            return ToolResult("\n".join(lines))
+        except Exception as e:
+            logger.error(f"FileContentTool error: {e}")
+            return ToolResult(f"Failed to get file content: {e}", is_error=True)
+
+    async def _contents_entry(self, owner: str, repo: str, path: str, sha: str) -> Optional[dict]:
+        """A tree-style {type, sha} entry for `path` from the contents API, None if it does not exist."""
+        try:
+            contents = await self.client.get_contents(owner, repo, path, sha)
+        except GitHubApiError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        if isinstance(contents, list):
+            return {"type": "tree", "sha": None}
+        kind = {"file": "blob", "symlink": "blob", "dir": "tree", "submodule": "commit"}.get(contents.get("type"))
+        return {"type": kind or contents.get("type"), "sha": contents.get("sha")}
+
+
+# ---------------------------------------------------------------------------
+# Tool: search_commit_history
+# ---------------------------------------------------------------------------
+
+class CommitHistoryTool(GitHubTool):
+    name = "search_commit_history"
+    description = (
+        "Search the commit history of a GitHub repository's default branch by author, file path "
+        "and date range, e.g. 'commits by alice last month' or 'who changed src/api.py'. "
+        "Answers from a local mirror that is updated incrementally, so repeated questions are cheap. "
+        "Also shows the most active authors for the matching commits."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "owner": {"type": "string", "description": "Repository owner"},
+            "repo": {"type": "string", "description": "Repository name"},
+            "author": {"type": "string", "description": "GitHub login, author name or email (exact, case-insensitive)"},
+            "path": {"type": "string", "description": "Only commits touching this file or directory"},
+            "since": {"type": "string", "description": "Start date, YYYY-MM-DD or ISO 8601 (inclusive)"},
+            "until": {"type": "string", "description": "End date, YYYY-MM-DD or ISO 8601 (inclusive)"},
+            "limit": {"type": "integer", "description": "Number of commits to list (1-200, default: 20)"},
+        },
+        "required": ["owner", "repo"],
+    }
+
+    def __init__(self, client: GitHubClient, history: CommitHistoryMirror):
+        super().__init__(client)
+        self.history = history
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        owner, repo = self._parse_owner_repo(arguments)
+        if not owner or not repo:
+            return ToolResult("Missing required parameters: owner and repo", is_error=True)
+        author = (arguments.get("author") or "").strip() or None
+        path = (arguments.get("path") or "").strip("/ ") or None
+        since = arguments.get("since")
+        until = arguments.get("until")
+        try:
+            limit = max(1, min(200, int(arguments.get("limit", 20))))
+        except (TypeError, ValueError):
+            limit = 20
+
+        try:
+            result = await self.history.query(owner, repo, author, path, since, until, limit)
+
+            filters = [f"author={author}" if author else "", f"path={path}" if path else "",
+                       f"since={since}" if since else "", f"until={until}" if until else ""]
+            filter_info = ", ".join(f for f in filters if f) or "no filters"
+            lines = [
+                f"Commit history for {owner}/{repo} ({filter_info}): {result['total']} matching commit(s)",
+                "=" * 50,
+            ]
+            if not result["complete"]:
+                lines.append(
+                    f"Note: only the latest {self.history.max_backfill} commits are mirrored"
+                    + (f" (back to {result['oldest'][:10]})" if result["oldest"] else "")
+                )
+            lines.append("")
+
+            if result["contributor"]:
+                c = result["contributor"]
+                lines.append(f"{c['login']}: {c['contributions']} contributions all-time ({c['html_url']})")
+                lines.append("")
+            if result["authors"] and not author:
+                lines.append("Most active authors:")
+                for who, n in result["authors"]:
+                    lines.append(f"  {who or 'unknown'}: {n}")
+                lines.append("")
+
+            for i, c in enumerate(result["commits"], 1):
+                message = (c["message"] or "").split("\n")[0]
+                who = c["author_login"] or c["author_name"] or "Unknown"
+                lines.append(f"  {i}. [{c['sha'][:8]}] {message}")
+                lines.append(f"     Author: {who}  Date: {c['authored_at']}")
+            if result["total"] > len(result["commits"]):
+                lines.append(f"  ... and {result['total'] - len(result['commits'])} more (raise 'limit')")
+            if not result["total"]:
+                lines.append("No matching commits.")
+
+            return ToolResult("\n".join(lines))
+        except Exception as e:
+            logger.error(f"CommitHistoryTool error: {e}")
+            return ToolResult(f"Failed to search commit history: {e}", is_error=True)
+
+
 # ---------------------------------------------------------------------------
 # Registry
 # ---------------------------------------------------------------------------
 
-def get_all_tools(client: GitHubClient) -> list[GitHubTool]:
+def get_all_tools(client: GitHubClient, history: Optional[CommitHistoryMirror] = None) -> list[GitHubTool]:
     """Return all registered GitHub MCP tools."""
-    return [
+    tools = [
         RepoInfoTool(client),
         BranchesTool(client),
         TagsTool(client),
@@ -435,4 +1010,10 @@ def get_all_tools(client: GitHubClient) -> list[GitHubTool]:
         ContributorsTool(client),
         CommitsTool(client),
         UserInfoTool(client),
+        ReposOverviewTool(client),
+        RepoTreeTool(client),
+        FileContentTool(client),
     ]
+    if history is not None:
+        tools.append(CommitHistoryTool(client, history))
+    return tools
@@ -3,6 +3,11 @@
 This module provides common building blocks for MCP servers:
 - McpProtocolHandler: JSON-RPC 2.0 message handling
 - SseTransport: Server-Sent Events transport layer
+- LifespanManager: Graceful shutdown (drain in-flight calls, close clients)
+- run_server: uvicorn runner that drains before closing connections
+- ApiKeyAuthMiddleware: Pure-ASGI API-key auth with per-key rate limits
+- HttpClient: Pooled upstream HTTP client with retries and circuit breaking
+- Geocoder: City-name geocoding with a persistent cache shared between servers
 - ToolResult: Standard tool execution result
 - BaseTool: Abstract base class for tools
 - Tool: Declarative tool definition
@@ -12,6 +17,10 @@ This module provides common building blocks for MCP servers:
 
 from .mcp_protocol import McpProtocolHandler, MCP_PROTOCOL_VERSION
 from .sse_transport import SseTransport, SseSession
+from .auth import ApiKeyAuth, ApiKeyAuthMiddleware
+from .http_client import HttpClient, RetryPolicy, UpstreamError
+from .geocoding import Geocoder, GeocodingCache
+from .lifespan import LifespanManager, ServerShuttingDownError, run_server
 from .models import ToolResult, BaseTool, Tool, ToolParameter, ToolCallRequest
 
 __all__ = [
@@ -19,6 +28,16 @@ __all__ = [
     "MCP_PROTOCOL_VERSION",
     "SseTransport",
     "SseSession",
+    "ApiKeyAuth",
+    "ApiKeyAuthMiddleware",
+    "HttpClient",
+    "RetryPolicy",
+    "UpstreamError",
+    "Geocoder",
+    "GeocodingCache",
+    "LifespanManager",
+    "ServerShuttingDownError",
+    "run_server",
     "ToolResult",
     "BaseTool",
     "Tool",
@@ -0,0 +1,224 @@
+"""API-key authentication with per-key rate limiting, as pure ASGI middleware.
+
+Unlike @app.middleware("http") (Starlette's BaseHTTPMiddleware), a pure
+ASGI middleware does not wrap the response body in an extra task and
+queue, so the long-lived /sse stream passes through untouched.
+
+Keys are compared in constant time (HMAC digest comparison over all
+configured keys). Each key gets its own token bucket and call counters.
+
+Key format (MCP_API_KEY):
+    secret                          single key, taken verbatim (may contain ":")
+    secret1,secret2                 several keys
+    agent-a:secret1,agent-b:secret2 labelled keys (labels shown in /health)
+    agent-a:secret1,                a single labelled key (the comma makes it a list)
+
+Labels are only parsed from comma-separated lists, so an existing
+single-key value keeps authenticating exactly as before.
+
+Environment variables (read by ApiKeyAuth.from_env):
+    MCP_RATE_LIMIT_RPS    Sustained requests per second per key (default: 0 = unlimited)
+    MCP_RATE_LIMIT_BURST  Bucket capacity per key (default: max(1, 2 × rps))
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import math
+import os
+import time
+from typing import Optional
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+# Paths that do NOT require authentication
+PUBLIC_PATHS = frozenset({"/health", "/", "/docs", "/redoc", "/openapi.json"})
+
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode("utf-8")).digest()
+
+
+def parse_api_keys(value: Optional[str]) -> dict[str, str]:
+    """Parse MCP_API_KEY into {label: key}. Unlabelled keys get a fingerprint label."""
+    value = (value or "").strip()
+    listed = "," in value
+    keys = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        label, sep, key = item.partition(":") if listed else ("", "", item)
+        if not sep or not label.strip() or not key:
+            key = item
+            label = f"key-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:8]}"
+        keys[label.strip()] = key.strip()
+    return keys
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name, "").strip()
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring {name}={value!r}: not a number, using the default")
+        return None
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/second, up to `capacity`."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consume one token. Returns 0 on success, else seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _KeyStats:
+    __slots__ = ("requests", "calls", "rate_limited")
+
+    def __init__(self):
+        self.requests = 0
+        self.calls = 0
+        self.rate_limited = 0
+
+
+class ApiKeyAuth:
+    """Key registry shared by the middleware and the /health endpoint."""
+
+    def __init__(self, keys: dict[str, str], rate_per_second: float = 0.0, burst: Optional[float] = None):
+        if not keys:
+            raise ValueError("At least one API key is required when auth is enabled")
+        self._digests = [(label, _digest(key)) for label, key in keys.items()]
+        self.rate_per_second = rate_per_second
+        self.burst = burst if burst is not None else max(1.0, 2 * rate_per_second)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats = {label: _KeyStats() for label in keys}
+        self.unauthorized = 0
+
+    @classmethod
+    def from_env(cls, api_key: Optional[str]) -> "ApiKeyAuth":
+        """Build from the configured MCP_API_KEY value plus MCP_RATE_LIMIT_* env vars.
+
+        A malformed rate limit setting is ignored (with a warning) rather than
+        stopping the server.
+        """
+        rate = _env_float("MCP_RATE_LIMIT_RPS") or 0.0
+        return cls(parse_api_keys(api_key), rate, _env_float("MCP_RATE_LIMIT_BURST"))
+
+    def authenticate(self, candidate: Optional[str]) -> Optional[str]:
+        """Return the label of the matching key, or None. Checks every key to stay constant-time."""
+        if not candidate:
+            self.unauthorized += 1
+            return None
+        candidate_digest = _digest(candidate)
+        matched = None
+        for label, key_digest in self._digests:
+            if hmac.compare_digest(candidate_digest, key_digest):
+                matched = label
+        if matched is None:
+            self.unauthorized += 1
+        return matched
+
+    def acquire(self, label: str, is_call: bool) -> float:
+        """Count a request for `label`; returns seconds to wait if it is rate limited."""
+        stats = self._stats[label]
+        if self.rate_per_second > 0:
+            bucket = self._buckets.get(label)
+            if bucket is None:
+                bucket = self._buckets[label] = TokenBucket(self.rate_per_second, self.burst)
+            retry_after = bucket.take()
+            if retry_after:
+                stats.rate_limited += 1
+                return retry_after
+        stats.requests += 1
+        if is_call:
+            stats.calls += 1
+        return 0.0
+
+    def stats(self) -> dict:
+        return {
+            "rate_limit_rps": self.rate_per_second or None,
+            "unauthorized": self.unauthorized,
+            "keys": {
+                label: {"requests": s.requests, "calls": s.calls, "rate_limited": s.rate_limited}
+                for label, s in self._stats.items()
+            },
+        }
+
+
+async def _send_json(send, status: int, payload: dict, headers: Optional[list] = None):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            *(headers or []),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class ApiKeyAuthMiddleware:
+    """Pure ASGI middleware: app.add_middleware(ApiKeyAuthMiddleware, auth=auth)."""
+
+    def __init__(self, app, auth: ApiKeyAuth, public_paths=PUBLIC_PATHS):
+        self.app = app
+        self.auth = auth
+        self.public_paths = frozenset(public_paths)
+
+    @staticmethod
+    def _extract_key(scope) -> Optional[str]:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-api-key":
+                return value.decode("latin-1")
+        query = scope.get("query_string", b"")
+        if query and b"api_key" in query:
+            values = parse_qs(query.decode("latin-1")).get("api_key")
+            if values:
+                return values[0]
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.public_paths:
+            await self.app(scope, receive, send)
+            return
+
+        label = self.auth.authenticate(self._extract_key(scope))
+        if label is None:
+            await _send_json(send, 401, {"error": "Unauthorized: missing or invalid X-API-Key header"})
+            return
+
+        is_call = scope["method"] == "POST" and scope["path"] == "/message"
+        retry_after = self.auth.acquire(label, is_call)
+        if retry_after:
+            logger.warning(f"Rate limit exceeded for API key '{label}'")
+            await _send_json(
+                send,
+                429,
+                {"error": f"Rate limit exceeded for this API key. Retry in {retry_after:.1f}s"},
+                headers=[(b"retry-after", str(math.ceil(retry_after)).encode("ascii"))],
+            )
+            return
+
+        scope.setdefault("state", {})["api_key_label"] = label
+        await self.app(scope, receive, send)
@@ -0,0 +1,267 @@
+"""City-name geocoding via Open-Meteo, with a cache shared between servers.
+
+City coordinates never change, so successful lookups are kept indefinitely;
+"not found" results are kept for a short negative TTL only (the upstream
+index does get new places). Keys are normalized city names, so "  new  York"
+and "New York" share an entry. Concurrent lookups of the same name are
+coalesced into one request.
+
+Names found exactly in the offline city index (shared/offline_geocoder.py)
+are answered locally without touching the cache or the network. Its fuzzy
+matching (typos, missing accents) is only a fallback once the API has not
+found a name or is unavailable, so a real city missing from the index is
+never silently swapped for a similar-looking one.
+
+The cache persists to a JSON file. Several servers (weather, timeservice)
+may point at the same file: every save re-reads it and merges before the
+atomic replace, so one process does not drop entries written by another.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+from .http_client import HttpClient
+
+if TYPE_CHECKING:
+    from .offline_geocoder import OfflineGeocoder
+
+logger = logging.getLogger(__name__)
+
+GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
+
+DEFAULT_CACHE_FILE = "~/.cache/mcp-servers/geocoding.json"
+SAVE_INTERVAL = 30.0  # seconds between background saves of new entries
+
+
+def normalize_city(name: str) -> str:
+    """Casefold, NFKC-normalize and collapse whitespace/punctuation runs."""
+    name = unicodedata.normalize("NFKC", name).casefold()
+    name = re.sub(r"\s*,\s*", ", ", name)
+    return re.sub(r"\s+", " ", name).strip(" ,.")
+
+
+class GeocodingCache:
+    """LRU map of normalized name → (location or None, stored_at)."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000, negative_ttl: float = 3600.0):
+        self.path = os.path.abspath(os.path.expanduser(path)) if path else None
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, tuple[Optional[dict], float]]" = OrderedDict()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self._entries.update(self._read_file())
+            self._trim()
+
+    def get(self, key: str) -> tuple[bool, Optional[dict]]:
+        """Return (found, location); location is None for a cached "not found"."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        location, stored_at = entry
+        if location is None and time.time() - stored_at > self.negative_ttl:
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, location
+
+    def put(self, key: str, location: Optional[dict]):
+        self._entries[key] = (location, time.time())
+        self._entries.move_to_end(key)
+        self._trim()
+        self._dirty = True
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_file(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable geocoding cache {self.path}: {e}")
+            return {}
+        return {key: (entry[0], entry[1]) for key, entry in data.items()}
+
+    def _write(self, entries: list) -> bool:
+        """Merge `entries` into the file on disk (newest wins) and replace it atomically."""
+        merged = self._read_file()
+        for key, entry in entries:
+            if key not in merged or merged[key][1] <= entry[1]:
+                merged[key] = entry
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({k: [loc, ts] for k, (loc, ts) in merged.items()}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to persist geocoding cache to {self.path}: {e}")
+            return False
+
+    async def save(self, force: bool = False):
+        """Persist new entries; without `force`, at most once per SAVE_INTERVAL."""
+        if not self.path or not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_save < SAVE_INTERVAL:
+            return
+        self._dirty = False
+        self._last_save = time.monotonic()
+        # Snapshot on the event loop; the file work runs in a thread
+        if not await asyncio.to_thread(self._write, list(self._entries.items())):
+            self._dirty = True
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent": bool(self.path),
+        }
+
+
+class Geocoder:
+    """Open-Meteo geocoding with a shared cache."""
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        cache: Optional[GeocodingCache] = None,
+        offline: Optional["OfflineGeocoder"] = None,
+    ):
+        self.http_client = http_client
+        self.cache = cache or GeocodingCache()
+        self.offline = offline
+        self.offline_hits = 0
+        self.offline_fuzzy_hits = 0
+        self._pending: dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_env(cls, http_client: HttpClient) -> "Geocoder":
+        """GEOCODING_CACHE_FILE (empty = in-memory only), GEOCODING_NEGATIVE_TTL seconds and
+        GEOCODER_CITIES_FILE (GeoNames dump for offline lookups; default bundled, empty = off)."""
+        from .offline_geocoder import BUNDLED_CITIES_FILE, OfflineGeocoder
+
+        path = os.getenv("GEOCODING_CACHE_FILE", DEFAULT_CACHE_FILE) or None
+        negative_ttl = float(os.getenv("GEOCODING_NEGATIVE_TTL", "3600"))
+        cities_file = os.getenv("GEOCODER_CITIES_FILE", BUNDLED_CITIES_FILE)
+        offline = None
+        if cities_file:
+            try:
+                offline = OfflineGeocoder(os.path.expanduser(cities_file))
+            except OSError as e:
+                logger.warning(f"Offline geocoder disabled, cannot read {cities_file}: {e}")
+        return cls(http_client, GeocodingCache(path=path, negative_ttl=negative_ttl), offline)
+
+    async def _lookup(self, city: str) -> Optional[dict]:
+        response = await self.http_client.get(
+            GEOCODING_URL,
+            params={"name": city, "count": 1, "language": "en", "format": "json"},
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        if not data.get("results"):
+            return None
+
+        result = data["results"][0]
+        return {
+            "name": result.get("name", city),
+            "latitude": result["latitude"],
+            "longitude": result["longitude"],
+            "country": result.get("country", "Unknown"),
+            "admin1": result.get("admin1", ""),  # State/region
+            "timezone": result.get("timezone", "UTC"),
+        }
+
+    async def geocode(self, city: str) -> Optional[dict]:
+        """Convert city name to coordinates.
+
+        Returns:
+            dict with keys: name, latitude, longitude, country, admin1, timezone
+            None if city not found
+
+        Raises:
+            UpstreamError: geocoding API unavailable (not the same as "not found")
+        """
+        key = normalize_city(city)
+        if not key:
+            return None
+        if self.offline is not None:
+            location = self.offline.lookup(city, fuzzy=False)
+            if location is not None:
+                self.offline_hits += 1
+                return location
+
+        try:
+            location = await self._geocode_online(key, city)
+        except Exception:
+            location = self._fuzzy_offline(city)
+            if location is None:
+                raise
+            return location
+        return location or self._fuzzy_offline(city)
+
+    def _fuzzy_offline(self, city: str) -> Optional[dict]:
+        location = self.offline.lookup(city) if self.offline is not None else None
+        if location is not None:
+            self.offline_fuzzy_hits += 1
+        return location
+
+    async def _geocode_online(self, key: str, city: str) -> Optional[dict]:
+        found, location = self.cache.get(key)
+        if found:
+            return dict(location) if location else None
+
+        # Concurrent lookups of one city share a task; a waiter being cancelled
+        # only abandons its own wait, the lookup finishes for everyone else.
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.create_task(self._resolve(key, city))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda task: self._lookup_done(key, task))
+        location = await asyncio.shield(pending)
+        return dict(location) if location else None
+
+    async def _resolve(self, key: str, city: str) -> Optional[dict]:
+        location = await self._lookup(city)
+        self.cache.put(key, location)
+        await self.cache.save()
+        return location
+
+    def _lookup_done(self, key: str, task: asyncio.Task):
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every waiter was cancelled
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "offline_hits": self.offline_hits,
+            "offline_fuzzy_hits": self.offline_fuzzy_hits,
+            "offline_index": bool(self.offline),
+        }
+
+    async def close(self):
+        """Persist pending cache entries."""
+        await self.cache.save(force=True)
+        if self.offline is not None:
+            self.offline.close()
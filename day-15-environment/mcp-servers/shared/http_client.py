@@ -0,0 +1,249 @@
+"""Resilient async HTTP client shared by the upstream API clients.
+
+Wraps httpx.AsyncClient with:
+- tuned connection-pool limits and optional HTTP/2 (when `h2` is installed)
+- retries with exponential backoff and full jitter on 5xx responses and
+  transport errors (idempotent methods only)
+- a circuit breaker per upstream host, so a dead API fails fast
+- timing hooks called after every attempt
+
+Transient upstream failures surface as UpstreamError instead of being
+mistaken for "not found" results by the callers.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (optional: pip install httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Every transport-level failure (connect/read/write/pool timeouts, dropped
+# connections, protocol errors): retried, and counted by the circuit breaker
+RETRYABLE_EXCEPTIONS = (httpx.TransportError,)
+
+# hook(method, url, status_code or None, elapsed_seconds, attempt)
+TimingHook = Callable[[str, str, Optional[int], float, int], None]
+
+
+class UpstreamError(Exception):
+    """Raised when an upstream API is unreachable or keeps failing."""
+    pass
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 3
+    backoff_base: float = 0.25
+    backoff_max: float = 4.0
+    retry_statuses: frozenset = frozenset({500, 502, 503, 504})
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures, probes again after `reset_timeout`.
+
+    While half-open exactly one probe request is let through; everyone else
+    is refused until record_success/record_failure resolves it. A probe that
+    ends without a result (release(), or lost for `reset_timeout`) is replaced.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started: Optional[float] = None
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+        if self.probe_started is not None and now - self.probe_started < self.reset_timeout:
+            return False  # a probe is in flight
+        self.probe_started = now
+        return True
+
+    def release(self):
+        """The probe ended without telling whether the host is healthy (e.g. it was cancelled)."""
+        self.probe_started = None
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        self.probe_started = None
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit opened after {self.failures} consecutive failure(s)")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class _HostStats:
+    __slots__ = ("requests", "failures", "total_time")
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.total_time = 0.0
+
+
+class HttpClient:
+    """httpx.AsyncClient with pooling, retries and per-host circuit breakers."""
+
+    def __init__(
+        self,
+        headers: Optional[dict] = None,
+        timeout: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        http2: bool = True,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+    ):
+        self.retry = retry or RetryPolicy()
+        self._breaker_threshold = breaker_threshold
+        self._breaker_reset = breaker_reset
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._stats: dict[str, _HostStats] = {}
+        self._hooks: list[TimingHook] = []
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 10.0)),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=30.0,
+            ),
+            http2=http2 and HTTP2_AVAILABLE,
+        )
+
+    def add_timing_hook(self, hook: TimingHook):
+        self._hooks.append(hook)
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self._breaker_threshold, self._breaker_reset)
+        return breaker
+
+    def _record(self, host: str, method: str, url: str, status: Optional[int], elapsed: float,
+                attempt: int, failed: bool):
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = self._stats[host] = _HostStats()
+        stats.requests += 1
+        stats.total_time += elapsed
+        if failed:
+            stats.failures += 1
+        for hook in self._hooks:
+            try:
+                hook(method, url, status, elapsed, attempt)
+            except Exception as e:
+                logger.debug(f"Timing hook failed: {e}")
+
+    async def request(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Send a request with retries. Raises UpstreamError if the host keeps failing.
+
+        With stream=True the body is left unread; the caller must close the response.
+        """
+        method = method.upper()
+        host = urlsplit(url).netloc
+        breaker = self._breaker(host)
+        attempts = self.retry.attempts if method in IDEMPOTENT_METHODS else 1
+
+        for attempt in range(attempts):
+            if not breaker.allow():
+                raise UpstreamError(f"{host} is temporarily unavailable (too many recent failures)")
+
+            started = time.monotonic()
+            try:
+                response = await self.client.send(self.client.build_request(method, url, **kwargs), stream=stream)
+            except RETRYABLE_EXCEPTIONS as e:
+                self._record(host, method, url, None, time.monotonic() - started, attempt, failed=True)
+                breaker.record_failure()
+                if attempt + 1 >= attempts:
+                    raise UpstreamError(f"{host} unreachable after {attempts} attempt(s): {e!r}") from e
+                logger.info(f"{method} {url} failed ({e!r}), retrying")
+                await asyncio.sleep(self.retry.delay(attempt))
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+
+            elapsed = time.monotonic() - started
+            failed = response.status_code in self.retry.retry_statuses
+            self._record(host, method, url, response.status_code, elapsed, attempt, failed)
+            if not failed:
+                breaker.record_success()
+                return response
+
+            breaker.record_failure()
+            if attempt + 1 >= attempts:
+                await response.aclose()
+                raise UpstreamError(
+                    f"{host} returned HTTP {response.status_code} after {attempts} attempt(s)"
+                )
+            logger.info(f"{method} {url} returned {response.status_code}, retrying")
+            await response.aclose()
+            await asyncio.sleep(self.retry.delay(attempt))
+
+        raise UpstreamError(f"{host}: no attempts made")  # unreachable with attempts >= 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """request() with an unread body, closed on exit. Retries stop once headers arrive."""
+        response = await self.request(method, url, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def stats(self) -> dict:
+        """Per-host request counts, failures, mean latency and circuit state."""
+        return {
+            host: {
+                "requests": s.requests,
+                "failures": s.failures,
+                "avg_ms": round(1000 * s.total_time / s.requests, 1) if s.requests else None,
+                "circuit": self._breaker(host).state,
+            }
+            for host, s in self._stats.items()
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
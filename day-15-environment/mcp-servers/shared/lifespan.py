@@ -0,0 +1,153 @@
+"""Graceful startup/shutdown coordination for MCP servers.
+
+Shutdown runs in two phases:
+  1. drain  — stop accepting new tool calls, wait (with a deadline) for
+              in-flight executions to finish, then run drain hooks such as
+              flushing and closing SSE sessions
+  2. close  — run close hooks: HTTP pools, Telethon connection, etc.
+
+uvicorn only sends the lifespan "shutdown" event after every open
+connection is gone, and SSE streams never end on their own. run_server()
+therefore starts the drain phase as soon as the exit signal arrives; the
+close phase runs from the FastAPI lifespan handler.
+"""
+
+import asyncio
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Union
+
+import uvicorn
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRAIN_TIMEOUT = 10.0
+
+Hook = Callable[[], Union[None, Awaitable[None]]]
+
+
+class ServerShuttingDownError(Exception):
+    """Raised when a tool call arrives after shutdown has started."""
+    pass
+
+
+class LifespanManager:
+    """Tracks in-flight tool calls and runs shutdown hooks in order."""
+
+    def __init__(self, drain_timeout: float = DEFAULT_DRAIN_TIMEOUT):
+        self.drain_timeout = drain_timeout
+        self._accepting = True
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._startup_hooks: list[Hook] = []
+        self._drain_hooks: list[Hook] = []
+        self._close_hooks: list[Hook] = []
+        self._drained = False
+        self._closed = False
+
+    @property
+    def accepting(self) -> bool:
+        return self._accepting
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def on_startup(self, hook: Hook):
+        """Register a hook to run when the app starts."""
+        self._startup_hooks.append(hook)
+
+    def on_drain(self, hook: Hook):
+        """Register a hook to run once in-flight calls have finished."""
+        self._drain_hooks.append(hook)
+
+    def on_close(self, hook: Hook):
+        """Register a hook that releases a resource (client, connection)."""
+        self._close_hooks.append(hook)
+
+    @asynccontextmanager
+    async def track(self):
+        """Wrap a single tool execution so shutdown can wait for it."""
+        if not self._accepting:
+            raise ServerShuttingDownError("Server is shutting down")
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def startup(self):
+        await self._run_hooks(self._startup_hooks)
+
+    async def drain(self):
+        """Stop accepting calls and wait for running ones (idempotent)."""
+        if self._drained:
+            return
+        self._drained = True
+        self._accepting = False
+
+        if self._in_flight:
+            logger.info(f"Draining {self._in_flight} in-flight tool call(s) (deadline {self.drain_timeout:.0f}s)")
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Drain deadline reached with {self._in_flight} tool call(s) still running")
+
+        await self._run_hooks(self._drain_hooks)
+
+    async def close(self):
+        """Drain (if not done yet) and release all resources (idempotent)."""
+        await self.drain()
+        if self._closed:
+            return
+        self._closed = True
+        await self._run_hooks(self._close_hooks)
+        logger.info("Shutdown complete")
+
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI):
+        """FastAPI lifespan handler: FastAPI(lifespan=manager.lifespan)."""
+        await self.startup()
+        yield
+        await self.close()
+
+    @staticmethod
+    async def _run_hooks(hooks: list[Hook]):
+        for hook in hooks:
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                name = getattr(hook, "__qualname__", repr(hook))
+                logger.error(f"Lifespan hook {name} failed: {e}")
+
+
+class _GracefulServer(uvicorn.Server):
+    """uvicorn server that drains the app before waiting on open connections."""
+
+    def __init__(self, config: uvicorn.Config, manager: LifespanManager):
+        super().__init__(config)
+        self.manager = manager
+
+    async def shutdown(self, sockets=None):
+        await self.manager.drain()
+        await super().shutdown(sockets=sockets)
+
+
+def run_server(app: FastAPI, host: str, port: int):
+    """Run the app with uvicorn, using the LifespanManager on app.state.lifespan."""
+    manager: LifespanManager = app.state.lifespan
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        timeout_graceful_shutdown=int(manager.drain_timeout) + 5,
+    )
+    _GracefulServer(config, manager).run()
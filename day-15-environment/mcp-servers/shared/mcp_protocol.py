@@ -11,7 +11,10 @@ All communication uses JSON-RPC 2.0 framing over an SSE transport.
 
 import json
 import logging
-from typing import Any
+from contextlib import nullcontext
+from typing import Any, Optional
+
+from .lifespan import LifespanManager, ServerShuttingDownError
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +34,17 @@ def _response(request_id: Any, result: Any = None, error: dict = None) -> dict:
 class McpProtocolHandler:
     """Stateless handler for incoming MCP JSON-RPC requests."""
 
-    def __init__(self, tools: list, server_name: str, server_version: str = "1.0.0"):
+    def __init__(
+        self,
+        tools: list,
+        server_name: str,
+        server_version: str = "1.0.0",
+        lifespan: Optional[LifespanManager] = None,
+    ):
         self.tools = {t.name: t for t in tools}
         self.server_name = server_name
         self.server_version = server_version
+        self.lifespan = lifespan
 
     async def handle_request(self, request_json: str) -> str:
         """Parse and dispatch a single JSON-RPC request. Returns a JSON string."""
@@ -115,12 +125,19 @@ class McpProtocolHandler:
         logger.info(f"Tool call: {tool_name} | arguments: {json.dumps(arguments)}")
 
         try:
-            tool_result = await tool.execute(arguments)
+            async with self.lifespan.track() if self.lifespan else nullcontext():
+                tool_result = await tool.execute(arguments)
             result = {
                 "content": [{"type": "text", "text": tool_result.content}],
                 "isError": tool_result.is_error,
             }
             return json.dumps(_response(request_id, result=result))
+        except ServerShuttingDownError:
+            logger.info(f"Rejected tool call during shutdown: {tool_name}")
+            return json.dumps(_response(request_id, error={
+                "code": -32000,
+                "message": "Server is shutting down, retry the call",
+            }))
         except Exception as e:
             logger.error(f"Tool execution error ({tool_name}): {e}")
             return json.dumps(_response(request_id, error={
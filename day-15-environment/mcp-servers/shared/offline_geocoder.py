@@ -0,0 +1,225 @@
+"""Offline city geocoder over a GeoNames-format city dump.
+
+The dataset (19 tab-separated columns, see shared/data/cities.tsv) is
+memory-mapped and never parsed as a whole into Python objects. Loading
+builds a compact index: every normalized name and alternate name of a
+city, sorted, stored as one "\\0"-joined string plus parallel arrays of
+row offsets and populations. Lookups bisect that index:
+
+- exact:  all cities with that name, most populous first
+- prefix: names starting with the query, for autocompletion
+- fuzzy:  difflib close matches among names sharing the first letter
+
+The bundled file covers ~200 major cities. Point GEOCODER_CITIES_FILE at
+GeoNames' cities15000.txt (or cities5000/1000) for worldwide coverage.
+"""
+
+import difflib
+import logging
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from typing import Optional
+
+from .geocoding import normalize_city
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_CITIES_FILE = os.path.join(os.path.dirname(__file__), "data", "cities.tsv")
+
+# GeoNames column indexes
+COL_NAME = 1
+COL_ASCIINAME = 2
+COL_ALTNAMES = 3
+COL_LATITUDE = 4
+COL_LONGITUDE = 5
+COL_COUNTRY = 8
+COL_POPULATION = 14
+COL_TIMEZONE = 17
+
+FUZZY_CUTOFF = 0.85
+MAX_PREFIX_SCAN = 5000  # keys examined per prefix query
+
+COUNTRY_NAMES = {
+    "AE": "United Arab Emirates", "AM": "Armenia", "AO": "Angola", "AR": "Argentina", "AT": "Austria",
+    "AU": "Australia", "AZ": "Azerbaijan", "BD": "Bangladesh", "BE": "Belgium", "BG": "Bulgaria",
+    "BR": "Brazil", "BY": "Belarus", "CA": "Canada", "CD": "DR Congo", "CH": "Switzerland",
+    "CL": "Chile", "CN": "China", "CO": "Colombia", "CU": "Cuba", "CY": "Cyprus",
+    "CZ": "Czechia", "DE": "Germany", "DK": "Denmark", "DZ": "Algeria", "EC": "Ecuador",
+    "EE": "Estonia", "EG": "Egypt", "ES": "Spain", "ET": "Ethiopia", "FI": "Finland",
+    "FR": "France", "GB": "United Kingdom", "GE": "Georgia", "GH": "Ghana", "GR": "Greece",
+    "HK": "Hong Kong", "HR": "Croatia", "HU": "Hungary", "ID": "Indonesia", "IE": "Ireland",
+    "IL": "Israel", "IN": "India", "IQ": "Iraq", "IR": "Iran", "IS": "Iceland",
+    "IT": "Italy", "JO": "Jordan", "JP": "Japan", "KE": "Kenya", "KG": "Kyrgyzstan",
+    "KH": "Cambodia", "KR": "South Korea", "KW": "Kuwait", "KZ": "Kazakhstan", "LB": "Lebanon",
+    "LK": "Sri Lanka", "LT": "Lithuania", "LU": "Luxembourg", "LV": "Latvia", "MA": "Morocco",
+    "MC": "Monaco", "MD": "Moldova", "MM": "Myanmar", "MN": "Mongolia", "MT": "Malta",
+    "MX": "Mexico", "MY": "Malaysia", "NG": "Nigeria", "NL": "Netherlands", "NO": "Norway",
+    "NP": "Nepal", "NZ": "New Zealand", "OM": "Oman", "PA": "Panama", "PE": "Peru",
+    "PH": "Philippines", "PK": "Pakistan", "PL": "Poland", "PR": "Puerto Rico", "PT": "Portugal",
+    "QA": "Qatar", "RO": "Romania", "RS": "Serbia", "RU": "Russia", "SA": "Saudi Arabia",
+    "SE": "Sweden", "SG": "Singapore", "SI": "Slovenia", "SK": "Slovakia", "SN": "Senegal",
+    "TH": "Thailand", "TJ": "Tajikistan", "TM": "Turkmenistan", "TN": "Tunisia", "TR": "Turkey",
+    "TW": "Taiwan", "TZ": "Tanzania", "UA": "Ukraine", "UG": "Uganda", "US": "United States",
+    "UY": "Uruguay", "UZ": "Uzbekistan", "VE": "Venezuela", "VN": "Vietnam", "ZA": "South Africa",
+}
+
+
+class _KeyView:
+    """Sequence view over the "\\0"-joined sorted keys, for bisect."""
+
+    __slots__ = ("blob", "starts")
+
+    def __init__(self, blob: str, starts: array):
+        self.blob = blob
+        self.starts = starts
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> str:
+        start = self.starts[i]
+        end = self.starts[i + 1] - 1 if i + 1 < len(self.starts) else len(self.blob)
+        return self.blob[start:end]
+
+
+class OfflineGeocoder:
+    def __init__(self, path: str = BUNDLED_CITIES_FILE):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._build_index()
+
+    def _build_index(self):
+        entries = []
+        offset = 0
+        for raw in iter(self._mm.readline, b""):
+            row_offset = offset
+            offset += len(raw)
+            if raw.startswith(b"#"):
+                continue
+            cols = raw.rstrip(b"\r\n").decode("utf-8", errors="replace").split("\t")
+            if len(cols) <= COL_TIMEZONE:
+                continue
+            try:
+                population = int(cols[COL_POPULATION] or 0)
+            except ValueError:
+                population = 0
+            names = {cols[COL_NAME], cols[COL_ASCIINAME]}
+            names.update(n for n in cols[COL_ALTNAMES].split(",") if len(n) > 1 and not n.startswith("http"))
+            for name in names:
+                key = normalize_city(name)
+                if key:
+                    entries.append((key, -population, row_offset))
+
+        entries.sort()
+        keys = [key for key, _, _ in entries]
+        starts = array("L")
+        position = 0
+        for key in keys:
+            starts.append(position)
+            position += len(key) + 1
+        self._keys = _KeyView("\0".join(keys), starts)
+        self._offsets = array("L", (o for _, _, o in entries))
+        self._populations = array("Q", (-p for _, p, _ in entries))
+        logger.info(f"Offline geocoder: {len(entries)} names from {self.path}")
+
+    def _row(self, offset: int) -> dict:
+        end = self._mm.find(b"\n", offset)
+        cols = self._mm[offset:end if end >= 0 else len(self._mm)].decode("utf-8", errors="replace").split("\t")
+        country_code = cols[COL_COUNTRY]
+        return {
+            "name": cols[COL_NAME],
+            "latitude": float(cols[COL_LATITUDE]),
+            "longitude": float(cols[COL_LONGITUDE]),
+            "country": COUNTRY_NAMES.get(country_code, country_code or "Unknown"),
+            "country_code": country_code,
+            "admin1": "",
+            "timezone": cols[COL_TIMEZONE] or "UTC",
+            "population": int(cols[COL_POPULATION] or 0),
+        }
+
+    @staticmethod
+    def _matches_qualifier(row: dict, qualifier: Optional[str]) -> bool:
+        if not qualifier:
+            return True
+        return qualifier in (row["country_code"].casefold(), normalize_city(row["country"]))
+
+    def _exact(self, key: str) -> list[int]:
+        """Row offsets of cities named `key`, most populous first (index order)."""
+        i = bisect_left(self._keys, key)
+        found = []
+        while i < len(self._keys) and self._keys[i] == key:
+            if self._offsets[i] not in found:
+                found.append(self._offsets[i])
+            i += 1
+        return found
+
+    def _prefix(self, key: str) -> list[tuple[int, int]]:
+        """(population, row offset) of names starting with `key`."""
+        i = bisect_left(self._keys, key)
+        found = []
+        end = min(len(self._keys), i + MAX_PREFIX_SCAN)
+        while i < end:
+            if not self._keys[i].startswith(key):
+                break
+            found.append((self._populations[i], self._offsets[i]))
+            i += 1
+        return found
+
+    def _first_match(self, offsets, qualifier: Optional[str]) -> Optional[dict]:
+        for offset in offsets:
+            row = self._row(offset)
+            if self._matches_qualifier(row, qualifier):
+                return row
+        return None
+
+    def lookup(self, city: str, fuzzy: bool = True) -> Optional[dict]:
+        """Best match for a city name, optionally "City, Country" (name or ISO code).
+
+        Exact name matches are preferred, most populous first; otherwise the
+        closest fuzzy match (typos, missing accents) if `fuzzy` is set.
+        Returns None if nothing matches confidently.
+        """
+        name, _, qualifier = normalize_city(city).partition(",")
+        name, qualifier = name.strip(), qualifier.strip() or None
+        if not name:
+            return None
+
+        row = self._first_match(self._exact(name), qualifier)
+        if row or not fuzzy or len(name) < 4:
+            return row
+
+        # Fuzzy: candidates share the first letter and roughly the length, which keeps difflib's work small
+        first = name[0]
+        lo = bisect_left(self._keys, first)
+        hi = bisect_left(self._keys, chr(ord(first) + 1))
+        candidates = {
+            key for key in (self._keys[i] for i in range(lo, hi)) if abs(len(key) - len(name)) <= 2
+        }
+        for match in difflib.get_close_matches(name, candidates, n=3, cutoff=FUZZY_CUTOFF):
+            row = self._first_match(self._exact(match), qualifier)
+            if row:
+                return row
+        return None
+
+    def search(self, prefix: str, limit: int = 10) -> list[dict]:
+        """Cities with a name starting with `prefix`, most populous first."""
+        key = normalize_city(prefix)
+        if not key:
+            return []
+        seen = set()
+        results = []
+        for _, offset in sorted(self._prefix(key), reverse=True):
+            if offset in seen:
+                continue
+            seen.add(offset)
+            results.append(self._row(offset))
+            if len(results) >= limit:
+                break
+        return results
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
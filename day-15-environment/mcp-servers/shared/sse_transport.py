@@ -9,6 +9,9 @@ Session lifecycle:
   2. Client POSTs to /message?sessionId=<id>  →  server processes request
   3. Response pushed into session queue  →  streamed back via SSE
   4. Client disconnects  →  session cleaned up
+
+On shutdown close_all_sessions() pushes a stop signal behind any queued
+responses and waits (bounded) for the streams to deliver them.
 """
 
 import asyncio
@@ -28,6 +31,7 @@ class SseSession:
     def __init__(self, session_id: str):
         self.id = session_id
         self.queue: asyncio.Queue[str] = asyncio.Queue()
+        self.closed = asyncio.Event()
 
 
 class SseTransport:
@@ -63,6 +67,7 @@ class SseTransport:
                 except Exception as e:
                     logger.debug(f"SSE session error ({session_id}): {e}")
                 finally:
+                    session.closed.set()
                     self.sessions.pop(session_id, None)
                     logger.info(f"SSE session closed: {session_id}")
 
@@ -90,7 +95,16 @@ class SseTransport:
             request_json = body.decode("utf-8")
             logger.debug(f"Message for {session_id}: {request_json}")
 
-            response_json = await self.protocol_handler.handle_request(request_json)
+            # Cancel the call if the client drops its SSE stream before it finishes
+            handler = asyncio.create_task(self.protocol_handler.handle_request(request_json))
+            closed = asyncio.create_task(session.closed.wait())
+            await asyncio.wait({handler, closed}, return_when=asyncio.FIRST_COMPLETED)
+            closed.cancel()
+            if not handler.done():
+                handler.cancel()
+                logger.info(f"Session {session_id} closed, cancelled in-flight request")
+                return JSONResponse({"error": "Session closed"}, status_code=410)
+            response_json = handler.result()
 
             # Push response to SSE stream
             await session.queue.put(response_json)
@@ -101,7 +115,17 @@ class SseTransport:
     def get_active_session_count(self) -> int:
         return len(self.sessions)
 
-    async def close_all_sessions(self):
-        for session in self.sessions.values():
-            await session.queue.put("")  # signal stop
+    async def close_all_sessions(self, flush_timeout: float = 5.0):
+        sessions = list(self.sessions.values())
+        for session in sessions:
+            await session.queue.put("")  # signal stop, after any pending responses
+
+        if sessions:
+            waiters = [asyncio.create_task(s.closed.wait()) for s in sessions]
+            done, pending = await asyncio.wait(waiters, timeout=flush_timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"{len(pending)} SSE session(s) did not flush within {flush_timeout:.0f}s")
+            logger.info(f"Closed {len(done)} SSE session(s)")
         self.sessions.clear()
@@ -23,12 +23,13 @@ import argparse
 import logging
 import sys
 
-import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from shared import McpProtocolHandler, SseTransport
+from shared import (
+    ApiKeyAuth, ApiKeyAuthMiddleware, LifespanManager, McpProtocolHandler,
+    SseTransport, run_server,
+)
 from .config import load_config
 from .telegram_client import TelegramChannelClient
 from .tools import get_all_tools
@@ -56,14 +57,23 @@ def parse_args() -> argparse.Namespace:
 
 def build_app(config, telegram_client: TelegramChannelClient) -> FastAPI:
     tools = get_all_tools(telegram_client)
-    protocol_handler = McpProtocolHandler(tools, server_name=SERVER_NAME, server_version=SERVER_VERSION)
+    lifespan = LifespanManager()
+    protocol_handler = McpProtocolHandler(
+        tools, server_name=SERVER_NAME, server_version=SERVER_VERSION, lifespan=lifespan
+    )
     sse_transport = SseTransport(protocol_handler)
 
+    # Shutdown order: stop new calls → drain in-flight → flush SSE → close upstream clients
+    lifespan.on_drain(sse_transport.close_all_sessions)
+    lifespan.on_close(telegram_client.disconnect)
+
     app = FastAPI(
         title="Telegram MCP Server",
         description="MCP server for reading public Telegram channels via SSE transport.",
         version=SERVER_VERSION,
+        lifespan=lifespan.lifespan,
     )
+    app.state.lifespan = lifespan
 
     # CORS — allow any origin so the Kotlin app (or any client) can connect
     app.add_middleware(
@@ -73,22 +83,10 @@ def build_app(config, telegram_client: TelegramChannelClient) -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
     )
 
-    # API-key authentication middleware (only when auth is enabled)
-    if config.auth.enabled:
-        api_key = config.auth.api_key
-        public_paths = {"/health", "/", "/docs", "/redoc", "/openapi.json"}
-
-        @app.middleware("http")
-        async def auth_middleware(request: Request, call_next):
-            if request.url.path in public_paths:
-                return await call_next(request)
-            key = request.headers.get("x-api-key") or request.query_params.get("api_key")
-            if key != api_key:
-                return JSONResponse(
-                    {"error": "Unauthorized: missing or invalid X-API-Key header"},
-                    status_code=401,
-                )
-            return await call_next(request)
+    # API-key authentication + per-key rate limiting (only when auth is enabled)
+    auth = ApiKeyAuth.from_env(config.auth.api_key) if config.auth.enabled else None
+    if auth:
+        app.add_middleware(ApiKeyAuthMiddleware, auth=auth)
 
     # MCP SSE transport routes (/sse and /message)
     sse_transport.setup_routes(app)
@@ -98,10 +96,12 @@ def build_app(config, telegram_client: TelegramChannelClient) -> FastAPI:
     @app.get("/health")
     async def health():
         return {
-            "status": "ok",
+            "status": "ok" if lifespan.accepting else "draining",
+            "in_flight_calls": lifespan.in_flight,
             "tools_count": len(tools),
             "active_sessions": sse_transport.get_active_session_count(),
             "auth_enabled": config.auth.enabled,
+            "auth": auth.stats() if auth else None,
             "session_file": config.telegram.session_file,
         }
 
@@ -166,7 +166,7 @@ def main():
     )
     app = build_app(config, telegram_client)
 
-    uvicorn.run(app, host=config.server.host, port=config.server.port)
+    run_server(app, config.server.host, config.server.port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+"""Working-hour windows as UTC intervals, and their intersection.
+
+Each participant's working hours are expanded day by day in their own
+zone and converted to UTC instants, so DST changes (and zones on either
+side of the date line) are handled by zoneinfo rather than by offset
+arithmetic. The overlap of N participants is the running intersection of
+their sorted interval lists, one linear merge per participant.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+Interval = tuple[datetime, datetime]  # [start, end) in UTC
+
+WORKDAYS = frozenset(range(5))  # Monday-Friday
+
+
+def parse_hhmm(value: str) -> time:
+    """'9', '09:00' or '17:30' → time."""
+    hours, _, minutes = value.strip().partition(":")
+    return time(int(hours), int(minutes or 0))
+
+
+def working_intervals(
+    zone: ZoneInfo,
+    first: date,
+    last: date,
+    start: time = time(9),
+    end: time = time(17),
+    weekdays: Iterable[int] = WORKDAYS,
+) -> list[Interval]:
+    """UTC intervals of local working hours on each local date in [first, last].
+
+    An `end` at or before `start` means the shift runs past midnight.
+    """
+    weekdays = frozenset(weekdays)
+    intervals = []
+    day = first
+    while day <= last:
+        if day.weekday() in weekdays:
+            local_start = datetime.combine(day, start, tzinfo=zone)
+            end_day = day + timedelta(days=1) if end <= start else day
+            local_end = datetime.combine(end_day, end, tzinfo=zone)
+            intervals.append((local_start.astimezone(timezone.utc), local_end.astimezone(timezone.utc)))
+        day += timedelta(days=1)
+    return intervals
+
+
+def intersect(a: list[Interval], b: list[Interval]) -> list[Interval]:
+    """Intersection of two sorted, non-overlapping interval lists."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        lo = max(a[i][0], b[j][0])
+        hi = min(a[i][1], b[j][1])
+        if lo < hi:
+            result.append((lo, hi))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def overlap(schedules: list[list[Interval]], min_duration: timedelta = timedelta(0)) -> list[Interval]:
+    """Windows in which every schedule is working, at least `min_duration` long."""
+    if not schedules:
+        return []
+    common = schedules[0]
+    for schedule in schedules[1:]:
+        common = intersect(common, schedule)
+        if not common:
+            break
+    return [(lo, hi) for lo, hi in common if hi - lo >= min_duration]
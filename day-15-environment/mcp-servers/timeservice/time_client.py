@@ -6,21 +6,24 @@ For city-to-timezone mapping, uses timezonefinder with geocoding.
 
 import logging
 from datetime import datetime
-from zoneinfo import ZoneInfo, available_timezones
+from zoneinfo import ZoneInfo
 from typing import Optional
-import httpx
 
-logger = logging.getLogger(__name__)
+from shared import Geocoder, HttpClient
+from .tz_index import TimezoneIndex
+from .tzif import TransitionTables
 
-GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
+logger = logging.getLogger(__name__)
 
 
 class TimeClient:
     """Client for time operations with timezone support."""
 
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
-        self._available_timezones = available_timezones()
+        self.http_client = HttpClient(timeout=30.0)
+        self.geocoder = Geocoder.from_env(self.http_client)
+        self.timezones = TimezoneIndex()
+        self.transitions = TransitionTables()
 
     def get_current_utc(self) -> dict:
         """Get current UTC time.
@@ -47,18 +50,27 @@ class TimeClient:
         """Get current time in specified timezone.
 
         Args:
-            timezone: IANA timezone name (e.g., "America/New_York", "Europe/Moscow")
+            timezone: IANA timezone name (e.g., "America/New_York", "Europe/Moscow"),
+                a common abbreviation or alias ("EST", "MSK", "Kyiv"), or a near miss
+                ("Europe/Moskow"); see TimezoneIndex.resolve
 
         Returns:
-            dict with time information or None if timezone is invalid
+            dict with time information (plus "requested" and "match" when the
+            name was not an exact IANA name) or None if timezone is unknown
         """
+        resolved = self.timezones.resolve(timezone)
+        if resolved is None:
+            logger.error(f"Invalid timezone '{timezone}'")
+            return None
+        name, match = resolved
+
         try:
-            tz = ZoneInfo(timezone)
+            tz = self.timezones.zone(name)
             now = datetime.now(tz)
 
-            return {
+            info = {
                 "datetime": now.isoformat(),
-                "timezone": timezone,
+                "timezone": name,
                 "timestamp": int(now.timestamp()),
                 "year": now.year,
                 "month": now.month,
@@ -70,40 +82,25 @@ class TimeClient:
                 "formatted": now.strftime("%Y-%m-%d %H:%M:%S %Z"),
                 "utc_offset": now.strftime("%z"),
             }
+            if match != "exact":
+                info["requested"] = timezone
+                info["match"] = match
+            return info
         except Exception as e:
             logger.error(f"Invalid timezone '{timezone}': {e}")
             return None
 
     async def geocode(self, city: str) -> Optional[dict]:
-        """Convert city name to coordinates.
+        """Convert city name to coordinates (cached, shared with the other servers).
 
         Returns:
             dict with keys: name, latitude, longitude, country, timezone
             None if city not found
-        """
-        try:
-            response = await self.http_client.get(
-                GEOCODING_URL,
-                params={"name": city, "count": 1, "language": "en", "format": "json"},
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            if not data.get("results"):
-                return None
 
-            result = data["results"][0]
-            return {
-                "name": result.get("name", city),
-                "latitude": result["latitude"],
-                "longitude": result["longitude"],
-                "country": result.get("country", "Unknown"),
-                "admin1": result.get("admin1", ""),
-                "timezone": result.get("timezone", "UTC"),
-            }
-        except Exception as e:
-            logger.error(f"Geocoding error for '{city}': {e}")
-            return None
+        Raises:
+            UpstreamError: geocoding API unavailable (not the same as "not found")
+        """
+        return await self.geocoder.geocode(city)
 
     async def get_time_in_city(self, city: str) -> Optional[dict]:
         """Get current time for a city using geocoding.
@@ -136,6 +133,56 @@ class TimeClient:
 
         return time_info
 
+    async def resolve_place(self, place: str) -> Optional[dict]:
+        """Resolve a timezone name/alias or a city to a zone.
+
+        Exact names, aliases and city parts of zone names are answered by the
+        timezone index, misspelled "Area/City" names are matched fuzzily, and
+        anything else is geocoded as a city.
+
+        Returns:
+            dict with "label" (display name) and "timezone", or None
+
+        Raises:
+            UpstreamError: geocoding API unavailable
+        """
+        resolved = self.timezones.resolve(place, fuzzy=False)
+        if resolved is None and "/" in place:
+            resolved = self.timezones.resolve(place)
+        if resolved is None:
+            location = await self.geocode(place)
+            if not location:
+                return None
+            return {"label": f"{location['name']}, {location['country']}", "timezone": location["timezone"]}
+        name, match = resolved
+        return {"label": name if match == "fuzzy" else place.strip(), "timezone": name}
+
+    def get_transitions(
+        self, timezone: str, start: int, end: int, instants: Optional[list[int]] = None
+    ) -> Optional[dict]:
+        """UTC-offset changes of a zone in [start, end) and the offsets at given instants.
+
+        Args:
+            timezone: IANA timezone name
+            start, end: range as Unix timestamps
+            instants: optional Unix timestamps to report the offset at
+
+        Returns:
+            dict with "transitions" [(timestamp, before, after)], "offsets"
+            [(timestamp, type)] and "current" type, where a type is
+            (utc_offset_seconds, is_dst, abbreviation); None if no tzdata file
+        """
+        table = self.transitions.get(timezone)
+        if table is None:
+            return None
+        now = int(datetime.now(ZoneInfo("UTC")).timestamp())
+        return {
+            "timezone": timezone,
+            "current": table.at(now),
+            "transitions": table.between(start, end),
+            "offsets": [(ts, table.at(ts)) for ts in instants or []],
+        }
+
     def list_timezones(self, filter_prefix: str = None) -> list[str]:
         """List available IANA timezones.
 
@@ -146,10 +193,25 @@ class TimeClient:
             Sorted list of timezone names
         """
         if filter_prefix:
-            filtered = [tz for tz in self._available_timezones if tz.startswith(filter_prefix)]
-            return sorted(filtered)
-        return sorted(self._available_timezones)
+            return self.timezones.starting_with(filter_prefix)
+        return list(self.timezones.names)
+
+    def search_timezones(self, query: str, limit: int = 20) -> dict:
+        """Find timezones by prefix of the name or city part, with fuzzy suggestions.
+
+        Returns:
+            dict with "matches" (prefix hits), "suggestions" (near misses, only
+            when there are no prefix hits) and "resolved" (best single match or None)
+        """
+        matches = self.timezones.search(query, limit=limit)
+        resolved = self.timezones.resolve(query)
+        return {
+            "matches": matches,
+            "suggestions": [] if matches else self.timezones.suggest(query),
+            "resolved": resolved[0] if resolved else None,
+        }
 
     async def close(self):
-        """Close HTTP client."""
+        """Persist the geocoding cache and close HTTP client."""
+        await self.geocoder.close()
         await self.http_client.aclose()
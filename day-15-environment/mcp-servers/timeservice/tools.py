@@ -4,14 +4,49 @@ Tools for getting time information:
 - get_current_time: Current UTC time
 - get_time_in_timezone: Time in a specific IANA timezone
 - get_time_in_city: Time in a city (auto-detects timezone)
+- search_timezones: Find timezone names by prefix, alias or near miss
+- world_clock: Current time in many places plus their common working hours
+- get_timezone_transitions: DST changes and UTC offsets over a date range
 """
 
+import asyncio
 import logging
+from datetime import date, datetime, timedelta, timezone
+
 from shared import ToolResult, BaseTool
+from .scheduling import WORKDAYS, overlap, parse_hhmm, working_intervals
 from .time_client import TimeClient
 
 logger = logging.getLogger(__name__)
 
+# world_clock limits
+WORLD_CLOCK_MAX_PLACES = 20
+WORLD_CLOCK_DEFAULT_DAYS = 7
+WORLD_CLOCK_MAX_DAYS = 31
+
+# get_timezone_transitions limits
+TRANSITIONS_MAX_YEARS = 50
+TRANSITIONS_MAX_INSTANTS = 100
+
+
+def format_offset(seconds: int) -> str:
+    sign = "-" if seconds < 0 else "+"
+    minutes = abs(seconds) // 60
+    return f"UTC{sign}{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_duration(delta: timedelta) -> str:
+    minutes = int(delta.total_seconds() // 60)
+    return f"{minutes // 60}h{minutes % 60:02d}"
+
+
+def year_end(first: date) -> date:
+    """Last day of the year-long range starting at `first` (2028-02-29 → 2029-02-28)."""
+    try:
+        return first.replace(year=first.year + 1) - timedelta(days=1)
+    except ValueError:  # February 29 without one next year
+        return date(first.year + 1, 2, 28)
+
 
 class TimeTool(BaseTool):
     """Base class for TimeService MCP tools."""
@@ -71,7 +106,8 @@ class GetTimeInTimezoneTool(TimeTool):
     description = (
         "Get current time in a specific IANA timezone. "
         "Supports all standard timezone names like 'America/New_York', 'Europe/Moscow', "
-        "'Asia/Tokyo', etc. Returns local time with UTC offset."
+        "'Asia/Tokyo', etc., common abbreviations and aliases ('EST', 'MSK', 'Kyiv') "
+        "and small misspellings. Returns local time with UTC offset."
     )
     input_schema = {
         "type": "object",
@@ -100,9 +136,16 @@ class GetTimeInTimezoneTool(TimeTool):
                 )
 
             lines = [
-                f"Current Time in {timezone}",
+                f"Current Time in {time_info['timezone']}",
                 "=" * 50,
                 "",
+            ]
+            if time_info.get("match"):
+                lines.extend([
+                    f"ℹ️  Interpreted '{timezone}' as {time_info['timezone']} ({time_info['match']} match)",
+                    "",
+                ])
+            lines.extend([
                 f"🕐 Local Time: {time_info['formatted']}",
                 f"📅 Date: {time_info['year']}-{time_info['month']:02d}-{time_info['day']:02d}",
                 f"🔢 Components: {time_info['hour']:02d}:{time_info['minute']:02d}:{time_info['second']:02d}",
@@ -111,7 +154,7 @@ class GetTimeInTimezoneTool(TimeTool):
                 f"⏰ UTC Offset: {time_info['utc_offset']}",
                 f"⏱️  Unix Timestamp: {time_info['timestamp']}",
                 f"🌐 ISO 8601: {time_info['datetime']}",
-            ]
+            ])
 
             return ToolResult("\n".join(lines))
 
@@ -188,6 +231,306 @@ class GetTimeInCityTool(TimeTool):
             return ToolResult(f"Failed to get time for city '{city}': {e}", is_error=True)
 
 
+# ---------------------------------------------------------------------------
+# Tool: search_timezones
+# ---------------------------------------------------------------------------
+
+class SearchTimezonesTool(TimeTool):
+    name = "search_timezones"
+    description = (
+        "Find IANA timezone names. Matches the start of the full name ('America/Arg') or of the "
+        "city part ('Buenos'), resolves abbreviations and aliases ('PST', 'Kyiv') and suggests "
+        "the closest names for misspellings ('Europe/Moskow')."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Prefix, abbreviation or approximate name (e.g., 'Europe/', 'Sao', 'MSK')",
+            },
+            "limit": {"type": "integer", "description": "Maximum names to return (default: 20)"},
+        },
+        "required": ["query"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        query = arguments.get("query", "").strip()
+        if not query:
+            return ToolResult("Missing required parameter: query", is_error=True)
+        try:
+            limit = max(1, min(int(arguments.get("limit") or 20), 600))
+        except (TypeError, ValueError):
+            limit = 20
+
+        try:
+            result = self.client.search_timezones(query, limit=limit)
+            names = result["matches"] or result["suggestions"]
+            if not names and not result["resolved"]:
+                return ToolResult(f"No timezones match '{query}'", is_error=True)
+
+            lines = [f"Timezones matching '{query}'", "=" * 50, ""]
+            if result["resolved"]:
+                lines.extend([f"🎯 Best match: {result['resolved']}", ""])
+            if not result["matches"] and names:
+                lines.append("Did you mean:")
+            lines.extend(f"  {name}" for name in names)
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"SearchTimezonesTool error: {e}")
+            return ToolResult(f"Failed to search timezones for '{query}': {e}", is_error=True)
+
+
+# ---------------------------------------------------------------------------
+# Tool: world_clock
+# ---------------------------------------------------------------------------
+
+class WorldClockTool(TimeTool):
+    name = "world_clock"
+    description = (
+        f"Current local time for up to {WORLD_CLOCK_MAX_PLACES} cities or timezones in one call, plus "
+        "the windows in a date range when everyone is within working hours (DST-aware, computed exactly "
+        "in UTC). Use this for scheduling across teams instead of per-zone calls and manual arithmetic. "
+        "Participants may override the default working hours."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "participants": {
+                "type": "array",
+                "items": {
+                    "anyOf": [
+                        {"type": "string"},
+                        {
+                            "type": "object",
+                            "properties": {
+                                "place": {"type": "string"},
+                                "work_start": {"type": "string"},
+                                "work_end": {"type": "string"},
+                            },
+                            "required": ["place"],
+                        },
+                    ],
+                },
+                "description": "Cities or timezones (e.g., ['London', 'America/New_York', 'Tokyo']) or "
+                               "objects like {'place': 'Tokyo', 'work_start': '10:00', 'work_end': '19:00'}",
+            },
+            "start_date": {"type": "string", "description": "First date, YYYY-MM-DD (default: today)"},
+            "end_date": {
+                "type": "string",
+                "description": f"Last date, YYYY-MM-DD (default: {WORLD_CLOCK_DEFAULT_DAYS} days from start_date)",
+            },
+            "work_start": {"type": "string", "description": "Default local start of working hours (default: 09:00)"},
+            "work_end": {"type": "string", "description": "Default local end of working hours (default: 17:00)"},
+            "include_weekends": {"type": "boolean", "description": "Count Saturday and Sunday (default: false)"},
+            "min_minutes": {"type": "integer", "description": "Shortest window to report (default: 30)"},
+        },
+        "required": ["participants"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        participants = arguments.get("participants") or []
+        if isinstance(participants, str):
+            participants = participants.split(",")
+        entries = [p if isinstance(p, dict) else {"place": str(p)} for p in participants]
+        entries = [e for e in entries if str(e.get("place", "")).strip()]
+        if not entries:
+            return ToolResult("Missing required parameter: participants", is_error=True)
+        if len(entries) > WORLD_CLOCK_MAX_PLACES:
+            return ToolResult(f"Too many participants: {len(entries)} (max {WORLD_CLOCK_MAX_PLACES})", is_error=True)
+
+        try:
+            first = date.fromisoformat(str(arguments["start_date"])) if arguments.get("start_date") else date.today()
+            last = (
+                date.fromisoformat(str(arguments["end_date"])) if arguments.get("end_date")
+                else first + timedelta(days=WORLD_CLOCK_DEFAULT_DAYS - 1)
+            )
+            default_start = parse_hhmm(str(arguments.get("work_start") or "09:00"))
+            default_end = parse_hhmm(str(arguments.get("work_end") or "17:00"))
+            hours = [
+                (
+                    parse_hhmm(str(e["work_start"])) if e.get("work_start") else default_start,
+                    parse_hhmm(str(e["work_end"])) if e.get("work_end") else default_end,
+                )
+                for e in entries
+            ]
+        except ValueError as e:
+            return ToolResult(f"Invalid date or time: {e}. Use YYYY-MM-DD and HH:MM.", is_error=True)
+        if last < first:
+            return ToolResult("end_date must not be before start_date", is_error=True)
+        if (last - first).days + 1 > WORLD_CLOCK_MAX_DAYS:
+            return ToolResult(f"Date range too long (max {WORLD_CLOCK_MAX_DAYS} days)", is_error=True)
+        weekdays = range(7) if arguments.get("include_weekends") else WORKDAYS
+        try:
+            min_duration = timedelta(minutes=max(0, int(arguments.get("min_minutes", 30))))
+        except (TypeError, ValueError):
+            return ToolResult(
+                f"Invalid min_minutes: {arguments.get('min_minutes')!r} (expected an integer)", is_error=True
+            )
+
+        try:
+            places = await asyncio.gather(
+                *(self.client.resolve_place(str(e["place"])) for e in entries), return_exceptions=True
+            )
+            errors = [f"{e['place']}: {p}" for e, p in zip(entries, places) if isinstance(p, Exception)]
+            if errors:
+                return ToolResult(f"Failed to look up: {'; '.join(errors)}", is_error=True)
+            failed = [str(e["place"]) for e, p in zip(entries, places) if not p]
+            if failed:
+                return ToolResult(
+                    f"Could not resolve: {', '.join(failed)}. Use city names or IANA timezones.",
+                    is_error=True,
+                )
+
+            zones = [self.client.timezones.zone(p["timezone"]) for p in places]
+            now = datetime.now(timezone.utc)
+            lines = ["World Clock", "=" * 50, ""]
+            for place, zone in zip(places, zones):
+                local = now.astimezone(zone)
+                offset = local.strftime("%z")
+                lines.append(
+                    f"🕐 {place['label']} ({place['timezone']}): "
+                    f"{local:%Y-%m-%d %H:%M %a} (UTC{offset[:3]}:{offset[3:]})"
+                )
+
+            schedules = [
+                working_intervals(zone, first, last, start, end, weekdays)
+                for zone, (start, end) in zip(zones, hours)
+            ]
+            windows = overlap(schedules, min_duration)
+
+            same_hours = len(set(hours)) == 1
+            hours_note = f"{hours[0][0]:%H:%M}–{hours[0][1]:%H:%M} local" if same_hours else "per-participant hours"
+            days_note = "all days" if arguments.get("include_weekends") else "Mon–Fri"
+            lines.extend(["", f"🤝 Common working hours {first} … {last} ({hours_note}, {days_note}):"])
+            if not windows:
+                lines.append("  None — no time when everyone is within working hours.")
+            for lo, hi in windows:
+                lines.append(f"  • {lo:%a %Y-%m-%d %H:%M}–{hi:%H:%M} UTC ({format_duration(hi - lo)})")
+                local_spans = []
+                for place, zone in zip(places, zones):
+                    local_lo, local_hi = lo.astimezone(zone), hi.astimezone(zone)
+                    local_spans.append(f"{place['label']} {local_lo:%a %H:%M}–{local_hi:%H:%M}")
+                lines.append("      " + " · ".join(local_spans))
+
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"WorldClockTool error: {e}")
+            return ToolResult(f"Failed to build world clock: {e}", is_error=True)
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_timezone_transitions
+# ---------------------------------------------------------------------------
+
+class GetTimezoneTransitionsTool(TimeTool):
+    name = "get_timezone_transitions"
+    description = (
+        "Get the DST changes (and any other UTC offset changes) of a timezone or city over a date range, "
+        "with the local wall-clock jump of each change, and optionally the UTC offset in force at given "
+        "instants. Use this when planning future events across DST boundaries."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "timezone": {
+                "type": "string",
+                "description": "IANA timezone, alias or city (e.g., 'Europe/Berlin', 'PST', 'Sydney')",
+            },
+            "start_date": {"type": "string", "description": "First date, YYYY-MM-DD (default: today)"},
+            "end_date": {"type": "string", "description": "Last date, YYYY-MM-DD (default: one year after start_date)"},
+            "instants": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "ISO 8601 date-times to report the offset at (without an offset they are read as UTC)",
+            },
+        },
+        "required": ["timezone"],
+    }
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        query = arguments.get("timezone", "").strip()
+        if not query:
+            return ToolResult("Missing required parameter: timezone", is_error=True)
+
+        try:
+            first = date.fromisoformat(arguments["start_date"]) if arguments.get("start_date") else date.today()
+            last = (
+                date.fromisoformat(arguments["end_date"]) if arguments.get("end_date")
+                else year_end(first)
+            )
+            instants = []
+            for value in (arguments.get("instants") or [])[:TRANSITIONS_MAX_INSTANTS]:
+                moment = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+                if moment.tzinfo is None:
+                    moment = moment.replace(tzinfo=timezone.utc)
+                instants.append(int(moment.timestamp()))
+        except ValueError as e:
+            return ToolResult(f"Invalid date: {e}. Use YYYY-MM-DD and ISO 8601 date-times.", is_error=True)
+        if last < first:
+            return ToolResult("end_date must not be before start_date", is_error=True)
+        if last.year - first.year > TRANSITIONS_MAX_YEARS:
+            return ToolResult(f"Date range too long (max {TRANSITIONS_MAX_YEARS} years)", is_error=True)
+
+        try:
+            place = await self.client.resolve_place(query)
+            if not place:
+                return ToolResult(
+                    f"Unknown timezone or city: '{query}'. Use IANA names like 'Europe/Berlin'.",
+                    is_error=True,
+                )
+            zone_name = place["timezone"]
+            # Range bounds are local midnights in the zone itself
+            zone = self.client.timezones.zone(zone_name)
+            start = int(datetime.combine(first, datetime.min.time(), tzinfo=zone).timestamp())
+            end = int(datetime.combine(last + timedelta(days=1), datetime.min.time(), tzinfo=zone).timestamp())
+            result = self.client.get_transitions(zone_name, start, end, instants)
+            if result is None:
+                return ToolResult(f"No tzdata available for '{zone_name}'", is_error=True)
+
+            offset, is_dst, abbr = result["current"]
+            lines = [
+                f"UTC Offset Changes in {zone_name}" + (f" ({place['label']})" if place["label"] != zone_name else ""),
+                "=" * 50,
+                "",
+                f"⏰ Now: {format_offset(offset)} {abbr}" + (" (DST)" if is_dst else ""),
+                "",
+                f"🔁 Changes {first} … {last}:",
+            ]
+            if not result["transitions"]:
+                lines.append("  None — the offset does not change in this range.")
+            for timestamp, before, after in result["transitions"]:
+                moment = datetime.fromtimestamp(timestamp, timezone.utc)
+                wall_before = (moment + timedelta(seconds=before[0])).strftime("%H:%M")
+                wall_after = (moment + timedelta(seconds=after[0])).strftime("%H:%M")
+                shift = after[0] - before[0]
+                direction = "forward" if shift > 0 else "back"
+                local_date = (moment + timedelta(seconds=after[0])).strftime("%a %Y-%m-%d")
+                lines.append(
+                    f"  • {local_date}: clocks go {direction} {wall_before} → {wall_after} local "
+                    f"({format_offset(before[0])} {before[2]} → {format_offset(after[0])} {after[2]}; "
+                    f"{moment:%Y-%m-%d %H:%M} UTC)"
+                )
+
+            if result["offsets"]:
+                lines.extend(["", "📍 Offsets at instants:"])
+                for timestamp, (offset, is_dst, abbr) in result["offsets"]:
+                    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+                    local = (moment + timedelta(seconds=offset)).strftime("%Y-%m-%d %H:%M")
+                    lines.append(
+                        f"  {moment:%Y-%m-%d %H:%M} UTC = {local} local, {format_offset(offset)} {abbr}"
+                        + (" (DST)" if is_dst else "")
+                    )
+
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"GetTimezoneTransitionsTool error: {e}")
+            return ToolResult(f"Failed to get transitions for '{query}': {e}", is_error=True)
+
+
 # ---------------------------------------------------------------------------
 # Registry
 # ---------------------------------------------------------------------------
@@ -198,4 +541,7 @@ def get_all_tools(client: TimeClient) -> list[TimeTool]:
         GetCurrentTimeTool(client),
         GetTimeInTimezoneTool(client),
         GetTimeInCityTool(client),
+        SearchTimezonesTool(client),
+        WorldClockTool(client),
+        GetTimezoneTransitionsTool(client),
     ]
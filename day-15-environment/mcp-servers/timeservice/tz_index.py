@@ -0,0 +1,157 @@
+"""Timezone name index, built once at startup.
+
+Holds the IANA names in sorted arrays for bisect prefix queries (both the
+full name and its city part, "Asia/Tokyo" → "tokyo"), a table of common
+abbreviations and aliases, difflib fuzzy matching for near misses such
+as "Europe/Moskow", and the ZoneInfo objects resolved so far.
+
+Abbreviations are mapped to the zone people usually mean by them ("EST"
+→ America/New_York, which observes DST) rather than to the fixed-offset
+legacy zones of the same name in tzdata.
+"""
+
+import difflib
+from bisect import bisect_left
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo, available_timezones
+
+FUZZY_CUTOFF = 0.8
+
+# alias → candidate zones (first one present in the local tzdata wins)
+ALIASES = {
+    # North America
+    "est": ("America/New_York",), "edt": ("America/New_York",), "et": ("America/New_York",),
+    "eastern": ("America/New_York",),
+    "cst": ("America/Chicago",), "cdt": ("America/Chicago",), "ct": ("America/Chicago",),
+    "central": ("America/Chicago",),
+    "mst": ("America/Denver",), "mdt": ("America/Denver",), "mt": ("America/Denver",),
+    "mountain": ("America/Denver",),
+    "pst": ("America/Los_Angeles",), "pdt": ("America/Los_Angeles",), "pt": ("America/Los_Angeles",),
+    "pacific": ("America/Los_Angeles",),
+    "akst": ("America/Anchorage",), "akdt": ("America/Anchorage",),
+    "hst": ("Pacific/Honolulu",),
+    "ast": ("America/Halifax",), "adt": ("America/Halifax",),
+    "nst": ("America/St_Johns",), "ndt": ("America/St_Johns",),
+    # Europe
+    "gmt": ("Etc/GMT",), "utc": ("UTC",), "z": ("UTC",), "zulu": ("UTC",),
+    "bst": ("Europe/London",), "wet": ("Europe/Lisbon",), "west": ("Europe/Lisbon",),
+    "cet": ("Europe/Berlin",), "cest": ("Europe/Berlin",),
+    "eet": ("Europe/Athens",), "eest": ("Europe/Athens",),
+    "msk": ("Europe/Moscow",),
+    "kyiv": ("Europe/Kyiv", "Europe/Kiev"), "kiev": ("Europe/Kyiv", "Europe/Kiev"),
+    # Asia / Pacific
+    "ist": ("Asia/Kolkata", "Asia/Calcutta"), "india": ("Asia/Kolkata", "Asia/Calcutta"),
+    "pkt": ("Asia/Karachi",), "gst": ("Asia/Dubai",),
+    "ict": ("Asia/Bangkok",), "wib": ("Asia/Jakarta",),
+    "sgt": ("Asia/Singapore",), "hkt": ("Asia/Hong_Kong",),
+    "china": ("Asia/Shanghai",), "beijing": ("Asia/Shanghai",),
+    "jst": ("Asia/Tokyo",), "kst": ("Asia/Seoul",),
+    "awst": ("Australia/Perth",), "acst": ("Australia/Adelaide",), "acdt": ("Australia/Adelaide",),
+    "aest": ("Australia/Sydney",), "aedt": ("Australia/Sydney",),
+    "nzst": ("Pacific/Auckland",), "nzdt": ("Pacific/Auckland",),
+    # Other
+    "brt": ("America/Sao_Paulo",), "art": ("America/Argentina/Buenos_Aires",),
+    "sast": ("Africa/Johannesburg",), "cat": ("Africa/Maputo",), "eat": ("Africa/Nairobi",),
+    "wat": ("Africa/Lagos",),
+    "saigon": ("Asia/Ho_Chi_Minh",), "bombay": ("Asia/Kolkata",), "calcutta": ("Asia/Kolkata",),
+}
+
+
+def _fold(name: str) -> str:
+    """Case- and separator-insensitive key: 'new york' and 'New_York' match."""
+    return name.strip().casefold().replace(" ", "_")
+
+
+class TimezoneIndex:
+    def __init__(self, names: Optional[Iterable[str]] = None):
+        self.names = sorted(names if names is not None else available_timezones())
+        folded = sorted((_fold(n), n) for n in self.names)
+        self._keys = [k for k, _ in folded]
+        self._key_names = [n for _, n in folded]
+        self._by_key = dict(folded)
+
+        # City part → zone (first in sorted order when several areas share a city name)
+        cities = {}
+        for name in self.names:
+            if "/" in name:
+                cities.setdefault(_fold(name.rsplit("/", 1)[1]), name)
+        self._city_keys = sorted(cities)
+        self._city_names = [cities[k] for k in self._city_keys]
+        self._by_city = cities
+
+        known = set(self.names)
+        self._aliases = {}
+        for alias, candidates in ALIASES.items():
+            target = next((c for c in candidates if c in known), None)
+            if target:
+                self._aliases[alias] = target
+        self._zones: dict[str, ZoneInfo] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return _fold(name) in self._by_key
+
+    def zone(self, name: str) -> ZoneInfo:
+        """Cached ZoneInfo for a canonical name from this index."""
+        zone = self._zones.get(name)
+        if zone is None:
+            zone = self._zones[name] = ZoneInfo(name)
+        return zone
+
+    def resolve(self, query: str, fuzzy: bool = True) -> Optional[tuple[str, str]]:
+        """Map a user-supplied zone, alias, abbreviation or city part to an IANA name.
+
+        Returns:
+            (name, match) where match is "exact", "alias", "city" or "fuzzy";
+            None if nothing is close enough
+        """
+        key = _fold(query)
+        if not key:
+            return None
+        if key in self._aliases:
+            return self._aliases[key], "alias"
+        if key in self._by_key:
+            return self._by_key[key], "exact"
+        if key in self._by_city:
+            return self._by_city[key], "city"
+        suggestions = self.suggest(query, limit=1) if fuzzy else []
+        if suggestions:
+            return suggestions[0], "fuzzy"
+        return None
+
+    def suggest(self, query: str, limit: int = 5) -> list[str]:
+        """Closest zone names to a misspelled query (full name or city part)."""
+        key = _fold(query)
+        pool = self._keys if "/" in key else self._city_keys
+        lookup = self._by_key if "/" in key else self._by_city
+        matches = difflib.get_close_matches(key, pool, n=limit, cutoff=FUZZY_CUTOFF)
+        return [lookup[m] for m in matches]
+
+    @staticmethod
+    def _prefix_range(keys: list[str], prefix: str) -> tuple[int, int]:
+        lo = bisect_left(keys, prefix)
+        hi = bisect_left(keys, prefix + "\uffff", lo)
+        return lo, hi
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """Zones whose name or city part starts with `prefix` (case-insensitive), sorted."""
+        key = _fold(prefix)
+        if not key:
+            return self.names[:limit] if limit else list(self.names)
+        lo, hi = self._prefix_range(self._keys, key)
+        found = set(self._key_names[lo:hi])
+        if "/" not in key:
+            lo, hi = self._prefix_range(self._city_keys, key)
+            found.update(self._city_names[lo:hi])
+        result = sorted(found)
+        return result[:limit] if limit else result
+
+    def starting_with(self, prefix: str) -> list[str]:
+        """Exact-case prefix filter over the sorted names."""
+        lo, hi = self._prefix_range(self.names, prefix)
+        return self.names[lo:hi]
+
+    def stats(self) -> dict:
+        return {"zones": len(self.names), "aliases": len(self._aliases), "zoneinfo_cached": len(self._zones)}
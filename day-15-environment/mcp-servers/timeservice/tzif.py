@@ -0,0 +1,267 @@
+"""UTC-offset transition tables read directly from tzdata (TZif files).
+
+A TZif file (RFC 8536) lists a zone's transitions as sorted UTC instants,
+each pointing at a local time type (UTC offset, DST flag, abbreviation),
+and ends with a POSIX TZ string ("EST5EDT,M3.2.0,M11.1.0") that describes
+every transition after the last listed one. A table is parsed once per
+zone, extended from the POSIX rule on demand for later years, and then
+answers offset-at-instant and transitions-in-range queries by bisecting
+the transition instants, without constructing a datetime per candidate.
+
+Files are looked up on zoneinfo.TZPATH, then in the `tzdata` package.
+"""
+
+import calendar
+import logging
+import os
+import re
+import struct
+import zoneinfo
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Years covered by the POSIX rule after the last listed transition are
+# generated up to the latest year queried, capped here.
+MAX_RULE_YEAR = 2200
+
+LocalType = tuple[int, bool, str]  # (UTC offset seconds, is DST, abbreviation)
+
+
+# ---------------------------------------------------------------------------
+# POSIX TZ rule (TZif footer)
+# ---------------------------------------------------------------------------
+
+_POSIX_RE = re.compile(
+    r"^(?P<std><[^>]+>|[A-Za-z]{3,})(?P<std_offset>[+-]?\d{1,2}(?::\d{2}){0,2})"
+    r"(?:(?P<dst><[^>]+>|[A-Za-z]{3,})(?P<dst_offset>[+-]?\d{1,2}(?::\d{2}){0,2})?"
+    r"(?:,(?P<start>[^,]+),(?P<end>[^,]+))?)?$"
+)
+
+
+def _parse_seconds(value: str) -> int:
+    """'[+-]hh[:mm[:ss]]' → seconds."""
+    sign = -1 if value.startswith("-") else 1
+    parts = [int(p) for p in value.lstrip("+-").split(":")]
+    parts += [0] * (3 - len(parts))
+    return sign * (parts[0] * 3600 + parts[1] * 60 + parts[2])
+
+
+@dataclass(frozen=True)
+class PosixRule:
+    std: LocalType
+    dst: Optional[LocalType]
+    start: Optional[tuple[str, int]]  # (date spec, seconds after local midnight)
+    end: Optional[tuple[str, int]]
+
+    @classmethod
+    def parse(cls, text: str) -> Optional["PosixRule"]:
+        match = _POSIX_RE.match(text.strip())
+        if not match:
+            return None
+        std_offset = -_parse_seconds(match["std_offset"])  # POSIX offsets are west-positive
+        std = (std_offset, False, match["std"].strip("<>"))
+        if not match["dst"]:
+            return cls(std, None, None, None)
+        dst_offset = -_parse_seconds(match["dst_offset"]) if match["dst_offset"] else std_offset + 3600
+        dst = (dst_offset, True, match["dst"].strip("<>"))
+        if not match["start"]:
+            # No rule given: POSIX default is the US rule
+            return cls(std, dst, ("M3.2.0", 7200), ("M11.1.0", 7200))
+
+        def split(spec: str) -> tuple[str, int]:
+            day, _, at = spec.partition("/")
+            return day, _parse_seconds(at) if at else 7200
+
+        return cls(std, dst, split(match["start"]), split(match["end"]))
+
+    @staticmethod
+    def _day_of_year(spec: str, year: int) -> tuple[int, int]:
+        """(month, day) of a Jn, n or Mm.w.d date spec in `year`."""
+        if spec.startswith("M"):
+            month, week, weekday = (int(p) for p in spec[1:].split("."))
+            first_weekday, days = calendar.monthrange(year, month)  # Monday = 0
+            first_sunday_based = (first_weekday + 1) % 7  # Sunday = 0, as in POSIX
+            day = 1 + (weekday - first_sunday_based) % 7 + (week - 1) * 7
+            while day > days:
+                day -= 7
+            return month, day
+        if spec.startswith("J"):
+            n = int(spec[1:])  # 1..365, February 29 never counted
+            ordinal = n + (1 if calendar.isleap(year) and n >= 60 else 0)
+        else:
+            ordinal = int(spec) + 1  # 0..365, February 29 counted
+        day = date.fromordinal(date(year, 1, 1).toordinal() + ordinal - 1)
+        return day.month, day.day
+
+    def _instant(self, spec: tuple[str, int], year: int, utoff_before: int) -> int:
+        month, day = self._day_of_year(spec[0], year)
+        local_midnight = calendar.timegm((year, month, day, 0, 0, 0))
+        return local_midnight + spec[1] - utoff_before
+
+    def transitions(self, year: int) -> list[tuple[int, LocalType]]:
+        """The (UTC instant, new type) changes this rule makes in `year`, sorted."""
+        if self.dst is None:
+            return []
+        changes = [
+            (self._instant(self.start, year, self.std[0]), self.dst),
+            (self._instant(self.end, year, self.dst[0]), self.std),
+        ]
+        return sorted(changes)
+
+
+# ---------------------------------------------------------------------------
+# TZif parsing
+# ---------------------------------------------------------------------------
+
+def _find_file(name: str) -> Optional[str]:
+    if os.path.isabs(name) or ".." in name.split("/"):
+        return None
+    for directory in zoneinfo.TZPATH:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    try:
+        from importlib import resources
+        resource = resources.files("tzdata.zoneinfo").joinpath(name)
+        if resource.is_file():
+            return str(resource)
+    except (ImportError, ModuleNotFoundError, AttributeError):
+        pass
+    return None
+
+
+def _parse_tzif(data: bytes) -> tuple[list[int], list[int], list[LocalType], str]:
+    """(transition instants, type index per transition, local types, POSIX footer)."""
+    if data[:4] != b"TZif":
+        raise ValueError("not a TZif file")
+    version = data[4:5]
+
+    def header(offset: int) -> tuple[int, ...]:
+        return struct.unpack(">6l", data[offset + 20:offset + 44])
+
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = header(0)
+    time_size = 4
+    offset = 44
+    if version >= b"2":
+        # Skip the 32-bit block; the v2+ block after it has 64-bit instants and a footer
+        offset += timecnt * 4 + timecnt + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt
+        isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = header(offset)
+        offset += 44
+        time_size = 8
+
+    times = list(struct.unpack(f">{timecnt}{'q' if time_size == 8 else 'l'}",
+                               data[offset:offset + timecnt * time_size]))
+    offset += timecnt * time_size
+    indexes = list(data[offset:offset + timecnt])
+    offset += timecnt
+    raw_types = [struct.unpack(">lBB", data[offset + i * 6:offset + i * 6 + 6]) for i in range(typecnt)]
+    offset += typecnt * 6
+    chars = data[offset:offset + charcnt]
+    offset += charcnt + leapcnt * (time_size + 4) + isstdcnt + isutcnt
+
+    types = []
+    for utoff, isdst, abbr_index in raw_types:
+        end = chars.find(b"\0", abbr_index)
+        types.append((utoff, bool(isdst), chars[abbr_index:end].decode("ascii", "replace")))
+
+    footer = ""
+    if version >= b"2":
+        footer = data[offset:].strip(b"\n").split(b"\n")[0].decode("ascii", "replace")
+    return times, indexes, types, footer
+
+
+class ZoneTransitions:
+    """Transition table of one zone: sorted UTC instants and the type in force from each."""
+
+    def __init__(self, name: str, times: list[int], types: list[LocalType], initial: LocalType,
+                 rule: Optional[PosixRule]):
+        self.name = name
+        self.times = array("q", times)
+        self.types = types
+        self.initial = initial
+        self.rule = rule
+        last = times[-1] if times else None
+        self._rule_from_year = datetime.fromtimestamp(last, timezone.utc).year if last is not None else 1970
+        self._extended_to = self._rule_from_year - 1
+
+    @classmethod
+    def from_file(cls, name: str, path: str) -> "ZoneTransitions":
+        with open(path, "rb") as f:
+            times, indexes, types, footer = _parse_tzif(f.read())
+        rule = PosixRule.parse(footer) if footer else None
+        if footer and rule is None:
+            logger.warning(f"Unsupported POSIX TZ rule for {name}: {footer!r}")
+        # RFC 8536: before the first transition, the first type is in force
+        initial = types[0] if types else (rule.std if rule else (0, False, "UTC"))
+        per_transition = [types[i] for i in indexes]
+        return cls(name, times, per_transition, initial, rule)
+
+    def _extend(self, year: int):
+        """Append rule-generated transitions through `year`."""
+        if self.rule is None or self.rule.dst is None or year <= self._extended_to:
+            return
+        year = min(year, MAX_RULE_YEAR)
+        last = self.times[-1] if self.times else None
+        for y in range(self._extended_to + 1, year + 1):
+            for instant, local_type in self.rule.transitions(y):
+                if last is None or instant > last:
+                    current = self.types[-1] if self.types else self.initial
+                    if local_type != current:
+                        self.times.append(instant)
+                        self.types.append(local_type)
+                    last = instant
+        self._extended_to = max(self._extended_to, year)
+
+    def _ensure(self, timestamp: int):
+        if self.rule is not None and self.rule.dst is not None:
+            self._extend(datetime.fromtimestamp(timestamp, timezone.utc).year + 1)
+
+    def at(self, timestamp: int) -> LocalType:
+        """Local type (offset, dst, abbreviation) in force at a UTC instant."""
+        self._ensure(timestamp)
+        i = bisect_right(self.times, timestamp) - 1
+        if i >= 0:
+            return self.types[i]
+        return self.initial
+
+    def between(self, start: int, end: int) -> list[tuple[int, LocalType, LocalType]]:
+        """(instant, type before, type after) for transitions in [start, end)."""
+        self._ensure(end)
+        lo = bisect_left(self.times, start)
+        hi = bisect_left(self.times, end)
+        result = []
+        for i in range(lo, hi):
+            before = self.types[i - 1] if i > 0 else self.initial
+            after = self.types[i]
+            if before[0] != after[0] or before[1] != after[1]:  # skip abbreviation-only changes
+                result.append((self.times[i], before, after))
+        return result
+
+
+class TransitionTables:
+    """Per-zone transition tables, parsed from tzdata on first use and cached."""
+
+    def __init__(self):
+        self._tables: dict[str, ZoneTransitions] = {}
+
+    def get(self, name: str) -> Optional[ZoneTransitions]:
+        table = self._tables.get(name)
+        if table is None:
+            path = _find_file(name)
+            if path is None:
+                return None
+            try:
+                table = ZoneTransitions.from_file(name, path)
+            except (OSError, ValueError, struct.error) as e:
+                logger.error(f"Cannot read tzdata for {name}: {e}")
+                return None
+            self._tables[name] = table
+        return table
+
+    def stats(self) -> dict:
+        return {"zones_loaded": len(self._tables)}
@@ -16,10 +16,17 @@ class AuthConfig:
     api_key: str = ""
 
 
+@dataclass
+class CacheConfig:
+    grid: float = 0.05
+    max_entries: int = 2000
+
+
 @dataclass
 class Config:
     server: ServerConfig
     auth: AuthConfig
+    cache: CacheConfig
 
 
 def load_config(disable_auth: bool = False) -> Config:
@@ -33,7 +40,12 @@ def load_config(disable_auth: bool = False) -> Config:
     if auth_enabled and not api_key:
         raise ValueError("MCP_API_KEY environment variable required when auth is enabled")
 
+    # Response cache: coordinates snapped to this grid (degrees) share cached responses
+    cache_grid = float(os.getenv("WEATHER_CACHE_GRID", "0.05"))
+    cache_size = int(os.getenv("WEATHER_CACHE_SIZE", "2000"))
+
     return Config(
         server=ServerConfig(host=host, port=port),
         auth=AuthConfig(enabled=auth_enabled, api_key=api_key),
+        cache=CacheConfig(grid=cache_grid, max_entries=cache_size),
     )
@@ -0,0 +1,65 @@
+"""Server-side aggregation over Open-Meteo's columnar hourly arrays.
+
+Open-Meteo returns hourly data as parallel arrays ("time", "temperature_2m",
+...) with local ISO timestamps ("2024-05-01T13:00"), which sort as strings.
+Windows are located with bisect on the time column and aggregates are
+computed over array slices, so no per-hour rows are ever built.
+"""
+
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Optional
+
+AGGREGATES = ("min", "max", "mean", "sum")
+
+
+def window(times: list[str], start: Optional[str], end: Optional[str]) -> tuple[int, int]:
+    """Index range [lo, hi) of timestamps in [start, end)."""
+    lo = bisect_left(times, start) if start else 0
+    hi = bisect_left(times, end) if end else len(times)
+    return lo, max(lo, hi)
+
+
+def day_windows(times: list[str], lo: int, hi: int) -> list[tuple[str, int, int]]:
+    """Split [lo, hi) into (date, lo, hi) per local calendar day."""
+    result = []
+    while lo < hi:
+        day = times[lo][:10]
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        end = min(hi, bisect_left(times, next_day, lo, hi))
+        result.append((day, lo, end))
+        lo = end
+    return result
+
+
+def aggregate(values: list, lo: int, hi: int, ops: tuple[str, ...] = AGGREGATES) -> dict:
+    """min/max/mean/sum of values[lo:hi], ignoring missing (None) values."""
+    present = [v for v in values[lo:hi] if v is not None]
+    if not present:
+        return {op: None for op in ops}
+    total = sum(present)
+    computed = {
+        "min": min(present),
+        "max": max(present),
+        "mean": round(total / len(present), 2),
+        "sum": round(total, 2),
+    }
+    return {op: computed[op] for op in ops}
+
+
+def first_crossing(
+    times: list[str],
+    values: list,
+    lo: int,
+    hi: int,
+    above: Optional[float] = None,
+    below: Optional[float] = None,
+) -> Optional[tuple[str, float]]:
+    """First (time, value) in [lo, hi) strictly above `above` or below `below`."""
+    for i in range(lo, hi):
+        value = values[i]
+        if value is None:
+            continue
+        if (above is not None and value > above) or (below is not None and value < below):
+            return times[i], value
+    return None
@@ -9,6 +9,8 @@ Environment variables:
     MCP_API_KEY  Server API key for client authentication (required unless --no-auth)
     HOST         Bind address (default: 0.0.0.0)
     PORT         Bind port (default: 8002)
+    WEATHER_CACHE_GRID  Snap coordinates to this grid (degrees) for response caching (default: 0.05)
+    WEATHER_CACHE_SIZE  Max cached Open-Meteo responses (default: 2000)
 
 Weather data provided by Open-Meteo (https://open-meteo.com) - free, no API key required.
 """
@@ -17,12 +19,13 @@ import argparse
 import logging
 import sys
 
-import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from shared import McpProtocolHandler, SseTransport
+from shared import (
+    ApiKeyAuth, ApiKeyAuthMiddleware, LifespanManager, McpProtocolHandler,
+    SseTransport, run_server,
+)
 from .config import load_config
 from .weather_client import WeatherClient
 from .tools import get_all_tools
@@ -50,14 +53,23 @@ def parse_args() -> argparse.Namespace:
 
 def build_app(config, weather_client: WeatherClient) -> FastAPI:
     tools = get_all_tools(weather_client)
-    protocol_handler = McpProtocolHandler(tools, server_name=SERVER_NAME, server_version=SERVER_VERSION)
+    lifespan = LifespanManager()
+    protocol_handler = McpProtocolHandler(
+        tools, server_name=SERVER_NAME, server_version=SERVER_VERSION, lifespan=lifespan
+    )
     sse_transport = SseTransport(protocol_handler)
 
+    # Shutdown order: stop new calls → drain in-flight → flush SSE → close upstream clients
+    lifespan.on_drain(sse_transport.close_all_sessions)
+    lifespan.on_close(weather_client.close)
+
     app = FastAPI(
         title="Weather MCP Server",
         description="MCP server for getting weather data via SSE transport. Powered by Open-Meteo.",
         version=SERVER_VERSION,
+        lifespan=lifespan.lifespan,
     )
+    app.state.lifespan = lifespan
 
     # CORS — allow any origin so clients can connect
     app.add_middleware(
@@ -67,22 +79,10 @@ def build_app(config, weather_client: WeatherClient) -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
     )
 
-    # API-key authentication middleware (only when auth is enabled)
-    if config.auth.enabled:
-        api_key = config.auth.api_key
-        public_paths = {"/health", "/", "/docs", "/redoc", "/openapi.json"}
-
-        @app.middleware("http")
-        async def auth_middleware(request: Request, call_next):
-            if request.url.path in public_paths:
-                return await call_next(request)
-            key = request.headers.get("x-api-key") or request.query_params.get("api_key")
-            if key != api_key:
-                return JSONResponse(
-                    {"error": "Unauthorized: missing or invalid X-API-Key header"},
-                    status_code=401,
-                )
-            return await call_next(request)
+    # API-key authentication + per-key rate limiting (only when auth is enabled)
+    auth = ApiKeyAuth.from_env(config.auth.api_key) if config.auth.enabled else None
+    if auth:
+        app.add_middleware(ApiKeyAuthMiddleware, auth=auth)
 
     # MCP SSE transport routes (/sse and /message)
     sse_transport.setup_routes(app)
@@ -92,10 +92,14 @@ def build_app(config, weather_client: WeatherClient) -> FastAPI:
     @app.get("/health")
     async def health():
         return {
-            "status": "ok",
+            "status": "ok" if lifespan.accepting else "draining",
+            "in_flight_calls": lifespan.in_flight,
             "tools_count": len(tools),
             "active_sessions": sse_transport.get_active_session_count(),
             "auth_enabled": config.auth.enabled,
+            "auth": auth.stats() if auth else None,
+            "geocoding": weather_client.geocoder.stats(),
+            "weather_cache": weather_client.cache.stats(),
             "data_source": "Open-Meteo (https://open-meteo.com)",
         }
 
@@ -152,12 +156,13 @@ def main():
     logger.info(f"  Address:      {config.server.host}:{config.server.port}")
     logger.info(f"  Auth:         {auth_status}")
     logger.info("  Data source:  Open-Meteo (https://open-meteo.com)")
-    logger.info("  Tools:        get_current_weather, get_weather_forecast")
+    logger.info("  Tools:        get_current_weather, get_weather_forecast, get_weather_multi,")
+    logger.info("                get_hourly_forecast")
 
-    weather_client = WeatherClient()
+    weather_client = WeatherClient(cache_grid=config.cache.grid, cache_size=config.cache.max_entries)
     app = build_app(config, weather_client)
 
-    uvicorn.run(app, host=config.server.host, port=config.server.port)
+    run_server(app, config.server.host, config.server.port)
 
 
 if __name__ == "__main__":
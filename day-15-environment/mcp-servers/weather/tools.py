@@ -3,14 +3,41 @@
 Tools for getting weather data via Open-Meteo API:
 - get_current_weather: Current weather for a city
 - get_weather_forecast: Multi-day weather forecast
+- get_weather_multi: Current weather or forecast for many cities at once
+- get_hourly_forecast: Aggregates over hourly forecast windows
 """
 
+import asyncio
 import logging
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
 from shared import ToolResult, BaseTool
+from .hourly import AGGREGATES, aggregate, day_windows, first_crossing, window
 from .weather_client import WeatherClient
 
 logger = logging.getLogger(__name__)
 
+# get_weather_multi: max cities per call
+MULTI_MAX_CITIES = 50
+
+# get_hourly_forecast: friendly variable name → (Open-Meteo hourly variable, unit)
+HOURLY_VARIABLES = {
+    "temperature": ("temperature_2m", "°C"),
+    "feels_like": ("apparent_temperature", "°C"),
+    "humidity": ("relative_humidity_2m", "%"),
+    "precipitation": ("precipitation", "mm"),
+    "precipitation_probability": ("precipitation_probability", "%"),
+    "rain": ("rain", "mm"),
+    "snowfall": ("snowfall", "cm"),
+    "cloud_cover": ("cloud_cover", "%"),
+    "wind_speed": ("wind_speed_10m", "km/h"),
+    "wind_gusts": ("wind_gusts_10m", "km/h"),
+    "uv_index": ("uv_index", ""),
+}
+SUMMED_VARIABLES = ("precipitation", "rain", "snowfall")  # totals are meaningful, reported by default
+
 
 class WeatherTool(BaseTool):
     """Base class for Weather MCP tools."""
@@ -188,6 +215,276 @@ class GetWeatherForecastTool(WeatherTool):
             )
 
 
+# ---------------------------------------------------------------------------
+# Tool: get_weather_multi
+# ---------------------------------------------------------------------------
+
+class GetWeatherMultiTool(WeatherTool):
+    name = "get_weather_multi"
+    description = (
+        "Get current weather or a daily forecast for several cities in one call "
+        f"(up to {MULTI_MAX_CITIES}). Returns a compact table, one row per city (per day for forecasts). "
+        "Prefer this over calling get_current_weather once per city."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "cities": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "City names (e.g., ['Moscow', 'Berlin', 'Tokyo'])",
+            },
+            "mode": {
+                "type": "string",
+                "enum": ["current", "forecast"],
+                "description": "'current' conditions (default) or daily 'forecast'",
+            },
+            "days": {
+                "type": "integer",
+                "description": "Forecast days per city when mode is 'forecast' (1-16, default: 3)",
+            },
+        },
+        "required": ["cities"],
+    }
+
+    @staticmethod
+    def _parse_cities(value) -> list[str]:
+        if isinstance(value, str):
+            value = value.split(",")
+        cities = []
+        for city in value or []:
+            city = str(city).strip()
+            if city and city not in cities:
+                cities.append(city)
+        return cities
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        cities = self._parse_cities(arguments.get("cities"))
+        if not cities:
+            return ToolResult("Missing required parameter: cities", is_error=True)
+        if len(cities) > MULTI_MAX_CITIES:
+            return ToolResult(f"Too many cities: {len(cities)} (max {MULTI_MAX_CITIES})", is_error=True)
+        mode = arguments.get("mode", "current")
+        try:
+            days = max(1, min(16, int(arguments.get("days", 3))))
+        except (TypeError, ValueError):
+            return ToolResult(f"Invalid days: {arguments.get('days')!r} (expected an integer 1-16)", is_error=True)
+
+        try:
+            geocoded = await asyncio.gather(*(self.client.geocode(c) for c in cities), return_exceptions=True)
+            found = [(city, loc) for city, loc in zip(cities, geocoded) if loc and not isinstance(loc, Exception)]
+            missing = [city for city, loc in zip(cities, geocoded) if not loc]
+            errors = [(city, loc) for city, loc in zip(cities, geocoded) if isinstance(loc, Exception)]
+            coords = [(loc["latitude"], loc["longitude"]) for _, loc in found]
+
+            if mode == "forecast":
+                results = await self.client.get_forecast_multi(coords, days) if coords else []
+                lines = [
+                    f"{days}-Day Forecast for {len(found)} cities",
+                    "=" * 50,
+                    "City | Date | Min/Max °C | Precip mm (chance) | Conditions",
+                ]
+                for (_, loc), forecast in zip(found, results):
+                    for day in forecast["days"]:
+                        prob = day.get("precipitation_probability")
+                        prob_str = f" ({prob}%)" if prob is not None else ""
+                        lines.append(
+                            f"{loc['name']} | {day['date']} | {day['temp_min']}/{day['temp_max']} | "
+                            f"{day['precipitation']}{prob_str} | {day['weather_description']}"
+                        )
+            else:
+                results = await self.client.get_current_weather_multi(coords) if coords else []
+                lines = [
+                    f"Current Weather in {len(found)} cities",
+                    "=" * 50,
+                    "City | Temp °C (feels) | Humidity % | Wind km/h | Conditions | Local time",
+                ]
+                for (_, loc), weather in zip(found, results):
+                    lines.append(
+                        f"{loc['name']}, {loc['country']} | {weather['temperature']} ({weather['feels_like']}) | "
+                        f"{weather['humidity']} | {weather['wind_speed']} "
+                        f"{_wind_direction_to_text(weather['wind_direction'])} | "
+                        f"{weather['weather_description']} | {weather.get('time', 'N/A')}"
+                    )
+
+            if missing or errors:
+                lines.append("")
+            if missing:
+                lines.append(f"Not found: {', '.join(missing)}")
+            for city, error in errors:
+                lines.append(f"{city}: ERROR: {error}")
+            return ToolResult("\n".join(lines), is_error=not found)
+
+        except Exception as e:
+            logger.error(f"GetWeatherMultiTool error: {e}")
+            return ToolResult(f"Failed to get weather for {len(cities)} cities: {e}", is_error=True)
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_hourly_forecast
+# ---------------------------------------------------------------------------
+
+class GetHourlyForecastTool(WeatherTool):
+    name = "get_hourly_forecast"
+    description = (
+        "Answer questions about the hourly forecast for a city without listing every hour: "
+        "min/max/mean/sum of chosen variables over a time window (optionally per day), and the "
+        "first hour a variable goes above or below a threshold "
+        "(e.g. 'when does the rain start tomorrow': variable precipitation, threshold_above 0, start 'tomorrow')."
+    )
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "city": {"type": "string", "description": "City name (e.g., 'Moscow', 'New York', 'Tokyo')"},
+            "variables": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(HOURLY_VARIABLES)},
+                "description": "Variables to aggregate (default: ['temperature', 'precipitation'])",
+            },
+            "start": {
+                "type": "string",
+                "description": "Window start in local time: 'today', 'tomorrow', 'YYYY-MM-DD' or "
+                               "'YYYY-MM-DDTHH:MM' (default: now)",
+            },
+            "end": {
+                "type": "string",
+                "description": "Window end (exclusive; a date means end of that day). "
+                               "Default: end of the start day, or 48 hours when start is omitted",
+            },
+            "aggregates": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(AGGREGATES)},
+                "description": "Aggregates to compute (default: min, max, mean; sum is added for precipitation)",
+            },
+            "group_by": {
+                "type": "string",
+                "enum": ["window", "day"],
+                "description": "'window' for one result over the whole window (default) or 'day' per local day",
+            },
+            "threshold_variable": {"type": "string", "enum": list(HOURLY_VARIABLES),
+                                   "description": "Variable for the threshold search"},
+            "threshold_above": {"type": "number", "description": "Report the first hour the variable exceeds this"},
+            "threshold_below": {"type": "number", "description": "Report the first hour the variable drops below this"},
+        },
+        "required": ["city"],
+    }
+
+    @staticmethod
+    def _resolve_time(value: Optional[str], today: date, is_end: bool) -> Optional[datetime]:
+        """Parse 'today'/'tomorrow'/date/datetime into a naive local datetime."""
+        if not value:
+            return None
+        value = value.strip().lower()
+        if value in ("today", "tomorrow"):
+            day = today + timedelta(days=1 if value == "tomorrow" else 0)
+        elif len(value) == 10:
+            day = date.fromisoformat(value)
+        else:
+            return datetime.fromisoformat(value.replace("t", "T"))
+        start_of_day = datetime(day.year, day.month, day.day)
+        return start_of_day + timedelta(days=1) if is_end else start_of_day
+
+    @staticmethod
+    def _parse_names(value) -> list[str]:
+        """A list argument given as a list or a comma-separated string."""
+        if isinstance(value, str):
+            value = value.split(",")
+        return [str(v).strip() for v in value or [] if str(v).strip()]
+
+    async def execute(self, arguments: dict) -> ToolResult:
+        city = arguments.get("city", "").strip()
+        if not city:
+            return ToolResult("Missing required parameter: city", is_error=True)
+
+        try:
+            variables = self._parse_names(arguments.get("variables")) or ["temperature", "precipitation"]
+            threshold_variable = arguments.get("threshold_variable")
+            unknown = [v for v in variables + [threshold_variable or "temperature"] if v not in HOURLY_VARIABLES]
+            if unknown:
+                return ToolResult(
+                    f"Unknown variable(s): {', '.join(map(str, unknown))}. Available: {', '.join(HOURLY_VARIABLES)}",
+                    is_error=True,
+                )
+            requested_ops = self._parse_names(arguments.get("aggregates"))
+            ops = tuple(op for op in AGGREGATES if op in (requested_ops or ("min", "max", "mean")))
+            group_by = arguments.get("group_by", "window")
+            above = arguments.get("threshold_above")
+            below = arguments.get("threshold_below")
+            above = float(above) if above is not None else None
+            below = float(below) if below is not None else None
+        except (TypeError, ValueError) as e:
+            return ToolResult(f"Invalid arguments: {e}", is_error=True)
+        if (above is not None or below is not None) and not threshold_variable:
+            threshold_variable = variables[0]
+
+        try:
+            location = await self.client.geocode(city)
+            if not location:
+                return ToolResult(
+                    f"City not found: '{city}'. Try using English city name.",
+                    is_error=True,
+                )
+
+            now = datetime.now(ZoneInfo(location["timezone"])).replace(tzinfo=None, minute=0, second=0,
+                                                                       microsecond=0)
+            try:
+                start = self._resolve_time(arguments.get("start"), now.date(), is_end=False)
+                end = self._resolve_time(arguments.get("end"), now.date(), is_end=True)
+            except ValueError as e:
+                return ToolResult(f"Invalid start/end: {e}", is_error=True)
+            if start is None:
+                start = now
+                end = end or now + timedelta(hours=48)
+            elif end is None:
+                end = datetime(start.year, start.month, start.day) + timedelta(days=1)
+            if end <= start:
+                return ToolResult("Window end must be after its start", is_error=True)
+
+            days = (end - timedelta(minutes=1)).date().toordinal() - now.date().toordinal() + 1
+            if days > 16:
+                return ToolResult("Open-Meteo forecasts reach at most 16 days ahead", is_error=True)
+            hourly = await self.client.get_hourly_forecast(location["latitude"], location["longitude"], days)
+
+            times = hourly["time"]
+            lo, hi = window(times, start.strftime("%Y-%m-%dT%H:%M"), end.strftime("%Y-%m-%dT%H:%M"))
+            if lo >= hi:
+                return ToolResult(f"No forecast data between {start} and {end}", is_error=True)
+            groups = day_windows(times, lo, hi) if group_by == "day" else [(f"{times[lo]} → {times[hi - 1]}", lo, hi)]
+
+            location_name = location["name"]
+            if location.get("admin1"):
+                location_name += f", {location['admin1']}"
+            location_name += f", {location['country']}"
+            lines = [
+                f"Hourly forecast for {location_name} ({hourly['timezone']})",
+                "=" * 50,
+            ]
+            for label, g_lo, g_hi in groups:
+                lines.append(f"{label} ({g_hi - g_lo} h):")
+                for name in variables:
+                    field, unit = HOURLY_VARIABLES[name]
+                    var_ops = ops if requested_ops or name not in SUMMED_VARIABLES else ops + ("sum",)
+                    stats = aggregate(hourly[field], g_lo, g_hi, var_ops)
+                    summary = ", ".join(f"{op} {value}" for op, value in stats.items())
+                    lines.append(f"  {name} [{unit}]: {summary}" if unit else f"  {name}: {summary}")
+
+            if threshold_variable and (above is not None or below is not None):
+                field, unit = HOURLY_VARIABLES[threshold_variable]
+                condition = f"> {above}" if above is not None else f"< {below}"
+                hit = first_crossing(times, hourly[field], lo, hi, above, below)
+                lines.append("")
+                if hit:
+                    lines.append(f"First hour with {threshold_variable} {condition}{unit}: {hit[0]} ({hit[1]}{unit})")
+                else:
+                    lines.append(f"{threshold_variable} stays within the threshold ({condition}{unit} never reached)")
+
+            return ToolResult("\n".join(lines))
+
+        except Exception as e:
+            logger.error(f"GetHourlyForecastTool error: {e}")
+            return ToolResult(f"Failed to get hourly forecast for '{city}': {e}", is_error=True)
+
+
 # ---------------------------------------------------------------------------
 # Registry
 # ---------------------------------------------------------------------------
@@ -197,4 +494,6 @@ def get_all_tools(client: WeatherClient) -> list[WeatherTool]:
     return [
         GetCurrentWeatherTool(client),
         GetWeatherForecastTool(client),
+        GetWeatherMultiTool(client),
+        GetHourlyForecastTool(client),
     ]
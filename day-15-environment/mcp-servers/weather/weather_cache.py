@@ -0,0 +1,70 @@
+"""TTL cache for Open-Meteo responses, keyed by coordinates on the model grid.
+
+Open-Meteo refreshes current conditions every 15 minutes and forecasts
+hourly. Entries therefore expire at the next update boundary (wall-clock
+aligned) instead of after a fixed age: a response fetched at 10:14 is
+stale at 10:15, one fetched at 10:16 stays valid until 10:30.
+
+Coordinates are snapped to a grid roughly matching the weather models'
+resolution, and the snapped point is what gets requested upstream, so all
+locations in one cell share one cached response.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+CURRENT_INTERVAL = 15 * 60  # current conditions: every 15 minutes
+FORECAST_INTERVAL = 60 * 60  # hourly/daily forecasts: every hour
+
+
+def next_boundary(now: float, interval: float) -> float:
+    """Epoch seconds of the next multiple of `interval` after `now`."""
+    return (math.floor(now / interval) + 1) * interval
+
+
+class WeatherCache:
+    """Bounded LRU map of key → (value, expires_at)."""
+
+    def __init__(self, grid: float = 0.05, max_entries: int = 2000):
+        self.grid = grid
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def snap(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Snap coordinates to the cache grid (no-op when grid is 0)."""
+        if self.grid <= 0:
+            return latitude, longitude
+        return (
+            round(round(latitude / self.grid) * self.grid, 4),
+            round(round(longitude / self.grid) * self.grid, 4),
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, interval: float):
+        """Store until the next `interval` boundary."""
+        self._entries[key] = (value, next_boundary(time.time(), interval))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "grid_degrees": self.grid,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -9,14 +9,32 @@ API docs: https://open-meteo.com/en/docs
 """
 
 import logging
+from bisect import bisect_left
+from datetime import date, timedelta
 from typing import Optional
-import httpx
+
+from shared import Geocoder, HttpClient
+from .weather_cache import CURRENT_INTERVAL, FORECAST_INTERVAL, WeatherCache
 
 logger = logging.getLogger(__name__)
 
-GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
 
+MIN_FORECAST_FETCH_DAYS = 7
+
+CURRENT_FIELDS = (
+    "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,"
+    "weather_code,wind_speed_10m,wind_direction_10m,pressure_msl"
+)
+HOURLY_FIELDS = (
+    "temperature_2m,apparent_temperature,relative_humidity_2m,precipitation,precipitation_probability,"
+    "rain,snowfall,cloud_cover,wind_speed_10m,wind_gusts_10m,uv_index,weather_code"
+)
+DAILY_FIELDS = (
+    "weather_code,temperature_2m_max,temperature_2m_min,apparent_temperature_max,"
+    "apparent_temperature_min,precipitation_sum,precipitation_probability_max,wind_speed_10m_max"
+)
+
 # WMO Weather interpretation codes
 WMO_CODES = {
     0: "Clear sky",
@@ -53,58 +71,64 @@ WMO_CODES = {
 class WeatherClient:
     """Client for Open-Meteo weather API."""
 
-    def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+    def __init__(self, cache_grid: float = 0.05, cache_size: int = 2000):
+        self.http_client = HttpClient(timeout=30.0)
+        self.geocoder = Geocoder.from_env(self.http_client)
+        self.cache = WeatherCache(grid=cache_grid, max_entries=cache_size)
 
     async def geocode(self, city: str) -> Optional[dict]:
-        """Convert city name to coordinates.
+        """Convert city name to coordinates (cached, shared with the other servers).
 
         Returns:
             dict with keys: name, latitude, longitude, country, timezone
             None if city not found
+
+        Raises:
+            UpstreamError: geocoding API unavailable (not the same as "not found")
         """
-        try:
-            response = await self.http_client.get(
-                GEOCODING_URL,
-                params={"name": city, "count": 1, "language": "en", "format": "json"},
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            if not data.get("results"):
-                return None
-
-            result = data["results"][0]
-            return {
-                "name": result.get("name", city),
-                "latitude": result["latitude"],
-                "longitude": result["longitude"],
-                "country": result.get("country", "Unknown"),
-                "admin1": result.get("admin1", ""),  # State/region
-                "timezone": result.get("timezone", "UTC"),
-            }
-        except Exception as e:
-            logger.error(f"Geocoding error for '{city}': {e}")
-            return None
+        return await self.geocoder.geocode(city)
 
-    async def get_current_weather(self, latitude: float, longitude: float) -> dict:
-        """Get current weather for coordinates.
+    async def _fetch_points(
+        self, kind: str, points: list[tuple[float, float]], params: dict, interval: float, min_days: int = 0
+    ) -> dict[tuple[float, float], dict]:
+        """Responses for grid-snapped points: cached ones from the cache, the rest in ONE request.
 
-        Returns:
-            dict with current weather data
+        Open-Meteo accepts comma-separated latitude/longitude lists and then answers
+        with a JSON list in the same order.
         """
+        results = {}
+        missing = []
+        for point in points:
+            if point in results or point in missing:
+                continue
+            cached = self.cache.get((kind, *point))
+            if cached is not None and cached[0] >= min_days:
+                results[point] = cached[1]
+            else:
+                missing.append(point)
+        if not missing:
+            return results
+
         response = await self.http_client.get(
             WEATHER_URL,
             params={
-                "latitude": latitude,
-                "longitude": longitude,
-                "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m,wind_direction_10m,pressure_msl",
+                "latitude": ",".join(str(lat) for lat, _ in missing),
+                "longitude": ",".join(str(lon) for _, lon in missing),
                 "timezone": "auto",
+                **params,
             },
         )
         response.raise_for_status()
         data = response.json()
+        items = data if isinstance(data, list) else [data]
+        days = params.get("forecast_days", 0)
+        for point, item in zip(missing, items):
+            results[point] = item
+            self.cache.put((kind, *point), (days, item), interval)
+        return results
 
+    @staticmethod
+    def _parse_current(data: dict) -> dict:
         current = data.get("current", {})
         weather_code = current.get("weather_code", 0)
 
@@ -122,6 +146,65 @@ class WeatherClient:
             "time": current.get("time"),
         }
 
+    @staticmethod
+    def _parse_forecast(data: dict, days: int) -> dict:
+        daily = data.get("daily", {})
+        dates = daily.get("time", [])[:days]
+        n = len(dates)
+
+        def column(name: str) -> list:
+            values = daily.get(name) or []
+            return (values + [None] * n)[:n]
+
+        forecast = []
+        for day, code, t_max, t_min, feels_max, feels_min, precip, precip_prob, wind_max in zip(
+            dates,
+            column("weather_code"),
+            column("temperature_2m_max"),
+            column("temperature_2m_min"),
+            column("apparent_temperature_max"),
+            column("apparent_temperature_min"),
+            column("precipitation_sum"),
+            column("precipitation_probability_max"),
+            column("wind_speed_10m_max"),
+        ):
+            weather_code = code or 0
+            forecast.append({
+                "date": day,
+                "temp_max": t_max,
+                "temp_min": t_min,
+                "feels_like_max": feels_max,
+                "feels_like_min": feels_min,
+                "precipitation": precip,
+                "precipitation_probability": precip_prob,
+                "wind_speed_max": wind_max,
+                "weather_code": weather_code,
+                "weather_description": WMO_CODES.get(weather_code, "Unknown"),
+            })
+
+        return {
+            "timezone": data.get("timezone", "UTC"),
+            "days": forecast,
+        }
+
+    async def get_current_weather(self, latitude: float, longitude: float) -> dict:
+        """Get current weather for coordinates.
+
+        Returns:
+            dict with current weather data
+        """
+        return (await self.get_current_weather_multi([(latitude, longitude)]))[0]
+
+    async def get_current_weather_multi(self, locations: list[tuple[float, float]]) -> list[dict]:
+        """Get current weather for several coordinates with at most one upstream request.
+
+        Returns:
+            list of current weather dicts, in the order of `locations`
+        """
+        points = [self.cache.snap(lat, lon) for lat, lon in locations]
+        data = await self._fetch_points("current", points, {"current": CURRENT_FIELDS}, CURRENT_INTERVAL)
+        return [self._parse_current(data[point]) for point in points]
+
     async def get_forecast(
         self, latitude: float, longitude: float, days: int = 7
     ) -> dict:
@@ -135,45 +218,56 @@ class WeatherClient:
         Returns:
             dict with daily forecast data
         """
-        days = max(1, min(16, days))
+        return (await self.get_forecast_multi([(latitude, longitude)], days))[0]
 
-        response = await self.http_client.get(
-            WEATHER_URL,
-            params={
-                "latitude": latitude,
-                "longitude": longitude,
-                "daily": "weather_code,temperature_2m_max,temperature_2m_min,apparent_temperature_max,apparent_temperature_min,precipitation_sum,precipitation_probability_max,wind_speed_10m_max",
-                "timezone": "auto",
-                "forecast_days": days,
-            },
+    async def get_forecast_multi(self, locations: list[tuple[float, float]], days: int = 7) -> list[dict]:
+        """Get daily forecasts for several coordinates with at most one upstream request.
+
+        A cached forecast for N days also answers requests for fewer days, so at
+        least a week is fetched even when fewer days are asked for.
+
+        Returns:
+            list of forecast dicts, in the order of `locations`
+        """
+        days = max(1, min(16, days))
+        fetch_days = max(days, MIN_FORECAST_FETCH_DAYS)
+        points = [self.cache.snap(lat, lon) for lat, lon in locations]
+        data = await self._fetch_points(
+            "daily", points, {"daily": DAILY_FIELDS, "forecast_days": fetch_days}, FORECAST_INTERVAL, min_days=days
         )
-        response.raise_for_status()
-        data = response.json()
+        return [self._parse_forecast(data[point], days) for point in points]
 
-        daily = data.get("daily", {})
-        dates = daily.get("time", [])
+    async def get_hourly_forecast(self, latitude: float, longitude: float, days: int = 2) -> dict:
+        """Get the hourly forecast for coordinates, kept in Open-Meteo's columnar layout.
 
-        forecast = []
-        for i, date in enumerate(dates):
-            weather_code = daily.get("weather_code", [0])[i] if daily.get("weather_code") else 0
-            forecast.append({
-                "date": date,
-                "temp_max": daily.get("temperature_2m_max", [None])[i],
-                "temp_min": daily.get("temperature_2m_min", [None])[i],
-                "feels_like_max": daily.get("apparent_temperature_max", [None])[i],
-                "feels_like_min": daily.get("apparent_temperature_min", [None])[i],
-                "precipitation": daily.get("precipitation_sum", [None])[i],
-                "precipitation_probability": daily.get("precipitation_probability_max", [None])[i],
-                "wind_speed_max": daily.get("wind_speed_10m_max", [None])[i],
-                "weather_code": weather_code,
-                "weather_description": WMO_CODES.get(weather_code, "Unknown"),
-            })
+        All HOURLY_FIELDS are fetched (and cached) together, so any subset of
+        variables is served by the same cached response.
 
-        return {
-            "timezone": data.get("timezone", "UTC"),
-            "days": forecast,
-        }
+        Returns:
+            dict with "timezone", "time" (local ISO hours) and one list per
+            Open-Meteo hourly variable, covering `days` local days from today
+        """
+        days = max(1, min(16, days))
+        fetch_days = max(days, MIN_FORECAST_FETCH_DAYS)
+        point = self.cache.snap(latitude, longitude)
+        data = (await self._fetch_points(
+            "hourly", [point], {"hourly": HOURLY_FIELDS, "forecast_days": fetch_days}, FORECAST_INTERVAL,
+            min_days=days,
+        ))[point]
+
+        hourly = data.get("hourly", {})
+        times = hourly.get("time", [])
+        if times:
+            cutoff = (date.fromisoformat(times[0][:10]) + timedelta(days=days)).isoformat()
+            n = bisect_left(times, cutoff)
+        else:
+            n = 0
+        result = {"timezone": data.get("timezone", "UTC"), "time": times[:n]}
+        for field in HOURLY_FIELDS.split(","):
+            result[field] = (hourly.get(field) or [None] * n)[:n]
+        return result
 
     async def close(self):
-        """Close HTTP client."""
+        """Persist the geocoding cache and close HTTP client."""
+        await self.geocoder.close()
         await self.http_client.aclose()